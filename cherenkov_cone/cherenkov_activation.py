@@ -0,0 +1,110 @@
+import numpy as np
+
+try:
+    from .cherenkov_geometry import normalize
+except ImportError:
+    from cherenkov_geometry import normalize
+
+
+def cone_surface_distance(points: np.ndarray, apex: np.ndarray, axis: np.ndarray, theta_c_rad: float) -> np.ndarray:
+    """Return the distance from points to the generator lines of the double cone.
+
+    Every intersection curve lies on the cone, so this is a lower bound on the
+    distance to the ring (up to the chord error of the sampled polyline) and costs
+    ``O(N)`` with no temporaries per curve point.
+    """
+    axis = normalize(np.asarray(axis, dtype=float))
+    d = np.asarray(points, dtype=float) - np.asarray(apex, dtype=float)[None, :]
+    h = d @ axis
+    r = np.sqrt(np.maximum(np.sum(d * d, axis=1) - h * h, 0.0))
+    return np.abs(r * np.cos(theta_c_rad) - np.abs(h) * np.sin(theta_c_rad))
+
+
+def polyline_edges(curve_points: np.ndarray, segment_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return start/end points of all polyline edges in segmented point arrays.
+
+    Consecutive points with the same segment id form an edge; a segment with a
+    single point becomes a zero-length edge so it still counts.
+    """
+    pts = np.asarray(curve_points, dtype=float)
+    seg = np.asarray(segment_ids)
+    if len(pts) == 0:
+        return np.empty((0, 3), dtype=float), np.empty((0, 3), dtype=float)
+
+    same = seg[1:] == seg[:-1]
+    has_prev = np.concatenate([[False], same])
+    has_next = np.concatenate([same, [False]])
+    lonely = np.flatnonzero(~has_prev & ~has_next)
+    edge_start = np.concatenate([np.flatnonzero(same), lonely])
+    edge_stop = np.concatenate([np.flatnonzero(same) + 1, lonely])
+    return pts[edge_start], pts[edge_stop]
+
+
+def distance_to_edges(
+    points: np.ndarray,
+    edge_a: np.ndarray,
+    edge_b: np.ndarray,
+    max_pairs: int = 1 << 20,
+) -> np.ndarray:
+    """Return the exact distance from each point to the nearest edge.
+
+    Points are processed in chunks so that at most ``max_pairs`` point-edge pairs
+    are held in memory at once.
+    """
+    pts = np.asarray(points, dtype=float)
+    out = np.full(len(pts), np.inf)
+    if len(pts) == 0 or len(edge_a) == 0:
+        return out
+
+    ab = edge_b - edge_a
+    ab2 = np.sum(ab * ab, axis=1)
+    inv_ab2 = np.divide(1.0, ab2, out=np.zeros_like(ab2), where=ab2 > 0.0)
+    chunk = max(1, int(max_pairs) // len(edge_a))
+
+    for i0 in range(0, len(pts), chunk):
+        p = pts[i0 : i0 + chunk]
+        t = np.zeros((len(p), len(edge_a)))
+        dist2 = np.zeros_like(t)
+        for k in range(3):
+            t += (p[:, k : k + 1] - edge_a[None, :, k]) * ab[None, :, k]
+        t *= inv_ab2[None, :]
+        np.clip(t, 0.0, 1.0, out=t)
+        for k in range(3):
+            diff = p[:, k : k + 1] - (edge_a[None, :, k] + t * ab[None, :, k])
+            dist2 += diff * diff
+        out[i0 : i0 + chunk] = np.sqrt(dist2.min(axis=1))
+    return out
+
+
+def om_activation(
+    om_points: np.ndarray,
+    curve_points: np.ndarray,
+    segment_ids: np.ndarray,
+    activation_distance: float,
+    apex: np.ndarray | None = None,
+    axis: np.ndarray | None = None,
+    theta_c_rad: float | None = None,
+    max_pairs: int = 1 << 20,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find OMs within ``activation_distance`` of the intersection ring.
+
+    When the cone (``apex``, ``axis``, ``theta_c_rad``) is given, only OMs close to
+    the cone surface are tested against the ring edges. Returns ``(active, dist)``;
+    ``dist`` is exact for tested OMs and ``inf`` for the rest.
+    """
+    om_points = np.asarray(om_points, dtype=float)
+    dist = np.full(len(om_points), np.inf)
+    if len(curve_points) == 0 or len(om_points) == 0:
+        return np.zeros(len(om_points), dtype=bool), dist
+
+    edge_a, edge_b = polyline_edges(curve_points, segment_ids)
+    if apex is not None and axis is not None and theta_c_rad is not None:
+        # Edge chords leave the cone by at most half their length.
+        margin = 0.5 * float(np.sqrt(np.max(np.sum((edge_b - edge_a) ** 2, axis=1))))
+        cone_dist = cone_surface_distance(om_points, apex, axis, theta_c_rad)
+        candidates = np.flatnonzero(cone_dist < activation_distance + margin)
+    else:
+        candidates = np.arange(len(om_points))
+
+    dist[candidates] = distance_to_edges(om_points[candidates], edge_a, edge_b, max_pairs=max_pairs)
+    return dist < activation_distance, dist
@@ -0,0 +1,406 @@
+import numpy as np
+
+try:
+    from .cherenkov_geometry import _nappe_mask, normalize, perpendicular_basis
+except ImportError:
+    from cherenkov_geometry import _nappe_mask, normalize, perpendicular_basis
+
+
+def _masked_runs(mask: np.ndarray, min_points: int, periodic: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find contiguous runs in each row of a 2D mask.
+
+    Returns ``(rows, starts, lengths)`` ordered like ``_branches_from_masked_curve``:
+    with ``periodic`` a run wrapped across the seam comes first in its row, the rest
+    follow by start.
+    """
+    n_rows, n_cols = mask.shape
+    padded = np.zeros((n_rows, n_cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, stops = np.nonzero(edges == -1)
+    lengths = stops - starts
+
+    counts = np.bincount(rows, minlength=n_rows)
+    first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    last = first + counts - 1
+    wrap_rows = np.flatnonzero((counts > 1) & (mask[:, 0]) & (mask[:, -1])) if periodic else np.empty(0, dtype=np.int64)
+
+    order_key = starts.copy()
+    keep = np.ones(len(starts), dtype=bool)
+    if len(wrap_rows) > 0:
+        lengths[last[wrap_rows]] += lengths[first[wrap_rows]]
+        order_key[last[wrap_rows]] = -1
+        keep[first[wrap_rows]] = False
+
+    keep &= lengths >= min_points
+    order = np.lexsort((order_key[keep], rows[keep]))
+    return rows[keep][order], starts[keep][order], lengths[keep][order]
+
+
+def _runs_to_csr(
+    rows: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    n_frames: int,
+    n_sign: int,
+    n_cols: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Expand runs to per-point ``(row, col)`` indices plus CSR offsets."""
+    segment_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    within = np.arange(segment_offsets[-1], dtype=np.int64) - np.repeat(segment_offsets[:-1], lengths)
+    cols = (np.repeat(starts, lengths) + within) % n_cols
+    point_rows = np.repeat(rows, lengths)
+    segs_per_frame = np.bincount(rows // n_sign, minlength=n_frames)
+    frame_offsets = np.concatenate([[0], np.cumsum(segs_per_frame)]).astype(np.int64)
+    return point_rows, cols, segment_offsets, frame_offsets
+
+
+def _mask_to_csr(
+    mask: np.ndarray,
+    min_points: int,
+    periodic: bool,
+    connect: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Turn a ``(frames, signs, cols)`` mask into point indices and CSR offsets.
+
+    With ``connect = False`` every valid sample is a segment of its own.
+    """
+    n_frames, n_sign, n_cols = mask.shape
+    flat = mask.reshape(n_frames * n_sign, n_cols)
+    if connect:
+        rows, starts, lengths = _masked_runs(flat, min_points=min_points, periodic=periodic)
+    else:
+        rows, starts = np.nonzero(flat)
+        lengths = np.ones(len(rows), dtype=np.int64)
+    return _runs_to_csr(rows, starts, lengths, n_frames, n_sign, n_cols)
+
+
+def _lines_chunk(
+    line_points: np.ndarray,
+    line_dirs: np.ndarray,
+    w_min: float,
+    w_max: float,
+    apices: np.ndarray,
+    axis: np.ndarray,
+    c2: float,
+    nappe: str,
+    min_points: int,
+    eps: float,
+    max_proj: float | None,
+    frame_mask: np.ndarray,
+    periodic: bool,
+    connect: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate one block of frames on the ``(n_frames, n_lines)`` grid.
+
+    Along each line the cone equation is quadratic in the line coordinate measured
+    from the foot of the perpendicular from the apex.
+    """
+    n_frames = len(apices)
+    n_lines = len(line_points)
+
+    # Component-wise to keep the temporaries at (frames, lines).
+    delta = [line_points[None, :, k] - apices[:, k : k + 1] for k in range(3)]
+    along = -sum(delta[k] * line_dirs[None, :, k] for k in range(3))
+    qu = np.zeros_like(along)
+    q2 = np.zeros_like(along)
+    for k in range(3):
+        q_k = delta[k] + along * line_dirs[None, :, k]
+        qu += q_k * axis[k]
+        q2 += q_k * q_k
+    du = line_dirs @ axis
+
+    A = du**2 - c2
+    B = 2.0 * qu * du[None, :]
+    C = qu**2 - c2 * q2
+
+    linear = np.abs(A) < eps
+    if np.all(linear):
+        valid = np.abs(B) > eps
+        w = np.divide(-C, B, out=np.full_like(B, np.nan), where=valid)[:, None, :]
+    else:
+        D = B**2 - 4.0 * A * C
+        D = np.where(D < -eps, np.nan, np.clip(D, 0.0, None))
+        sqrtD = np.sqrt(D)
+        two_a = 2.0 * np.where(linear, 1.0, A)
+        w = np.stack([(-B + sqrtD) / two_a, (-B - sqrtD) / two_a], axis=1)
+        if np.any(linear):
+            w_lin = np.divide(-C, B, out=np.full_like(B, np.nan), where=np.abs(B) > eps)
+            w[:, 0, :] = np.where(linear, w_lin, w[:, 0, :])
+            w[:, 1, :] = np.where(linear, np.nan, w[:, 1, :])
+
+    n_sign = w.shape[1]
+    coord = along[:, None, :] + w
+    proj = qu[:, None, :] + w * du
+    mask = np.isfinite(coord) & (coord >= w_min) & (coord <= w_max)
+    mask &= _nappe_mask(proj, nappe=nappe, max_proj=max_proj)
+    mask &= frame_mask[:, None, None]
+
+    point_rows, cols, segment_offsets, frame_offsets = _mask_to_csr(mask, min_points, periodic, connect)
+    coord_rows = coord.reshape(n_frames * n_sign, n_lines)[point_rows, cols]
+    points = line_points[cols] + coord_rows[:, None] * line_dirs[cols]
+    return points, segment_offsets, frame_offsets
+
+
+def _generators_chunk(
+    center: np.ndarray,
+    radius: float,
+    generator_dirs: np.ndarray,
+    apices: np.ndarray,
+    cos_theta: float,
+    nappe: str,
+    min_points: int,
+    max_proj: float | None,
+    frame_mask: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Intersect every cone generator line with a sphere for one block of frames."""
+    n_frames = len(apices)
+    oc = apices - center[None, :]
+    b = oc @ generator_dirs.T
+    c = np.sum(oc * oc, axis=1)[:, None] - radius**2
+    disc = b**2 - c
+    sqrt_disc = np.sqrt(np.where(disc >= 0.0, disc, np.nan))
+    t = np.stack([-b + sqrt_disc, -b - sqrt_disc], axis=1)
+
+    mask = np.isfinite(t)
+    mask &= _nappe_mask(t * cos_theta, nappe=nappe, max_proj=max_proj)
+    mask &= frame_mask[:, None, None]
+
+    point_rows, cols, segment_offsets, frame_offsets = _mask_to_csr(mask, min_points, periodic=True, connect=True)
+    t_rows = t.reshape(n_frames * 2, -1)[point_rows, cols]
+    points = apices[point_rows // 2] + t_rows[:, None] * generator_dirs[cols]
+    return points, segment_offsets, frame_offsets
+
+
+def _batch_frames(chunk_fn, apices: np.ndarray, frame_mask: np.ndarray | None, chunk_frames: int):
+    """Run ``chunk_fn(apices, frame_mask)`` over frame blocks and join the CSR parts."""
+    n_frames = len(apices)
+    if frame_mask is None:
+        frame_mask = np.ones(n_frames, dtype=bool)
+    frame_mask = np.asarray(frame_mask, dtype=bool)
+    chunk_frames = max(1, int(chunk_frames))
+
+    point_chunks: list[np.ndarray] = []
+    segment_offsets = [np.zeros(1, dtype=np.int64)]
+    frame_offsets = [np.zeros(1, dtype=np.int64)]
+    n_points = 0
+    n_segments = 0
+
+    for i0 in range(0, n_frames, chunk_frames):
+        i1 = min(n_frames, i0 + chunk_frames)
+        pts, seg_off, frame_off = chunk_fn(apices[i0:i1], frame_mask[i0:i1])
+        point_chunks.append(pts)
+        segment_offsets.append(seg_off[1:] + n_points)
+        frame_offsets.append(frame_off[1:] + n_segments)
+        n_points += len(pts)
+        n_segments += len(seg_off) - 1
+
+    points = np.vstack(point_chunks) if point_chunks else np.empty((0, 3), dtype=float)
+    return points, np.concatenate(segment_offsets), np.concatenate(frame_offsets)
+
+
+def batch_intersection_curves_on_lines(
+    line_points: np.ndarray,
+    line_dirs: np.ndarray,
+    w_min: float,
+    w_max: float,
+    apices: np.ndarray,
+    axis: np.ndarray,
+    theta_c_rad: float,
+    nappe: str = "trailing",
+    min_points: int = 5,
+    eps: float = 1e-12,
+    max_proj: float | None = None,
+    frame_mask: np.ndarray | None = None,
+    chunk_frames: int = 2048,
+    periodic: bool = True,
+    connect: bool = True,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Intersect cones with a family of line segments ``p + w d``, ``w_min <= w <= w_max``.
+
+    Ruled surfaces (cylinder side, plane) are sampled as consecutive lines and the
+    hits on neighbouring lines are joined into curves; ``periodic`` closes the
+    family across its seam. With ``connect = False`` the lines are independent
+    (e.g. detector strings) and every hit is a single-point segment. Output is the
+    CSR triple of ``batch_intersection_curves_on_cylinder``.
+    """
+    axis = normalize(np.asarray(axis, dtype=float))
+    apices = np.atleast_2d(np.asarray(apices, dtype=float))
+    line_points = np.asarray(line_points, dtype=float).reshape(-1, 3)
+    line_dirs = np.asarray(line_dirs, dtype=float).reshape(-1, 3)
+    line_dirs = line_dirs / np.linalg.norm(line_dirs, axis=1)[:, None]
+    c2 = np.cos(theta_c_rad) ** 2
+
+    def chunk_fn(chunk_apices: np.ndarray, chunk_mask: np.ndarray):
+        return _lines_chunk(
+            line_points,
+            line_dirs,
+            w_min,
+            w_max,
+            chunk_apices,
+            axis,
+            c2,
+            nappe,
+            min_points,
+            eps,
+            max_proj,
+            chunk_mask,
+            periodic,
+            connect,
+        )
+
+    return _batch_frames(chunk_fn, apices, frame_mask, chunk_frames)
+
+
+def batch_intersection_curves_on_cylinder(
+    radius: float,
+    z_min: float,
+    z_max: float,
+    apices: np.ndarray,
+    axis: np.ndarray,
+    theta_c_rad: float,
+    n_phi: int = 720,
+    nappe: str = "trailing",
+    min_points: int = 5,
+    eps: float = 1e-12,
+    max_proj: float | None = None,
+    frame_mask: np.ndarray | None = None,
+    chunk_frames: int = 2048,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute cone-cylinder intersections for every apex in one batch.
+
+    This is the vectorized counterpart of ``analytic_intersection_segments``
+    and produces the same branches in the same order. The result is CSR-style:
+
+    - ``points`` with shape ``(n_points, 3)``;
+    - ``segment_offsets`` so that segment ``k`` is ``points[segment_offsets[k]:segment_offsets[k + 1]]``;
+    - ``frame_offsets`` so that frame ``i`` owns segments ``frame_offsets[i]:frame_offsets[i + 1]``.
+
+    ``frame_mask`` disables frames (e.g. apex outside the detector); ``chunk_frames``
+    bounds the size of the temporary ``(frames, n_phi)`` grids.
+    """
+    phi = np.linspace(0.0, 2.0 * np.pi, n_phi, endpoint=False)
+    line_points = np.column_stack([radius * np.cos(phi), radius * np.sin(phi), np.zeros(n_phi)])
+    line_dirs = np.tile([0.0, 0.0, 1.0], (n_phi, 1))
+    return batch_intersection_curves_on_lines(
+        line_points,
+        line_dirs,
+        z_min,
+        z_max,
+        apices,
+        axis,
+        theta_c_rad,
+        nappe=nappe,
+        min_points=min_points,
+        eps=eps,
+        max_proj=max_proj,
+        frame_mask=frame_mask,
+        chunk_frames=chunk_frames,
+    )
+
+
+def batch_intersection_curves_on_sphere(
+    center: np.ndarray,
+    radius: float,
+    apices: np.ndarray,
+    axis: np.ndarray,
+    theta_c_rad: float,
+    n_psi: int = 720,
+    nappe: str = "trailing",
+    min_points: int = 5,
+    max_proj: float | None = None,
+    frame_mask: np.ndarray | None = None,
+    chunk_frames: int = 2048,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute cone-sphere intersections for every apex in one batch.
+
+    The cone is sampled by ``n_psi`` generator lines around its axis; each meets the
+    sphere where a quadratic in the line parameter vanishes. The two roots give the
+    near and far branches. Output is the same CSR triple as for the cylinder.
+    """
+    axis = normalize(np.asarray(axis, dtype=float))
+    apices = np.atleast_2d(np.asarray(apices, dtype=float))
+    center = np.asarray(center, dtype=float)
+    e1, e2 = perpendicular_basis(axis)
+    psi = np.linspace(0.0, 2.0 * np.pi, n_psi, endpoint=False)
+    generator_dirs = (
+        np.cos(theta_c_rad) * axis[None, :]
+        + np.sin(theta_c_rad) * (np.cos(psi)[:, None] * e1[None, :] + np.sin(psi)[:, None] * e2[None, :])
+    )
+
+    def chunk_fn(chunk_apices: np.ndarray, chunk_mask: np.ndarray):
+        return _generators_chunk(
+            center,
+            radius,
+            generator_dirs,
+            chunk_apices,
+            np.cos(theta_c_rad),
+            nappe,
+            min_points,
+            max_proj,
+            chunk_mask,
+        )
+
+    return _batch_frames(chunk_fn, apices, frame_mask, chunk_frames)
+
+
+def frame_segments(
+    points: np.ndarray,
+    segment_offsets: np.ndarray,
+    frame_offsets: np.ndarray,
+    frame_pos: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return one frame of a CSR batch as points plus local segment ids."""
+    seg0, seg1 = int(frame_offsets[frame_pos]), int(frame_offsets[frame_pos + 1])
+    p0, p1 = int(segment_offsets[seg0]), int(segment_offsets[seg1])
+    lengths = np.diff(segment_offsets[seg0 : seg1 + 1])
+    segment_ids = np.repeat(np.arange(seg1 - seg0, dtype=np.int32), lengths)
+    return points[p0:p1], segment_ids
+
+
+def batch_curve_lengths(points: np.ndarray, segment_offsets: np.ndarray, frame_offsets: np.ndarray) -> np.ndarray:
+    """Return the total polyline length of every frame of a CSR batch."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    n_frames = len(frame_offsets) - 1
+    if len(points) < 2:
+        return np.zeros(n_frames)
+    edge = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    # Edges that cross a segment boundary are not part of any curve.
+    edge_seg = np.searchsorted(segment_offsets, np.arange(len(edge)), side="right") - 1
+    same = segment_offsets[edge_seg + 1] - 1 > np.arange(len(edge))
+    seg_length = np.bincount(edge_seg[same], weights=edge[same], minlength=len(segment_offsets) - 1)
+    seg_frame = np.repeat(np.arange(n_frames), np.diff(frame_offsets))
+    return np.bincount(seg_frame, weights=seg_length, minlength=n_frames)
+
+
+def batch_history_arrays(
+    points: np.ndarray,
+    segment_offsets: np.ndarray,
+    frame_offsets: np.ndarray,
+    frame_positions: np.ndarray,
+    frame_numbers: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten selected CSR frames to history ``(points, frames, segments)`` arrays.
+
+    Segment ids are renumbered consecutively over the selected frames, matching the
+    layout written by ``save_history_npz``.
+    """
+    frame_positions = np.asarray(frame_positions, dtype=np.int64)
+    frame_numbers = np.asarray(frame_numbers, dtype=np.int32)
+
+    segs_per_frame = frame_offsets[frame_positions + 1] - frame_offsets[frame_positions]
+    seg_frame = np.repeat(frame_numbers, segs_per_frame)
+    seg_index = np.repeat(frame_offsets[frame_positions] - np.cumsum(segs_per_frame) + segs_per_frame, segs_per_frame)
+    seg_index = seg_index + np.arange(len(seg_index), dtype=np.int64)
+
+    seg_start = segment_offsets[seg_index]
+    seg_len = segment_offsets[seg_index + 1] - seg_start
+    total = int(seg_len.sum())
+    within = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(seg_len) - seg_len, seg_len)
+    point_idx = np.repeat(seg_start, seg_len) + within
+
+    out_points = np.asarray(points, dtype=float)[point_idx].reshape(-1, 3)
+    out_frames = np.repeat(seg_frame, seg_len).astype(np.int32, copy=False)
+    out_segments = np.repeat(np.arange(len(seg_index), dtype=np.int32), seg_len)
+    return out_points, out_frames, out_segments
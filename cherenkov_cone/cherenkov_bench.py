@@ -0,0 +1,121 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyvista as pv
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from .cherenkov_config import load_cfg
+    from .cherenkov_prototype import FRAME_STAGES, SETUP_STAGES, run_prototype
+except ImportError:
+    from cherenkov_config import load_cfg
+    from cherenkov_prototype import FRAME_STAGES, SETUP_STAGES, run_prototype
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB (``None`` where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def summarize_times(seconds: list[float]) -> dict:
+    """Mean, p95, max and total of per-frame durations (ms, except ``total_s``)."""
+    ms = 1e3 * np.asarray(seconds, dtype=float)
+    if len(ms) == 0:
+        return {"mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "total_s": 0.0}
+    return {
+        "mean_ms": float(ms.mean()),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "max_ms": float(ms.max()),
+        "total_s": float(1e-3 * ms.sum()),
+    }
+
+
+def run_benchmark(
+    cfg_path: str | Path | None = None,
+    n_frames: int | None = None,
+    save_movie: bool = False,
+    movie_path: str | None = None,
+    output_path: str | Path | None = None,
+) -> dict:
+    """Run the prototype off-screen and return per-stage timings as a JSON-ready dict.
+
+    ``frame_stages`` holds mean/p95 per frame of every render-loop stage, ``setup``
+    the one-off stages in seconds, ``movie_encode_s`` the encoder thread time and
+    ``fps`` the frames per second of the render loop. With ``output_path`` the
+    result is also written there as JSON.
+    """
+    cfg = load_cfg(cfg_path)
+    stage_times: dict[str, list[float]] = {}
+    t0 = time.perf_counter()
+    run_prototype(
+        save_movie=save_movie,
+        movie_path=movie_path,
+        n_frames=n_frames,
+        show_progress=False,
+        cfg_path=cfg_path,
+        workers=1,
+        off_screen=True,
+        stage_times=stage_times,
+    )
+    wall_s = time.perf_counter() - t0
+
+    frame_s = stage_times.get("frame", [])
+    loop_s = float(np.sum(frame_s))
+    result = {
+        "cfg_path": None if cfg_path is None else str(cfg_path),
+        "n_frames": len(frame_s),
+        "save_movie": bool(save_movie),
+        "detector": cfg["detector"]["kind"],
+        "persistent_actors": cfg["run"]["persistent_actors"],
+        "show_unwrapped_view": cfg["visual"]["show_unwrapped_view"],
+        "window_size": [cfg["visual"]["window_width"], cfg["visual"]["window_height"]],
+        "wall_s": wall_s,
+        "fps": len(frame_s) / loop_s if loop_s > 0.0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "setup": {stage: float(np.sum(stage_times.get(stage, []))) for stage in SETUP_STAGES},
+        "movie_encode_s": float(np.sum(stage_times.get("movie_encode", []))),
+        "frame": summarize_times(frame_s),
+        "frame_stages": {stage: summarize_times(stage_times.get(stage, [])) for stage in FRAME_STAGES},
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pyvista": pv.__version__,
+            "vtk": ".".join(str(v) for v in pv.vtk_version_info),
+        },
+    }
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Cherenkov prototype off-screen.")
+    parser.add_argument("--cfg", default=None, help="path to run.cfg (default: next to this script)")
+    parser.add_argument("--n-frames", type=int, default=None, help="override run.n_frames")
+    parser.add_argument("--movie", action="store_true", help="also encode the movie")
+    parser.add_argument("--movie-path", default=None, help="override run.movie_path")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args()
+    report = run_benchmark(
+        cfg_path=args.cfg,
+        n_frames=args.n_frames,
+        save_movie=args.movie,
+        movie_path=args.movie_path,
+        output_path=args.output,
+    )
+    print(json.dumps(report, indent=2))
@@ -22,6 +22,17 @@ def _parse_vec3(raw: str, fallback: tuple[float, float, float]) -> np.ndarray:
         return np.asarray(fallback, dtype=float)
 
 
+def resolve_max_proj(intersection_cfg: dict, cone_height: float) -> float | None:
+    """Return the axial cutoff implied by ``clip_to_visual_cone`` and ``max_forward_distance``."""
+    max_proj: float | None = None
+    if intersection_cfg["clip_to_visual_cone"]:
+        max_proj = float(cone_height)
+    user_max_proj = float(intersection_cfg["max_forward_distance"])
+    if user_max_proj > 0.0:
+        max_proj = user_max_proj if max_proj is None else min(max_proj, user_max_proj)
+    return max_proj
+
+
 def load_cfg(path: str | Path | None = None) -> dict:
     """Load the prototype configuration from ``run.cfg``."""
     cfg = configparser.ConfigParser(inline_comment_prefixes=(";",))
@@ -65,29 +76,63 @@ def load_cfg(path: str | Path | None = None) -> dict:
             "movie_format": get("run", "movie_format", str, "pyav"),
             "movie_codec": get("run", "movie_codec", str, "libx264"),
             "movie_is_batch": get_bool("run", "movie_is_batch", False),
+            "movie_queue_size": get("run", "movie_queue_size", int, 8),
             "history_stride": get("run", "history_stride", int, 1),
             "save_history_npz": get_bool("run", "save_history_npz", True),
             "history_npz_path": get("run", "history_npz_path", str, "cherenkov_history.npz"),
+            "save_viewer_cache": get_bool("run", "save_viewer_cache", True),
             "save_history_vtm": get_bool("run", "save_history_vtm", True),
             "history_vtm_path": get("run", "history_vtm_path", str, "cherenkov_history.vtm"),
+            "save_history_pvd": get_bool("run", "save_history_pvd", False),
+            "history_pvd_path": get("run", "history_pvd_path", str, "cherenkov_history.pvd"),
+            "save_history_store": get_bool("run", "save_history_store", True),
+            "history_store_path": get("run", "history_store_path", str, "cherenkov_history_store"),
+            "history_chunk_frames": get("run", "history_chunk_frames", int, 256),
+            "history_float32": get_bool("run", "history_float32", False),
+            "history_compress": get_bool("run", "history_compress", False),
             "show_history_viewer": get_bool("run", "show_history_viewer", False),
+            "persistent_actors": get_bool("run", "persistent_actors", True),
+            "report_frame_times": get_bool("run", "report_frame_times", False),
+            "render_workers": get("run", "render_workers", int, 1),
         },
         "detector": {
+            "kind": get("detector", "kind", str, "cylinder").strip().lower(),
             "cluster_radius": get("detector", "cluster_radius", float, 40.0),
             "z_min": get("detector", "z_min", float, -70.0),
             "z_max": get("detector", "z_max", float, 70.0),
+            "sphere_center": _parse_vec3(cfg.get("detector", "sphere_center", fallback="0.0, 0.0, 0.0"), (0.0, 0.0, 0.0)),
+            "plane_origin": _parse_vec3(cfg.get("detector", "plane_origin", fallback="0.0, 0.0, 0.0"), (0.0, 0.0, 0.0)),
+            "plane_normal": _parse_vec3(cfg.get("detector", "plane_normal", fallback="1.0, 0.0, 0.0"), (1.0, 0.0, 0.0)),
+            "plane_width": get("detector", "plane_width", float, 80.0),
+            "plane_height": get("detector", "plane_height", float, 140.0),
+            "string_layout": get("detector", "string_layout", str, "hex").strip().lower(),
+            "hex_rings": get("detector", "hex_rings", int, 2),
+            "string_spacing": get("detector", "string_spacing", float, 20.0),
+            "string_positions": get("detector", "string_positions", str, ""),
             "cylinder_resolution": get("detector", "cylinder_resolution", int, 120),
             "cyl_sample_phi": get("detector", "cyl_sample_phi", int, 280),
             "n_strings": get("detector", "n_strings", int, 10),
             "oms_per_string": get("detector", "oms_per_string", int, 20),
+            "om_positions_path": get("detector", "om_positions_path", str, "").strip(),
         },
         "optics": {
             "n_refr": get("optics", "n_refr", float, 1.33),
             "beta": get("optics", "beta", float, 1.0),
+            "n_group": get("optics", "n_group", float, 1.3795),
+        },
+        "response": {
+            "wavelength_min_nm": get("response", "wavelength_min_nm", float, 300.0),
+            "wavelength_max_nm": get("response", "wavelength_max_nm", float, 600.0),
+            "absorption_length": get("response", "absorption_length", float, 25.0),
+            "om_area": get("response", "om_area", float, 0.05),
+            "quantum_efficiency": get("response", "quantum_efficiency", float, 0.25),
+            "om_direction": _parse_vec3(cfg.get("response", "om_direction", fallback="0.0, 0.0, -1.0"), (0.0, 0.0, -1.0)),
+            "acceptance_power": get("response", "acceptance_power", float, 1.0),
         },
         "track": {
             "r0": _parse_vec3(cfg.get("track", "r0", fallback="-25.0, -10.0, -80.0"), (-25.0, -10.0, -80.0)),
             "u": _parse_vec3(cfg.get("track", "u", fallback="0.38, 0.18, 0.91"), (0.38, 0.18, 0.91)),
+            "t0": get("track", "t0", float, 0.0),
             "s_start": get("track", "s_start", float, 0.0),
             "s_end": get("track", "s_end", float, 170.0),
             "draw_s_min": get("track", "draw_s_min", float, -10.0),
@@ -117,6 +162,10 @@ def load_cfg(path: str | Path | None = None) -> dict:
             "cylinder_opacity": get("visual", "cylinder_opacity", float, 0.35),
             "track_line_width": get("visual", "track_line_width", float, 4.0),
             "om_point_size": get("visual", "om_point_size", float, 10.0),
+            "om_color_mode": get("visual", "om_color_mode", str, "active").strip().lower(),
+            "time_residual_window": get("visual", "time_residual_window", float, 20.0),
+            "npe_min": get("visual", "npe_min", float, 0.01),
+            "npe_max": get("visual", "npe_max", float, 0.0),
             "unwrap_om_point_size": get("visual", "unwrap_om_point_size", float, 7.0),
             "unwrap_curve_line_width": get("visual", "unwrap_curve_line_width", float, 3.0),
             "unwrap_curve_point_size": get("visual", "unwrap_curve_point_size", float, 5.0),
@@ -125,6 +174,8 @@ def load_cfg(path: str | Path | None = None) -> dict:
             "cone_height": get("visual", "cone_height", float, 45.0),
             "cone_resolution": get("visual", "cone_resolution", int, 80),
             "cone_opacity": get("visual", "cone_opacity", float, 0.18),
+            "viewer_cache_frames": get("visual", "viewer_cache_frames", int, 64),
+            "viewer_prefetch_frames": get("visual", "viewer_prefetch_frames", int, 4),
             "camera_position": camera_position,
             "camera_focal": camera_focal,
             "camera_view_up": camera_view_up,
@@ -144,4 +195,31 @@ def load_cfg(path: str | Path | None = None) -> dict:
             "movie_parallel_projection": get_bool("visual", "movie_parallel_projection", parallel_projection),
             "title_text": get("visual", "title_text", str, "Cherenkov cone-cylinder intersection prototype"),
         },
+        "montecarlo": {
+            "n_tracks": get("montecarlo", "n_tracks", int, 10000),
+            "seed": get("montecarlo", "seed", int, 12345),
+            "workers": get("montecarlo", "workers", int, 0),
+            "chunk_tracks": get("montecarlo", "chunk_tracks", int, 512),
+            "output_dir": get("montecarlo", "output_dir", str, "cherenkov_mc"),
+        },
+        "photons": {
+            "n_photons": get("photons", "n_photons", int, 1000000),
+            "chunk_photons": get("photons", "chunk_photons", int, 50000),
+            "workers": get("photons", "workers", int, 0),
+            "seed": get("photons", "seed", int, 2024),
+            "om_radius": get("photons", "om_radius", float, 0.2),
+            "scattering_length": get("photons", "scattering_length", float, 50.0),
+            "hg_g": get("photons", "hg_g", float, 0.9),
+            "max_scatters": get("photons", "max_scatters", int, 20),
+            "max_distance": get("photons", "max_distance", float, 300.0),
+            "output_dir": get("photons", "output_dir", str, "cherenkov_photons"),
+            "show_halo": get_bool("photons", "show_halo", False),
+            "halo_window": get("photons", "halo_window", float, 10.0),
+        },
+        "sweep": {
+            "workers": get("sweep", "workers", int, 0),
+            "output_dir": get("sweep", "output_dir", str, "cherenkov_sweep"),
+            "n_frames": get("sweep", "n_frames", int, 0),
+            "save_history": get_bool("sweep", "save_history", True),
+        },
     }
@@ -0,0 +1,525 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from .cherenkov_batch import (
+        batch_intersection_curves_on_cylinder,
+        batch_intersection_curves_on_lines,
+        batch_intersection_curves_on_sphere,
+    )
+    from .cherenkov_geometry import make_oms_on_cylinder, normalize, perpendicular_basis, unwrap_cylinder_points
+except ImportError:
+    from cherenkov_batch import (
+        batch_intersection_curves_on_cylinder,
+        batch_intersection_curves_on_lines,
+        batch_intersection_curves_on_sphere,
+    )
+    from cherenkov_geometry import make_oms_on_cylinder, normalize, perpendicular_basis, unwrap_cylinder_points
+
+if TYPE_CHECKING:
+    import pyvista as pv
+
+
+DETECTOR_KINDS = ("cylinder", "plane", "sphere", "strings")
+
+
+def _string_levels(t_min: float, t_max: float, oms_per_string: int) -> np.ndarray:
+    """OM positions along a string, keeping 8% of its length free at each end."""
+    margin = 0.08 * (t_max - t_min)
+    return np.linspace(t_min + margin, t_max - margin, oms_per_string)
+
+
+def _polydata():
+    """Import the PyVista adapters on first use; intersections and OM layouts never need them."""
+    try:
+        from . import cherenkov_polydata
+    except ImportError:
+        import cherenkov_polydata
+    return cherenkov_polydata
+
+
+def hexagonal_string_positions(n_rings: int, spacing: float, center: tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+    """Return ``(x, y)`` of a hexagonal string array with ``n_rings`` rings around a centre string."""
+    n = int(n_rings)
+    q, r = np.meshgrid(np.arange(-n, n + 1), np.arange(-n, n + 1), indexing="ij")
+    keep = np.abs(q + r) <= n
+    q = q[keep].astype(float)
+    r = r[keep].astype(float)
+    x = center[0] + spacing * (q + 0.5 * r)
+    y = center[1] + spacing * (0.5 * np.sqrt(3.0) * r)
+    order = np.lexsort((x, y))
+    return np.column_stack([x[order], y[order]])
+
+
+class DetectorGeometry(ABC):
+    """Common interface of detector shapes.
+
+    A detector provides the cone intersection for a batch of apices (CSR triple of
+    ``cherenkov_batch``), an OM layout, a 3D mesh and a flat ``(s, t)`` unwrap of
+    its surface used by the 2D view. Only the mesh and unwrap datasets import
+    PyVista, so the numeric part works in processes that never load VTK. A subclass
+    must implement every abstract method before it can be instantiated.
+    """
+
+    kind = ""
+    unwrap_title = ""
+    unwrap_period: float | None = None
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """Describe the detector with ``[detector]`` config keys."""
+
+    @abstractmethod
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """Return which points lie inside the detector volume."""
+
+    @abstractmethod
+    def surface_residual(self, points: np.ndarray) -> np.ndarray:
+        """Return the implicit surface equation evaluated at points (0 on the surface)."""
+
+    @abstractmethod
+    def make_oms(self, n_strings: int, oms_per_string: int) -> np.ndarray:
+        """Place optical modules on the detector."""
+
+    @abstractmethod
+    def intersection_batch(
+        self,
+        apices: np.ndarray,
+        axis: np.ndarray,
+        theta_c_rad: float,
+        n_samples: int = 720,
+        nappe: str = "trailing",
+        min_points: int = 5,
+        eps: float = 1e-12,
+        max_proj: float | None = None,
+        frame_mask: np.ndarray | None = None,
+        chunk_frames: int = 2048,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Intersect the cone at every apex with the detector."""
+
+    @abstractmethod
+    def surface_mesh(self, resolution: int = 120) -> "pv.DataSet":
+        """Return a mesh of the detector for the 3D view."""
+
+    @abstractmethod
+    def unwrap(self, points: np.ndarray) -> np.ndarray:
+        """Map detector points to ``(s, t, 0)`` unwrap coordinates."""
+
+    @abstractmethod
+    def unwrap_bounds(self) -> tuple[float, float, float, float]:
+        """Return ``(s_min, s_max, t_min, t_max)`` of the unwrap view."""
+
+    def unwrapped_outline(self) -> "pv.PolyData":
+        """Outline of the unwrapped surface."""
+        return _polydata().make_unwrapped_rectangle(self.unwrap_bounds())
+
+    def unwrapped_guides(self, om_points: np.ndarray) -> "pv.PolyData":
+        """Guide lines through the OM strings in the unwrap view."""
+        _, _, t_min, t_max = self.unwrap_bounds()
+        return _polydata().make_unwrapped_guides(self.unwrap(om_points), t_min, t_max)
+
+    def unwrapped_polydata(self, points: np.ndarray, segment_ids: np.ndarray, min_points: int = 2) -> "pv.PolyData":
+        """Unwrapped intersection curves, split at the seam of periodic unwraps."""
+        return _polydata().unwrapped_multiline_polydata(
+            self.unwrap(points), segment_ids, period=self.unwrap_period, min_points=min_points
+        )
+
+
+class CylinderDetector(DetectorGeometry):
+    """Side surface of a vertical cylinder ``x^2 + y^2 = R^2``, unwrapped to ``(R phi, z)``."""
+
+    kind = "cylinder"
+    unwrap_title = "Cylinder unwrap (s = R*phi, z)"
+
+    def __init__(self, radius: float, z_min: float, z_max: float):
+        self.radius = float(radius)
+        self.z_min = float(z_min)
+        self.z_max = float(z_max)
+        self.unwrap_period = 2.0 * np.pi * self.radius
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "cluster_radius": self.radius, "z_min": self.z_min, "z_max": self.z_max}
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        pts = np.atleast_2d(np.asarray(points, dtype=float))
+        return (pts[:, 0] ** 2 + pts[:, 1] ** 2 <= self.radius**2) & (pts[:, 2] >= self.z_min) & (pts[:, 2] <= self.z_max)
+
+    def surface_residual(self, points: np.ndarray) -> np.ndarray:
+        pts = np.atleast_2d(np.asarray(points, dtype=float))
+        return pts[:, 0] ** 2 + pts[:, 1] ** 2 - self.radius**2
+
+    def make_oms(self, n_strings: int, oms_per_string: int) -> np.ndarray:
+        return make_oms_on_cylinder(self.radius, self.z_min, self.z_max, n_strings=n_strings, oms_per_string=oms_per_string)
+
+    def intersection_batch(
+        self,
+        apices: np.ndarray,
+        axis: np.ndarray,
+        theta_c_rad: float,
+        n_samples: int = 720,
+        nappe: str = "trailing",
+        min_points: int = 5,
+        eps: float = 1e-12,
+        max_proj: float | None = None,
+        frame_mask: np.ndarray | None = None,
+        chunk_frames: int = 2048,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return batch_intersection_curves_on_cylinder(
+            self.radius,
+            self.z_min,
+            self.z_max,
+            apices,
+            axis,
+            theta_c_rad,
+            n_phi=n_samples,
+            nappe=nappe,
+            min_points=min_points,
+            eps=eps,
+            max_proj=max_proj,
+            frame_mask=frame_mask,
+            chunk_frames=chunk_frames,
+        )
+
+    def surface_mesh(self, resolution: int = 120) -> "pv.DataSet":
+        import pyvista as pv
+
+        return pv.Cylinder(
+            center=(0.0, 0.0, 0.5 * (self.z_min + self.z_max)),
+            direction=(0.0, 0.0, 1.0),
+            radius=self.radius,
+            height=self.z_max - self.z_min,
+            resolution=resolution,
+            capping=False,
+        )
+
+    def unwrap(self, points: np.ndarray) -> np.ndarray:
+        return unwrap_cylinder_points(points, self.radius)
+
+    def unwrap_bounds(self) -> tuple[float, float, float, float]:
+        return 0.0, self.unwrap_period, self.z_min, self.z_max
+
+
+class SphereDetector(DetectorGeometry):
+    """Sphere around ``center``, unwrapped to ``(R phi, z)`` (equal-area cylindrical projection)."""
+
+    kind = "sphere"
+    unwrap_title = "Sphere unwrap (s = R*phi, z)"
+
+    def __init__(self, center: np.ndarray, radius: float):
+        self.center = np.asarray(center, dtype=float)
+        self.radius = float(radius)
+        self.unwrap_period = 2.0 * np.pi * self.radius
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "sphere_center": self.center.tolist(), "cluster_radius": self.radius}
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        d = np.atleast_2d(np.asarray(points, dtype=float)) - self.center[None, :]
+        return np.sum(d * d, axis=1) <= self.radius**2
+
+    def surface_residual(self, points: np.ndarray) -> np.ndarray:
+        d = np.atleast_2d(np.asarray(points, dtype=float)) - self.center[None, :]
+        return np.sum(d * d, axis=1) - self.radius**2
+
+    def make_oms(self, n_strings: int, oms_per_string: int) -> np.ndarray:
+        """Strings run along meridians; OMs are evenly spaced in height."""
+        phi = np.linspace(0.0, 2.0 * np.pi, n_strings, endpoint=False)
+        dz = _string_levels(-self.radius, self.radius, oms_per_string)
+        rho = np.sqrt(np.maximum(self.radius**2 - dz**2, 0.0))
+        x = rho[None, :] * np.cos(phi)[:, None]
+        y = rho[None, :] * np.sin(phi)[:, None]
+        z = np.broadcast_to(dz[None, :], x.shape)
+        return np.column_stack([x.ravel(), y.ravel(), z.ravel()]) + self.center[None, :]
+
+    def intersection_batch(
+        self,
+        apices: np.ndarray,
+        axis: np.ndarray,
+        theta_c_rad: float,
+        n_samples: int = 720,
+        nappe: str = "trailing",
+        min_points: int = 5,
+        eps: float = 1e-12,
+        max_proj: float | None = None,
+        frame_mask: np.ndarray | None = None,
+        chunk_frames: int = 2048,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return batch_intersection_curves_on_sphere(
+            self.center,
+            self.radius,
+            apices,
+            axis,
+            theta_c_rad,
+            n_psi=n_samples,
+            nappe=nappe,
+            min_points=min_points,
+            max_proj=max_proj,
+            frame_mask=frame_mask,
+            chunk_frames=chunk_frames,
+        )
+
+    def surface_mesh(self, resolution: int = 120) -> "pv.DataSet":
+        import pyvista as pv
+
+        return pv.Sphere(
+            radius=self.radius,
+            center=self.center,
+            theta_resolution=max(8, resolution // 4),
+            phi_resolution=max(4, resolution // 8),
+        )
+
+    def unwrap(self, points: np.ndarray) -> np.ndarray:
+        pts = np.asarray(points, dtype=float).reshape(-1, 3) - self.center[None, :]
+        unwrap_pts = unwrap_cylinder_points(pts, self.radius)
+        unwrap_pts[:, 1] += self.center[2]
+        return unwrap_pts
+
+    def unwrap_bounds(self) -> tuple[float, float, float, float]:
+        return 0.0, self.unwrap_period, self.center[2] - self.radius, self.center[2] + self.radius
+
+
+class PlaneDetector(DetectorGeometry):
+    """Rectangle ``width x height`` in a plane, unwrapped to its in-plane coordinates.
+
+    The in-plane axes are ``e1`` (horizontal for non-vertical normals) and
+    ``e2 = normal x e1``. A plane has no interior, so ``contains`` is always true.
+    """
+
+    kind = "plane"
+    unwrap_title = "Plane (e1, e2)"
+
+    def __init__(self, origin: np.ndarray, normal: np.ndarray, width: float, height: float):
+        self.origin = np.asarray(origin, dtype=float)
+        self.normal = normalize(np.asarray(normal, dtype=float))
+        self.e1, self.e2 = perpendicular_basis(self.normal)
+        self.width = float(width)
+        self.height = float(height)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "plane_origin": self.origin.tolist(),
+            "plane_normal": self.normal.tolist(),
+            "plane_width": self.width,
+            "plane_height": self.height,
+        }
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        return np.ones(len(np.atleast_2d(points)), dtype=bool)
+
+    def surface_residual(self, points: np.ndarray) -> np.ndarray:
+        return (np.atleast_2d(np.asarray(points, dtype=float)) - self.origin[None, :]) @ self.normal
+
+    def _to_world(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Map in-plane coordinates to 3D points."""
+        return self.origin[None, :] + a[:, None] * self.e1[None, :] + b[:, None] * self.e2[None, :]
+
+    def make_oms(self, n_strings: int, oms_per_string: int) -> np.ndarray:
+        """Strings run along ``e2``, evenly spread over the width."""
+        a = ((np.arange(n_strings) + 0.5) / n_strings - 0.5) * self.width
+        b = _string_levels(-0.5 * self.height, 0.5 * self.height, oms_per_string)
+        aa, bb = np.meshgrid(a, b, indexing="ij")
+        return self._to_world(aa.ravel(), bb.ravel())
+
+    def intersection_batch(
+        self,
+        apices: np.ndarray,
+        axis: np.ndarray,
+        theta_c_rad: float,
+        n_samples: int = 720,
+        nappe: str = "trailing",
+        min_points: int = 5,
+        eps: float = 1e-12,
+        max_proj: float | None = None,
+        frame_mask: np.ndarray | None = None,
+        chunk_frames: int = 2048,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        a = np.linspace(-0.5 * self.width, 0.5 * self.width, n_samples)
+        line_points = self._to_world(a, np.zeros(n_samples))
+        line_dirs = np.tile(self.e2, (n_samples, 1))
+        return batch_intersection_curves_on_lines(
+            line_points,
+            line_dirs,
+            -0.5 * self.height,
+            0.5 * self.height,
+            apices,
+            axis,
+            theta_c_rad,
+            nappe=nappe,
+            min_points=min_points,
+            eps=eps,
+            max_proj=max_proj,
+            frame_mask=frame_mask,
+            chunk_frames=chunk_frames,
+            periodic=False,
+        )
+
+    def surface_mesh(self, resolution: int = 120) -> "pv.DataSet":
+        import pyvista as pv
+
+        n = max(2, resolution // 10) + 1
+        a, b = np.meshgrid(
+            np.linspace(-0.5 * self.width, 0.5 * self.width, n),
+            np.linspace(-0.5 * self.height, 0.5 * self.height, n),
+            indexing="ij",
+        )
+        pts = self._to_world(a.ravel(), b.ravel()).reshape(n, n, 3)
+        return pv.StructuredGrid(pts[..., 0], pts[..., 1], pts[..., 2])
+
+    def unwrap(self, points: np.ndarray) -> np.ndarray:
+        d = np.asarray(points, dtype=float).reshape(-1, 3) - self.origin[None, :]
+        return np.column_stack([d @ self.e1, d @ self.e2, np.zeros(len(d))])
+
+    def unwrap_bounds(self) -> tuple[float, float, float, float]:
+        return -0.5 * self.width, 0.5 * self.width, -0.5 * self.height, 0.5 * self.height
+
+
+class StringArrayDetector(DetectorGeometry):
+    """Vertical strings at ``(x, y)`` positions between ``z_min`` and ``z_max``.
+
+    The cone crosses each string in at most two points, so every hit is a
+    single-point segment. The unwrap is the usual event display: string index
+    (scaled so the view is square) against ``z``. ``contains`` tests the smallest
+    vertical cylinder around the array centroid that holds all strings.
+    """
+
+    kind = "strings"
+    unwrap_title = "Strings (string index, z)"
+
+    def __init__(self, positions: np.ndarray, z_min: float, z_max: float):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if len(self.positions) == 0:
+            raise ValueError("A string array needs at least one string position.")
+        self.z_min = float(z_min)
+        self.z_max = float(z_max)
+        self.pitch = (self.z_max - self.z_min) / len(self.positions)
+        self.center = self.positions.mean(axis=0)
+        self.radius = float(np.max(np.linalg.norm(self.positions - self.center[None, :], axis=1)))
+        keys = np.round(self.positions[:, 0], 6) + 1j * np.round(self.positions[:, 1], 6)
+        self._key_order = np.argsort(keys)
+        self._sorted_keys = keys[self._key_order]
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "string_layout": "list",
+            "string_positions": self.positions.tolist(),
+            "z_min": self.z_min,
+            "z_max": self.z_max,
+        }
+
+    def string_index(self, points: np.ndarray) -> np.ndarray:
+        """Return the string each point sits on, or -1."""
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+        keys = np.round(pts[:, 0], 6) + 1j * np.round(pts[:, 1], 6)
+        pos = np.clip(np.searchsorted(self._sorted_keys, keys), 0, len(self._sorted_keys) - 1)
+        return np.where(self._sorted_keys[pos] == keys, self._key_order[pos], -1)
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        pts = np.atleast_2d(np.asarray(points, dtype=float))
+        d = pts[:, :2] - self.center[None, :]
+        return (np.sum(d * d, axis=1) <= self.radius**2) & (pts[:, 2] >= self.z_min) & (pts[:, 2] <= self.z_max)
+
+    def surface_residual(self, points: np.ndarray) -> np.ndarray:
+        pts = np.atleast_2d(np.asarray(points, dtype=float))
+        idx = self.string_index(pts)
+        d = pts[:, :2] - self.positions[np.maximum(idx, 0)]
+        return np.where(idx >= 0, np.sqrt(np.sum(d * d, axis=1)), np.inf)
+
+    def make_oms(self, n_strings: int, oms_per_string: int) -> np.ndarray:
+        """``oms_per_string`` OMs on every string; ``n_strings`` is set by the positions."""
+        z = _string_levels(self.z_min, self.z_max, oms_per_string)
+        xy = np.repeat(self.positions, len(z), axis=0)
+        return np.column_stack([xy, np.tile(z, len(self.positions))])
+
+    def intersection_batch(
+        self,
+        apices: np.ndarray,
+        axis: np.ndarray,
+        theta_c_rad: float,
+        n_samples: int = 720,
+        nappe: str = "trailing",
+        min_points: int = 5,
+        eps: float = 1e-12,
+        max_proj: float | None = None,
+        frame_mask: np.ndarray | None = None,
+        chunk_frames: int = 2048,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        line_points = np.column_stack([self.positions, np.zeros(len(self.positions))])
+        line_dirs = np.tile([0.0, 0.0, 1.0], (len(self.positions), 1))
+        return batch_intersection_curves_on_lines(
+            line_points,
+            line_dirs,
+            self.z_min,
+            self.z_max,
+            apices,
+            axis,
+            theta_c_rad,
+            nappe=nappe,
+            min_points=1,
+            eps=eps,
+            max_proj=max_proj,
+            frame_mask=frame_mask,
+            chunk_frames=chunk_frames,
+            periodic=False,
+            connect=False,
+        )
+
+    def surface_mesh(self, resolution: int = 120) -> "pv.DataSet":
+        import pyvista as pv
+
+        n = len(self.positions)
+        pts = np.empty((2 * n, 3), dtype=float)
+        pts[0::2, :2] = self.positions
+        pts[1::2, :2] = self.positions
+        pts[0::2, 2] = self.z_min
+        pts[1::2, 2] = self.z_max
+        lines = np.column_stack([np.full(n, 2), np.arange(0, 2 * n, 2), np.arange(1, 2 * n, 2)]).ravel()
+        poly = pv.PolyData(pts)
+        poly.lines = lines.astype(np.int32)
+        return poly
+
+    def unwrap(self, points: np.ndarray) -> np.ndarray:
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+        idx = self.string_index(pts)
+        s = np.where(idx >= 0, idx * self.pitch, np.nan)
+        return np.column_stack([s, pts[:, 2], np.zeros(len(pts))])
+
+    def unwrap_bounds(self) -> tuple[float, float, float, float]:
+        return -0.5 * self.pitch, (len(self.positions) - 0.5) * self.pitch, self.z_min, self.z_max
+
+
+def _parse_string_positions(value) -> np.ndarray:
+    """Parse ``"x y; x y; ..."`` (or an array-like) into ``(n, 2)`` positions."""
+    if isinstance(value, str):
+        rows = [row.replace(",", " ").split() for row in value.split(";") if row.strip()]
+        return np.asarray(rows, dtype=float).reshape(-1, 2)
+    return np.asarray(value, dtype=float).reshape(-1, 2)
+
+
+def make_detector(detector_cfg: dict) -> DetectorGeometry:
+    """Build the detector described by a ``[detector]`` config (or ``to_dict``) mapping."""
+    kind = str(detector_cfg.get("kind", "cylinder")).strip().lower()
+    if kind == "cylinder":
+        return CylinderDetector(detector_cfg["cluster_radius"], detector_cfg["z_min"], detector_cfg["z_max"])
+    if kind == "sphere":
+        return SphereDetector(detector_cfg.get("sphere_center", (0.0, 0.0, 0.0)), detector_cfg["cluster_radius"])
+    if kind == "plane":
+        return PlaneDetector(
+            detector_cfg.get("plane_origin", (0.0, 0.0, 0.0)),
+            detector_cfg.get("plane_normal", (1.0, 0.0, 0.0)),
+            detector_cfg["plane_width"],
+            detector_cfg["plane_height"],
+        )
+    if kind == "strings":
+        layout = str(detector_cfg.get("string_layout", "hex")).strip().lower()
+        if layout == "hex":
+            positions = hexagonal_string_positions(detector_cfg["hex_rings"], detector_cfg["string_spacing"])
+        elif layout == "list":
+            positions = _parse_string_positions(detector_cfg["string_positions"])
+        else:
+            raise ValueError("detector.string_layout must be 'hex' or 'list'")
+        return StringArrayDetector(positions, detector_cfg["z_min"], detector_cfg["z_max"])
+    raise ValueError(f"detector.kind must be one of {', '.join(DETECTOR_KINDS)}")
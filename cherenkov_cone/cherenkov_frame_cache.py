@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .cherenkov_activation import om_activation
+    from .cherenkov_detectors import DetectorGeometry
+    from .cherenkov_geometry import multiline_arrays, normalize
+    from .cherenkov_history import history_frame_index
+except ImportError:
+    from cherenkov_activation import om_activation
+    from cherenkov_detectors import DetectorGeometry
+    from cherenkov_geometry import multiline_arrays, normalize
+    from cherenkov_history import history_frame_index
+
+
+# Bump when the per-frame arrays change so old sidecar files are ignored.
+FRAME_CACHE_VERSION = 1
+FRAME_KEYS = ("line_points", "line_cells", "active_oms", "unwrap_line_points", "unwrap_line_cells")
+
+
+def viewer_cache_path(npz_path: str | Path) -> Path:
+    """Sidecar cache next to a history ``.npz``: ``name.npz`` -> ``name.viewer_cache.npz``."""
+    return Path(npz_path).with_suffix(".viewer_cache.npz")
+
+
+class HistoryFrameGeometry:
+    """Per-frame viewer geometry of a saved history, looked up by slider position.
+
+    Positions run over the distinct saved frames in order. ``build`` returns plain
+    arrays (no VTK objects), so it can run in a background thread: the curve
+    points and lines connectivity in 3D and in the unwrap, and the indices of the
+    active OMs.
+    """
+
+    def __init__(
+        self,
+        apex_points: np.ndarray,
+        apex_frames: np.ndarray,
+        intersection_points: np.ndarray,
+        intersection_frames: np.ndarray,
+        intersection_segments: np.ndarray,
+        om_points: np.ndarray,
+        track_axis: np.ndarray,
+        theta_c_rad: float,
+        activation_distance: float,
+        min_points: int,
+        detector: DetectorGeometry,
+    ):
+        self.apex_points = np.asarray(apex_points, dtype=float).reshape(-1, 3)
+        apex_frames = np.asarray(apex_frames, dtype=np.int32)
+        self.frames = np.unique(apex_frames)
+        if len(self.frames) == 0:
+            self.frames = np.array([0], dtype=np.int32)
+
+        order, self._index_frames, self._index_offsets = history_frame_index(intersection_frames, intersection_segments)
+        self._segments = np.asarray(intersection_segments, dtype=np.int32)[order]
+        self._points = np.asarray(intersection_points, dtype=float).reshape(-1, 3)[order]
+
+        # First apex sample of every saved frame.
+        apex_order = np.argsort(apex_frames, kind="stable")
+        self.apex_index = apex_order[np.searchsorted(apex_frames[apex_order], self.frames)]
+        self.om_points = np.asarray(om_points, dtype=float).reshape(-1, 3)
+        self.track_axis = normalize(np.asarray(track_axis, dtype=float))
+        self.theta_c_rad = float(theta_c_rad)
+        self.activation_distance = float(activation_distance)
+        self.min_points = int(min_points)
+        self.detector = detector
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frames)
+
+    def frame_points(self, pos: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the intersection points and segment ids at a slider position as slices."""
+        frame = int(self.frames[pos])
+        i = int(np.searchsorted(self._index_frames, frame))
+        if i == len(self._index_frames) or self._index_frames[i] != frame:
+            return self._points[:0], self._segments[:0]
+        i0, i1 = self._index_offsets[i], self._index_offsets[i + 1]
+        return self._points[i0:i1], self._segments[i0:i1]
+
+    def build(self, pos: int) -> dict[str, np.ndarray]:
+        """Compute the ``FRAME_KEYS`` arrays of one slider position."""
+        pts, seg = self.frame_points(pos)
+        active_mask, _ = om_activation(
+            self.om_points,
+            pts,
+            seg,
+            self.activation_distance,
+            apex=self.apex_points[self.apex_index[pos]],
+            axis=self.track_axis,
+            theta_c_rad=self.theta_c_rad,
+        )
+        line_points, line_cells = multiline_arrays(pts, seg)
+        unwrap_points, unwrap_cells = multiline_arrays(
+            self.detector.unwrap(pts), seg, period=self.detector.unwrap_period, min_points=self.min_points
+        )
+        return {
+            "line_points": line_points,
+            "line_cells": line_cells,
+            "active_oms": np.flatnonzero(active_mask).astype(np.int32),
+            "unwrap_line_points": unwrap_points,
+            "unwrap_line_cells": unwrap_cells,
+        }
+
+    def cache_key(self) -> str:
+        """Hash of every input of ``build``; a sidecar file is only used when it matches."""
+        h = hashlib.sha1()
+        params = {
+            "version": FRAME_CACHE_VERSION,
+            "theta_c_rad": self.theta_c_rad,
+            "activation_distance": self.activation_distance,
+            "min_points": self.min_points,
+            "detector": self.detector.to_dict(),
+        }
+        h.update(json.dumps(params, sort_keys=True).encode())
+        for array in (
+            self.frames,
+            self.apex_index,
+            self.apex_points,
+            self._points,
+            self._segments,
+            self._index_frames,
+            self._index_offsets,
+            self.om_points,
+            self.track_axis,
+        ):
+            h.update(np.ascontiguousarray(array).tobytes())
+        return h.hexdigest()
+
+
+def save_frame_cache(path: str | Path, key: str, frames: list[dict[str, np.ndarray]]) -> None:
+    """Write per-frame arrays as one ``.npz``: ``name`` concatenated plus ``name_offsets``.
+
+    The file is written under a temporary name and moved into place.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {"key": np.asarray(key)}
+    for name in FRAME_KEYS:
+        parts = [frame[name] for frame in frames]
+        arrays[f"{name}_offsets"] = np.concatenate([[0], np.cumsum([len(part) for part in parts])]).astype(np.int64)
+        arrays[name] = np.concatenate(parts) if parts else np.empty((0,))
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_frame_cache(path: str | Path, key: str) -> dict[str, np.ndarray] | None:
+    """Read a sidecar written by ``save_frame_cache``; ``None`` if missing or stale."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            if str(data["key"]) != key:
+                return None
+            return {name: data[name] for name in data.files if name != "key"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def build_frame_cache(geometry: HistoryFrameGeometry, path: str | Path) -> Path:
+    """Compute every frame of ``geometry`` and write the sidecar file."""
+    save_frame_cache(path, geometry.cache_key(), [geometry.build(pos) for pos in range(geometry.n_frames)])
+    return Path(path)
+
+
+class FrameCache:
+    """Bounded cache of ``HistoryFrameGeometry.build`` results with background prefetch.
+
+    When ``cache_path`` holds a matching sidecar every frame is served from it.
+    Otherwise frames are built on demand and kept for the ``max_frames`` most
+    recently used positions, and ``prefetch(pos)`` queues the ``prefetch`` positions
+    on either side of ``pos`` on a worker thread. Only the calling thread touches
+    the cache; the worker only computes arrays.
+    """
+
+    def __init__(
+        self,
+        geometry: HistoryFrameGeometry,
+        max_frames: int = 64,
+        prefetch: int = 4,
+        cache_path: str | Path | None = None,
+    ):
+        self.geometry = geometry
+        self.max_frames = max(0, int(max_frames))
+        self.prefetch_frames = max(0, int(prefetch))
+        self.stored = None if cache_path is None else load_frame_cache(cache_path, geometry.cache_key())
+        self._frames: OrderedDict[int, dict] = OrderedDict()
+        self._pending: dict[int, Future] = {}
+        self._executor = None
+        if self.stored is None and self.prefetch_frames > 0:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-prefetch")
+
+    def get(self, pos: int) -> dict[str, np.ndarray]:
+        """Arrays of one slider position, built now if they are not ready."""
+        if self.stored is not None:
+            return {
+                name: self.stored[name][self.stored[f"{name}_offsets"][pos] : self.stored[f"{name}_offsets"][pos + 1]]
+                for name in FRAME_KEYS
+            }
+        if pos in self._frames:
+            self._frames.move_to_end(pos)
+            return self._frames[pos]
+        future = self._pending.pop(pos, None)
+        frame = future.result() if future is not None and not future.cancelled() else self.geometry.build(pos)
+        self._store(pos, frame)
+        return frame
+
+    def prefetch(self, pos: int) -> None:
+        """Queue the neighbours of ``pos``, nearest first, and drop queued frames far from it."""
+        if self._executor is None:
+            return
+        for p, future in list(self._pending.items()):
+            if future.done():
+                del self._pending[p]
+                if not future.cancelled() and future.exception() is None:
+                    self._store(p, future.result())
+            elif abs(p - pos) > self.prefetch_frames and future.cancel():
+                del self._pending[p]
+        for step in range(1, self.prefetch_frames + 1):
+            for p in (pos + step, pos - step):
+                if 0 <= p < self.geometry.n_frames and p not in self._frames and p not in self._pending:
+                    self._pending[p] = self._executor.submit(self.geometry.build, p)
+
+    def close(self) -> None:
+        """Stop the prefetch thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._pending.clear()
+
+    def _store(self, pos: int, frame: dict) -> None:
+        """Insert a frame and evict the least recently used ones."""
+        if self.max_frames == 0:
+            return
+        self._frames[pos] = frame
+        self._frames.move_to_end(pos)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
@@ -1,5 +1,32 @@
+from pathlib import Path
+from typing import Callable
+
 import numpy as np
-import pyvista as pv
+
+# Pure NumPy core: every function returns plain arrays. The PyVista wrappers live in
+# ``cherenkov_polydata`` and are loaded on first access through ``__getattr__``.
+_POLYDATA_ADAPTERS = (
+    "analytic_intersection_curve_on_cylinder",
+    "segmented_points_to_polylines",
+    "polylines_to_segmented_points",
+    "unwrapped_multiline_polydata",
+    "build_unwrapped_multiline_polydata",
+    "make_unwrapped_rectangle",
+    "make_unwrapped_outline",
+    "make_unwrapped_guides",
+    "make_unwrapped_string_guides",
+)
+
+
+def __getattr__(name: str):
+    """Resolve the PyVista adapters lazily so importing the core never loads VTK."""
+    if name in _POLYDATA_ADAPTERS:
+        try:
+            from . import cherenkov_polydata
+        except ImportError:
+            import cherenkov_polydata
+        return getattr(cherenkov_polydata, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def normalize(v: np.ndarray) -> np.ndarray:
@@ -10,6 +37,14 @@ def normalize(v: np.ndarray) -> np.ndarray:
     return v / n
 
 
+def perpendicular_basis(axis: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return two unit vectors completing ``axis`` to a right-handed basis."""
+    axis = normalize(np.asarray(axis, dtype=float))
+    ref = np.array([0.0, 0.0, 1.0]) if abs(axis[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    e1 = normalize(np.cross(ref, axis))
+    return e1, np.cross(axis, e1)
+
+
 def make_track_points(r0: np.ndarray, u: np.ndarray, s_min: float, s_max: float, n: int = 200) -> np.ndarray:
     """Sample evenly spaced points along the muon track."""
     s = np.linspace(s_min, s_max, n)
@@ -32,8 +67,8 @@ def _nappe_mask(proj: np.ndarray, nappe: str, max_proj: float | None = None) ->
     return mask
 
 
-def _branches_from_masked_curve(points: np.ndarray, mask: np.ndarray, min_points: int = 5) -> list[pv.PolyData]:
-    """Split a sampled periodic curve into contiguous valid branches."""
+def _branch_indices(mask: np.ndarray, min_points: int = 5) -> list[np.ndarray]:
+    """Split a sampled periodic curve into index runs of contiguous valid samples."""
     idx = np.flatnonzero(mask)
     if len(idx) == 0:
         return []
@@ -45,15 +80,10 @@ def _branches_from_masked_curve(points: np.ndarray, mask: np.ndarray, min_points
         merged = np.concatenate([chunks[-1], chunks[0]])
         chunks = [merged] + chunks[1:-1]
 
-    polylines = []
-    for chunk in chunks:
-        if len(chunk) < min_points:
-            continue
-        polylines.append(pv.lines_from_points(points[chunk], close=False))
-    return polylines
+    return [chunk for chunk in chunks if len(chunk) >= min_points]
 
 
-def analytic_intersection_curve_on_cylinder(
+def analytic_intersection_segments(
     radius: float,
     z_min: float,
     z_max: float,
@@ -65,8 +95,12 @@ def analytic_intersection_curve_on_cylinder(
     min_points: int = 5,
     eps: float = 1e-12,
     max_proj: float | None = None,
-) -> list[pv.PolyData]:
-    """Compute the exact cone-cylinder intersection on the side surface."""
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the exact cone-cylinder intersection on the side surface.
+
+    Returns ``(points, segment_offsets)``: branch ``k`` is
+    ``points[segment_offsets[k]:segment_offsets[k + 1]]``.
+    """
     axis = normalize(np.asarray(axis, dtype=float))
     apex = np.asarray(apex, dtype=float)
 
@@ -88,7 +122,7 @@ def analytic_intersection_curve_on_cylinder(
     B = 2.0 * beta * uz
     C = beta**2 - c2 * rho2
 
-    branches: list[pv.PolyData] = []
+    branches: list[np.ndarray] = []
 
     if abs(A) < eps:
         valid = np.abs(B) > eps
@@ -101,7 +135,8 @@ def analytic_intersection_curve_on_cylinder(
         d = pts - apex[None, :]
         proj = d @ axis
         mask &= _nappe_mask(proj, nappe=nappe, max_proj=max_proj)
-        return _branches_from_masked_curve(pts, mask, min_points=min_points)
+        branches = [pts[chunk] for chunk in _branch_indices(mask, min_points=min_points)]
+        return _concat_segments(branches)
 
     D = B**2 - 4.0 * A * C
     D = np.where(D < -eps, np.nan, np.clip(D, 0.0, None))
@@ -116,19 +151,37 @@ def analytic_intersection_curve_on_cylinder(
         d = pts - apex[None, :]
         proj = d @ axis
         mask &= _nappe_mask(proj, nappe=nappe, max_proj=max_proj)
-        branches.extend(_branches_from_masked_curve(pts, mask, min_points=min_points))
+        branches.extend(pts[chunk] for chunk in _branch_indices(mask, min_points=min_points))
 
-    return branches
+    return _concat_segments(branches)
+
+
+def _concat_segments(segments: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Stack point runs into ``(points, segment_offsets)``."""
+    offsets = np.concatenate([[0], np.cumsum([len(seg) for seg in segments])]).astype(np.int64)
+    if not segments:
+        return np.empty((0, 3), dtype=float), offsets
+    return np.vstack(segments), offsets
 
 
 def verify_intersection(
-    polylines: list[pv.PolyData],
+    polylines: list,
     apex: np.ndarray,
     axis: np.ndarray,
     theta_c_rad: float,
-    radius: float,
+    radius: float | None = None,
+    surface_residual: Callable[[np.ndarray], np.ndarray] | None = None,
 ) -> tuple[float, float, int]:
-    """Return residuals for the cylinder and cone constraints."""
+    """Return residuals for the detector surface and cone constraints.
+
+    ``polylines`` holds ``(n, 3)`` point arrays or datasets with ``.points``. The
+    surface residual is ``x^2 + y^2 - radius^2`` unless ``surface_residual``
+    (e.g. ``DetectorGeometry.surface_residual``) is given.
+    """
+    if surface_residual is None:
+        def surface_residual(pts: np.ndarray) -> np.ndarray:
+            return pts[:, 0] ** 2 + pts[:, 1] ** 2 - radius**2
+
     axis = normalize(np.asarray(axis, dtype=float))
     apex = np.asarray(apex, dtype=float)
     c2 = np.cos(theta_c_rad) ** 2
@@ -138,12 +191,12 @@ def verify_intersection(
     n_pts = 0
 
     for poly in polylines:
-        pts = np.asarray(poly.points)
+        pts = np.asarray(getattr(poly, "points", poly), dtype=float).reshape(-1, 3)
         if len(pts) == 0:
             continue
 
         n_pts += len(pts)
-        cyl_err = np.max(np.abs(pts[:, 0] ** 2 + pts[:, 1] ** 2 - radius**2))
+        cyl_err = np.max(np.abs(surface_residual(pts)))
 
         d = pts - apex[None, :]
         lhs = (d @ axis) ** 2
@@ -162,13 +215,39 @@ def make_oms_on_cylinder(radius: float, z_min: float, z_max: float,
     phis = np.linspace(0.0, 2.0 * np.pi, n_strings, endpoint=False)
     zs = np.linspace(z_min + 0.08 * (z_max - z_min), z_max - 0.08 * (z_max - z_min), oms_per_string)
 
-    pts = []
-    for ph in phis:
-        x = radius * np.cos(ph)
-        y = radius * np.sin(ph)
-        for z in zs:
-            pts.append([x, y, z])
-    return np.asarray(pts, dtype=float)
+    # String-major order: all OMs of the first string, then the next one.
+    return np.column_stack([
+        np.repeat(radius * np.cos(phis), len(zs)),
+        np.repeat(radius * np.sin(phis), len(zs)),
+        np.tile(zs, len(phis)),
+    ])
+
+
+def load_om_positions(path: str | Path) -> np.ndarray:
+    """Load ``(n, 3)`` OM positions from a ``.npy`` file or a CSV/whitespace table.
+
+    Text files may use ``,`` or whitespace separators, ``#`` comments and one
+    header line; only the first three columns are read.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".npy":
+        pts = np.load(path)
+    else:
+        with path.open() as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+        lines = [line for line in lines if line]
+        if not lines:
+            raise ValueError(f"No OM positions in {path}.")
+        try:
+            float(lines[0].replace(",", " ").split()[0])
+        except ValueError:
+            lines = lines[1:]
+        delimiter = "," if lines and "," in lines[0] else None
+        pts = np.loadtxt(lines, delimiter=delimiter, usecols=(0, 1, 2), ndmin=2)
+    pts = np.asarray(pts, dtype=float)
+    if pts.ndim != 2 or pts.shape[1] != 3:
+        raise ValueError(f"OM positions in {path} must have shape (n, 3), got {pts.shape}.")
+    return pts
 
 
 def unwrap_cylinder_points(points: np.ndarray, radius: float) -> np.ndarray:
@@ -182,141 +261,106 @@ def unwrap_cylinder_points(points: np.ndarray, radius: float) -> np.ndarray:
     return np.column_stack([s, pts[:, 2], np.zeros(len(pts), dtype=float)])
 
 
-def _ordered_segment_point_chunks(
+def segment_runs(
     points: np.ndarray,
     segment_ids: np.ndarray,
-    min_points: int = 2,
-) -> list[np.ndarray]:
-    """Group points by segment id while preserving segment order."""
-    if len(points) == 0:
-        return []
-
-    pts = np.asarray(points, dtype=float)
-    seg = np.asarray(segment_ids, dtype=np.int32)
-    ordered_segments = list(dict.fromkeys(seg.tolist()))
-
-    chunks: list[np.ndarray] = []
-    for segment_id in ordered_segments:
-        seg_pts = pts[seg == segment_id]
-        if len(seg_pts) >= min_points:
-            chunks.append(seg_pts)
-    return chunks
-
-
-def segmented_points_to_polylines(
+    period: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Group points by segment id and cut them into runs.
+
+    Segments keep their first-appearance order and points their order within a
+    segment. Runs end where the segment changes and, with a periodic unwrap
+    (``period`` along the first coordinate), where a segment jumps across the seam.
+    Returns the reordered points and the run lengths; already grouped input (the
+    usual case) is not sorted, so this is linear in the number of points.
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    seg = np.asarray(segment_ids).reshape(-1)
+    if len(pts) == 0:
+        return pts, np.empty((0,), dtype=np.int64)
+
+    change = seg[1:] != seg[:-1]
+    run_seg = seg[np.flatnonzero(np.concatenate([[True], change]))]
+    if len(np.unique(run_seg)) != len(run_seg):
+        # A segment id appears in several runs: stable sort by first appearance.
+        _, first, inverse = np.unique(seg, return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(first))
+        order = np.argsort(rank[inverse.reshape(-1)], kind="stable")
+        pts, seg = pts[order], seg[order]
+        change = seg[1:] != seg[:-1]
+
+    if period is not None:
+        change = change | (np.abs(np.diff(pts[:, 0])) > 0.5 * period)
+    starts = np.flatnonzero(np.concatenate([[True], change]))
+    return pts, np.diff(np.append(starts, len(pts)))
+
+
+def polyline_cells(lengths: np.ndarray) -> np.ndarray:
+    """Return VTK lines connectivity ``[n, i0, ..., i(n-1), ...]`` for consecutive runs."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    n_ids = int(lengths.sum())
+    header = np.arange(len(lengths)) + np.concatenate([[0], np.cumsum(lengths[:-1])])
+    cells = np.empty(n_ids + len(lengths), dtype=np.int32)
+    is_id = np.ones(len(cells), dtype=bool)
+    is_id[header] = False
+    cells[header] = lengths
+    cells[is_id] = np.arange(n_ids)
+    return cells
+
+
+def multiline_arrays(
     points: np.ndarray,
     segment_ids: np.ndarray,
+    period: float | None = None,
     min_points: int = 2,
-) -> list[pv.PolyData]:
-    """Convert segmented point arrays back to individual polylines."""
-    polylines: list[pv.PolyData] = []
-    for seg_pts in _ordered_segment_point_chunks(points, segment_ids, min_points=min_points):
-        polylines.append(pv.lines_from_points(seg_pts, close=False))
-    return polylines
-
-
-def polylines_to_segmented_points(polylines: list[pv.PolyData]) -> tuple[np.ndarray, np.ndarray]:
-    """Flatten polyline branches into points plus segment ids."""
-    point_chunks: list[np.ndarray] = []
-    segment_chunks: list[np.ndarray] = []
-
-    for segment_id, poly in enumerate(polylines):
-        pts = np.asarray(poly.points, dtype=float)
-        if len(pts) == 0:
-            continue
-        point_chunks.append(pts)
-        segment_chunks.append(np.full(len(pts), segment_id, dtype=np.int32))
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the points and VTK lines connectivity of the runs with ``min_points`` or more."""
+    pts, lengths = segment_runs(points, segment_ids, period=period)
+    keep = lengths >= min_points
+    return pts[np.repeat(keep, lengths)], polyline_cells(lengths[keep])
 
-    if not point_chunks:
-        return np.empty((0, 3), dtype=float), np.empty((0,), dtype=np.int32)
 
-    return np.vstack(point_chunks), np.concatenate(segment_chunks)
-
-
-def build_unwrapped_multiline_polydata(
+def _ordered_segment_point_chunks(
     points: np.ndarray,
     segment_ids: np.ndarray,
-    radius: float,
     min_points: int = 2,
-) -> pv.PolyData:
-    """Build an unwrapped multiline dataset and split across the seam."""
-    period = 2.0 * np.pi * radius
-    point_chunks: list[np.ndarray] = []
-    line_chunks: list[np.ndarray] = []
-    offset = 0
-
-    for seg_pts in _ordered_segment_point_chunks(points, segment_ids, min_points=min_points):
-        unwrap_pts = unwrap_cylinder_points(seg_pts, radius)
-        if len(unwrap_pts) < min_points:
-            continue
-
-        jump_idx = np.where(np.abs(np.diff(unwrap_pts[:, 0])) > 0.5 * period)[0]
-        idx_chunks = np.split(np.arange(len(unwrap_pts), dtype=np.int32), jump_idx + 1)
-
-        for idx_chunk in idx_chunks:
-            if len(idx_chunk) < min_points:
-                continue
-            chunk = unwrap_pts[idx_chunk]
-            point_chunks.append(chunk)
-            line = np.hstack([[len(chunk)], np.arange(offset, offset + len(chunk), dtype=np.int32)])
-            line_chunks.append(line)
-            offset += len(chunk)
-
-    if not point_chunks:
-        return pv.PolyData(np.empty((0, 3), dtype=float))
-
-    poly = pv.PolyData(np.vstack(point_chunks))
-    poly.lines = np.hstack(line_chunks).astype(np.int32)
-    return poly
+) -> list[np.ndarray]:
+    """Group points by segment id while preserving segment order."""
+    pts, lengths = segment_runs(points, segment_ids)
+    chunks = np.split(pts, np.cumsum(lengths)[:-1]) if len(lengths) else []
+    return [chunk for chunk in chunks if len(chunk) >= min_points]
 
 
-def make_unwrapped_outline(radius: float, z_min: float, z_max: float) -> pv.PolyData:
-    """Create a rectangular outline for the cylinder unwrap view."""
-    s_max = 2.0 * np.pi * radius
-    pts = np.asarray(
+def unwrapped_rectangle_points(bounds: tuple[float, float, float, float]) -> np.ndarray:
+    """Closed outline ``(s_min, s_max, t_min, t_max)`` of an unwrap view as 5 points."""
+    s_min, s_max, t_min, t_max = bounds
+    return np.asarray(
         [
-            [0.0, z_min, 0.0],
-            [s_max, z_min, 0.0],
-            [s_max, z_max, 0.0],
-            [0.0, z_max, 0.0],
-            [0.0, z_min, 0.0],
+            [s_min, t_min, 0.0],
+            [s_max, t_min, 0.0],
+            [s_max, t_max, 0.0],
+            [s_min, t_max, 0.0],
+            [s_min, t_min, 0.0],
         ],
         dtype=float,
     )
-    return pv.lines_from_points(pts, close=False)
-
 
-def make_unwrapped_string_guides(om_points: np.ndarray, radius: float, z_min: float, z_max: float) -> pv.PolyData:
-    """Create vertical guide lines for OM strings in the unwrap view."""
-    unwrap_pts = unwrap_cylinder_points(om_points, radius)
-    if len(unwrap_pts) == 0:
-        return pv.PolyData(np.empty((0, 3), dtype=float))
 
+def unwrapped_guide_arrays(unwrap_om_points: np.ndarray, t_min: float, t_max: float) -> tuple[np.ndarray, np.ndarray]:
+    """Points and lines connectivity of vertical guides through the unwrapped OM columns."""
+    unwrap_pts = np.asarray(unwrap_om_points, dtype=float).reshape(-1, 3)
     s_values = np.unique(np.round(unwrap_pts[:, 0], decimals=6))
-    point_chunks: list[np.ndarray] = []
-    line_chunks: list[np.ndarray] = []
-    offset = 0
-
-    for s in s_values:
-        pts = np.asarray([[s, z_min, 0.0], [s, z_max, 0.0]], dtype=float)
-        point_chunks.append(pts)
-        line = np.hstack([[2], np.arange(offset, offset + 2, dtype=np.int32)])
-        line_chunks.append(line)
-        offset += 2
-
-    poly = pv.PolyData(np.vstack(point_chunks))
-    poly.lines = np.hstack(line_chunks).astype(np.int32)
-    return poly
-
-
-def nearest_distance_to_polylines(points: np.ndarray, polylines: list[pv.PolyData]) -> np.ndarray:
-    """Approximate point-to-curve distance using polyline vertices."""
-    if not polylines:
-        return np.full(len(points), np.inf)
-
-    curve_pts = np.vstack([np.asarray(poly.points) for poly in polylines if poly.n_points > 0])
-    if len(curve_pts) == 0:
-        return np.full(len(points), np.inf)
-
-    d2 = ((points[:, None, :] - curve_pts[None, :, :]) ** 2).sum(axis=2)
-    return np.sqrt(np.min(d2, axis=1))
+    s_values = s_values[np.isfinite(s_values)]
+    n = len(s_values)
+    pts = np.zeros((2 * n, 3), dtype=float)
+    pts[0::2, 0] = s_values
+    pts[1::2, 0] = s_values
+    pts[0::2, 1] = t_min
+    pts[1::2, 1] = t_max
+
+    lines = np.empty((n, 3), dtype=np.int32)
+    lines[:, 0] = 2
+    lines[:, 1] = np.arange(0, 2 * n, 2)
+    lines[:, 2] = lines[:, 1] + 1
+    return pts, lines.ravel()
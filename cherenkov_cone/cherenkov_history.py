@@ -1,7 +1,21 @@
+import json
+import os
+import re
+import zipfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pyvista as pv
+
+try:
+    from .cherenkov_geometry import multiline_arrays
+except ImportError:
+    from cherenkov_geometry import multiline_arrays
+
+# PyVista is imported inside the functions that build datasets, so the npz and
+# store I/O can be used by worker processes without loading VTK.
+if TYPE_CHECKING:
+    import pyvista as pv
 
 
 def save_history_npz(
@@ -17,10 +31,29 @@ def save_history_npz(
     radius: float,
     z_min: float,
     z_max: float,
+    apex_times: np.ndarray | None = None,
+    om_points: np.ndarray | None = None,
+    om_arrival_times: np.ndarray | None = None,
+    detector: dict | None = None,
+    om_npe: np.ndarray | None = None,
 ) -> None:
-    """Save sampled history arrays to an ``.npz`` bundle."""
+    """Save sampled history arrays to an ``.npz`` bundle.
+
+    ``detector`` (``DetectorGeometry.to_dict()``) is stored as JSON in ``detector_json``.
+    """
     path = Path(npz_path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    extra = {}
+    if apex_times is not None:
+        extra["apex_times"] = np.asarray(apex_times, dtype=float)
+    if om_points is not None:
+        extra["om_points"] = np.asarray(om_points, dtype=float)
+    if om_arrival_times is not None:
+        extra["om_arrival_times"] = np.asarray(om_arrival_times, dtype=float)
+    if om_npe is not None:
+        extra["om_npe"] = np.asarray(om_npe, dtype=float)
+    if detector is not None:
+        extra["detector_json"] = json.dumps(detector)
     np.savez(
         path,
         apex_points=apex_points,
@@ -34,6 +67,7 @@ def save_history_npz(
         cylinder_radius=float(radius),
         z_min=float(z_min),
         z_max=float(z_max),
+        **extra,
     )
 
 
@@ -47,6 +81,8 @@ def save_history_vtm(
     intersection_segments: np.ndarray,
 ) -> None:
     """Save sampled history geometry to a ``.vtm`` scene."""
+    import pyvista as pv
+
     path = Path(vtm_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -68,32 +104,509 @@ def save_history_vtm(
 
 
 
-def build_multiline_polydata(points: np.ndarray, segment_ids: np.ndarray) -> pv.PolyData:
+def history_frame_index(
+    intersection_frames: np.ndarray,
+    intersection_segments: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Index flat history arrays by frame.
+
+    Returns ``(order, frame_numbers, offsets)``: ``order`` sorts points by frame and
+    segment (stable, so point order inside a segment is kept) and the points of
+    ``frame_numbers[i]`` are ``order[offsets[i]:offsets[i + 1]]``.
+    """
+    frames = np.asarray(intersection_frames, dtype=np.int64)
+    segments = np.asarray(intersection_segments, dtype=np.int64)
+    order = np.lexsort((segments, frames))
+    sorted_frames = frames[order]
+
+    starts = np.flatnonzero(np.concatenate([[True], sorted_frames[1:] != sorted_frames[:-1]]))[: len(frames)]
+    frame_numbers = sorted_frames[starts].astype(np.int32)
+    offsets = np.concatenate([starts, [len(frames)]]).astype(np.int64)
+    return order, frame_numbers, offsets
+
+
+def build_multiline_polydata(points: np.ndarray, segment_ids: np.ndarray) -> "pv.PolyData":
     """Build a multi-segment polyline dataset from point chunks."""
+    import pyvista as pv
+
     if len(points) == 0:
         return pv.PolyData(np.empty((0, 3), dtype=float))
 
-    points = np.asarray(points, dtype=float)
+    line_points, lines = multiline_arrays(points, segment_ids)
+    if len(lines) == 0:
+        return pv.PolyData(np.asarray(points, dtype=float))
+
+    poly = pv.PolyData(line_points)
+    poly.lines = lines
+    return poly
+
+
+class HistoryWriter:
+    """Append history frames to a chunked on-disk store while the run is going.
+
+    Frames are buffered and written every ``chunk_frames`` frames as
+    ``chunk_NNNNN_points.npy`` / ``chunk_NNNNN_segments.npy`` (or one compressed
+    ``chunk_NNNNN.npz`` with ``compress``). After each chunk the frame table
+    ``index.npy`` (``frame, chunk, start, stop``), ``apex_points.npy`` and
+    ``apex_times.npy`` are replaced atomically, so a crashed run keeps every
+    flushed frame. ``float32`` halves the size of the intersection points.
+
+    The directory must be empty or hold a previous store; any other file in it
+    raises ``FileExistsError`` instead of being mixed with the store.
+    """
+
+    # Files a store writes, besides the ``<name>.npy`` of its extra arrays.
+    STORE_FILE = re.compile(
+        r"chunk_\d+(_points\.npy|_segments\.npy|\.npz)|(index|apex_points|apex_times)(\.tmp)?\.npy|meta\.json(\.tmp)?"
+    )
+
+    def __init__(
+        self,
+        store_path: str | Path,
+        chunk_frames: int = 256,
+        float32: bool = False,
+        compress: bool = False,
+        meta: dict | None = None,
+        arrays: dict[str, np.ndarray] | None = None,
+    ):
+        self.path = Path(store_path)
+        self._check_owned(arrays or {})
+        self.path.mkdir(parents=True, exist_ok=True)
+        for old in self.path.glob("chunk_*"):
+            old.unlink()
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.dtype = np.float32 if float32 else np.float64
+        self.compress = compress
+        self.n_chunks = 0
+        self.n_segments = 0
+        self._index: list[tuple[int, int, int, int]] = []
+        self._apex_points: list[np.ndarray] = []
+        self._apex_times: list[float] = []
+        self._pending_points: list[np.ndarray] = []
+        self._pending_segments: list[np.ndarray] = []
+        self._pending_frames = 0
+        self._chunk_size = 0
+
+        for name, value in (arrays or {}).items():
+            np.save(self.path / f"{name}.npy", np.asarray(value))
+        self._meta = dict(meta or {})
+        self._meta.update({"dtype": np.dtype(self.dtype).name, "compress": bool(compress), "arrays": sorted(arrays or {})})
+        self._write_index()
+
+    def append_frame(
+        self,
+        frame: int,
+        apex_point: np.ndarray,
+        apex_time: float,
+        points: np.ndarray,
+        segment_ids: np.ndarray,
+    ) -> None:
+        """Add one frame; ``segment_ids`` are local and get renumbered globally."""
+        points = np.asarray(points, dtype=self.dtype).reshape(-1, 3)
+        segment_ids = np.asarray(segment_ids, dtype=np.int64)
+        if len(segment_ids) > 0:
+            _, local = np.unique(segment_ids, return_inverse=True)
+            global_ids = (local + self.n_segments).astype(np.int32)
+            self.n_segments += int(local.max()) + 1
+        else:
+            global_ids = np.empty(0, dtype=np.int32)
+
+        start = self._chunk_size
+        self._chunk_size += len(points)
+        self._index.append((int(frame), self.n_chunks, start, self._chunk_size))
+        self._apex_points.append(np.asarray(apex_point, dtype=float))
+        self._apex_times.append(float(apex_time))
+        self._pending_points.append(points)
+        self._pending_segments.append(global_ids)
+        self._pending_frames += 1
+        if self._pending_frames >= self.chunk_frames:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered frames as a new chunk and update the frame table."""
+        if self._pending_frames == 0:
+            return
+        points = np.concatenate(self._pending_points).reshape(-1, 3)
+        segments = np.concatenate(self._pending_segments)
+        stem = f"chunk_{self.n_chunks:05d}"
+        if self.compress:
+            np.savez_compressed(self.path / f"{stem}.npz", points=points, segments=segments)
+        else:
+            np.save(self.path / f"{stem}_points.npy", points)
+            np.save(self.path / f"{stem}_segments.npy", segments)
+        self.n_chunks += 1
+        self._pending_points = []
+        self._pending_segments = []
+        self._pending_frames = 0
+        self._chunk_size = 0
+        self._write_index()
+
+    def close(self) -> None:
+        """Flush the last partial chunk."""
+        self.flush()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _check_owned(self, arrays: dict) -> None:
+        """Refuse a directory holding files that are not part of a history store."""
+        if not self.path.exists():
+            return
+        if not self.path.is_dir():
+            raise FileExistsError(f"history store path {self.path} exists and is not a directory")
+        owned = {f"{name}.npy" for name in arrays}
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            try:
+                owned.update(f"{name}.npy" for name in json.loads(meta_path.read_text()).get("arrays", []))
+            except (OSError, ValueError):
+                pass
+        foreign = sorted(
+            entry.name
+            for entry in self.path.iterdir()
+            if entry.name not in owned and not self.STORE_FILE.fullmatch(entry.name)
+        )
+        if foreign:
+            shown = ", ".join(foreign[:5]) + (", ..." if len(foreign) > 5 else "")
+            raise FileExistsError(f"{self.path} is not a history store directory (found {shown})")
+
+    def _write_index(self) -> None:
+        """Replace the frame table with the flushed frames only."""
+        n_done = len(self._index) - self._pending_frames
+        tables = {
+            "index": np.asarray(self._index[:n_done], dtype=np.int64).reshape(-1, 4),
+            "apex_points": np.asarray(self._apex_points[:n_done], dtype=float).reshape(-1, 3),
+            "apex_times": np.asarray(self._apex_times[:n_done], dtype=float),
+        }
+        for name, table in tables.items():
+            tmp = self.path / f"{name}.tmp.npy"
+            np.save(tmp, table)
+            os.replace(tmp, self.path / f"{name}.npy")
+        meta = dict(self._meta, n_chunks=self.n_chunks, n_frames=n_done)
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.path / "meta.json")
+
+
+def frame_polydata(points: np.ndarray, segment_ids: np.ndarray) -> "pv.PolyData":
+    """Build one frame's curves from contiguous segments; single-point segments become vertices."""
+    import pyvista as pv
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
     segment_ids = np.asarray(segment_ids, dtype=np.int32)
-    ordered_segments = list(dict.fromkeys(segment_ids.tolist()))
-    point_chunks = []
-    line_chunks = []
-    offset = 0
-
-    for seg in ordered_segments:
-        seg_pts = points[segment_ids == seg]
-        if len(seg_pts) < 2:
-            continue
-        point_chunks.append(seg_pts)
-        line = np.hstack([[len(seg_pts)], np.arange(offset, offset + len(seg_pts), dtype=np.int32)])
-        line_chunks.append(line)
-        offset += len(seg_pts)
-
-    if not point_chunks:
-        return pv.PolyData(points)
-
-    out_points = np.vstack(point_chunks)
-    out_lines = np.hstack(line_chunks).astype(np.int32)
-    poly = pv.PolyData(out_points)
-    poly.lines = out_lines
+    poly = pv.PolyData(points)
+    if len(points) == 0:
+        return poly
+
+    starts = np.flatnonzero(np.concatenate([[True], segment_ids[1:] != segment_ids[:-1]]))
+    lengths = np.diff(np.concatenate([starts, [len(points)]]))
+    multi = lengths >= 2
+    if np.any(multi):
+        # ``[n, i0, ..., i(n-1)]`` per segment: a length entry before every run.
+        line_ids = np.flatnonzero(np.repeat(multi, lengths)).astype(np.int32)
+        run_starts = np.concatenate([[0], np.cumsum(lengths[multi])[:-1]])
+        poly.lines = np.insert(line_ids, run_starts, lengths[multi]).astype(np.int32)
+    if not np.all(multi):
+        single = starts[~multi]
+        poly.verts = np.column_stack([np.ones(len(single), dtype=np.int32), single]).ravel()
+    poly["segment_id"] = segment_ids
     return poly
+
+
+def om_polydata(
+    om_points: np.ndarray,
+    om_arrival_times: np.ndarray | None = None,
+    om_npe: np.ndarray | None = None,
+) -> "pv.PolyData":
+    """OM positions with their direct-light arrival time and expected photo-electrons."""
+    import pyvista as pv
+
+    poly = pv.PolyData(np.asarray(om_points, dtype=float).reshape(-1, 3))
+    if om_arrival_times is not None:
+        poly["arrival_time"] = np.asarray(om_arrival_times, dtype=float)
+    if om_npe is not None:
+        poly["npe"] = np.asarray(om_npe, dtype=float)
+    return poly
+
+
+class PvdSeriesWriter:
+    """Stream history frames to a ParaView ``.pvd`` time series.
+
+    Every frame is written as ``<stem>_frames/curves_NNNNNN.vtp`` (intersection curves,
+    part 0) and ``apex_NNNNNN.vtp`` (part 1), with the frame time as the timestep.
+    The ``.pvd`` collection is replaced atomically every ``flush_frames`` frames and on
+    close, so ParaView can open a run in progress and only loads the current step.
+    ``static`` datasets (e.g. the OMs) are written once next to the frames and listed
+    as parts 2, 3, ... at every timestep, pointing at the same file.
+    """
+
+    def __init__(
+        self,
+        pvd_path: str | Path,
+        flush_frames: int = 64,
+        static: dict[str, "pv.DataSet"] | None = None,
+    ):
+        self.path = Path(pvd_path)
+        self.frames_dir = self.path.with_name(f"{self.path.stem}_frames")
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        for old in self.frames_dir.glob("*.vtp"):
+            old.unlink()
+        self.flush_frames = max(1, int(flush_frames))
+        self.n_frames = 0
+        self._entries: list[tuple[float, int, str, str]] = []
+        self._static: list[tuple[int, str, str]] = []
+        self._pending_frames = 0
+        for part, (name, dataset) in enumerate((static or {}).items(), start=2):
+            dataset.save(self.frames_dir / f"{name}.vtp")
+            self._static.append((part, name, f"{self.frames_dir.name}/{name}.vtp"))
+        self.flush()
+
+    def append_frame(
+        self,
+        frame: int,
+        apex_point: np.ndarray,
+        apex_time: float,
+        points: np.ndarray,
+        segment_ids: np.ndarray,
+    ) -> None:
+        """Write one frame's curves and apex; segment ids are renumbered from 0 per frame."""
+        import pyvista as pv
+
+        _, local_ids = np.unique(np.asarray(segment_ids), return_inverse=True)
+        curves = frame_polydata(points, local_ids)
+        curves.field_data["frame_idx"] = np.array([frame], dtype=np.int32)
+        apex = pv.PolyData(np.asarray(apex_point, dtype=float).reshape(1, 3))
+        apex["time"] = np.array([apex_time], dtype=float)
+        apex["frame_idx"] = np.array([frame], dtype=np.int32)
+
+        for part, (name, dataset) in enumerate((("curves", curves), ("apex", apex))):
+            file_name = f"{name}_{int(frame):06d}.vtp"
+            dataset.save(self.frames_dir / file_name)
+            self._entries.append((float(apex_time), part, name, f"{self.frames_dir.name}/{file_name}"))
+        self._entries.extend((float(apex_time), part, name, file) for part, name, file in self._static)
+        self.n_frames += 1
+        self._pending_frames += 1
+        if self._pending_frames >= self.flush_frames:
+            self.flush()
+
+    def flush(self) -> None:
+        """Replace the ``.pvd`` collection with every frame written so far."""
+        rows = "\n".join(
+            f'    <DataSet timestep="{t!r}" group="" part="{part}" name="{name}" file="{file}"/>'
+            for t, part, name, file in self._entries
+        )
+        xml = (
+            '<?xml version="1.0"?>\n'
+            '<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">\n'
+            "  <Collection>\n"
+            f"{rows}\n"
+            "  </Collection>\n"
+            "</VTKFile>\n"
+        )
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(xml)
+        os.replace(tmp, self.path)
+        self._pending_frames = 0
+
+    def close(self) -> None:
+        """Write the final collection."""
+        self.flush()
+
+    def __enter__(self) -> "PvdSeriesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HistoryStoreReader:
+    """Read a history store frame by frame or chunk by chunk, without concatenating it.
+
+    Row ``i`` of ``index`` (``frame, chunk, start, stop``) is the ``i``-th saved frame.
+    Uncompressed chunks are memory-mapped when first used; a compressed chunk is
+    decompressed once and kept until another chunk is read.
+    """
+
+    def __init__(self, store_path: str | Path, mmap_mode: str | None = "r"):
+        self.path = Path(store_path)
+        self.mmap_mode = mmap_mode
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.index = np.load(self.path / "index.npy")
+        self.frames = self.index[:, 0].astype(np.int32)
+        self.apex_points = np.load(self.path / "apex_points.npy")
+        self.apex_times = np.load(self.path / "apex_times.npy")
+        self.arrays = {name: np.load(self.path / f"{name}.npy", mmap_mode=mmap_mode) for name in self.meta["arrays"]}
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.n_chunks = int(self.meta["n_chunks"])
+        self._chunk_id = -1
+        self._chunk: tuple[np.ndarray, np.ndarray] = (np.empty((0, 3), dtype=self.dtype), np.empty(0, dtype=np.int32))
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.index)
+
+    @property
+    def n_points(self) -> int:
+        return int(np.sum(self.index[:, 3] - self.index[:, 2]))
+
+    def chunk(self, chunk: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the points and segment ids of one chunk."""
+        if chunk != self._chunk_id:
+            stem = f"chunk_{chunk:05d}"
+            if self.meta["compress"]:
+                with np.load(self.path / f"{stem}.npz") as data:
+                    self._chunk = (data["points"], data["segments"])
+            else:
+                self._chunk = (
+                    np.load(self.path / f"{stem}_points.npy", mmap_mode=self.mmap_mode),
+                    np.load(self.path / f"{stem}_segments.npy", mmap_mode=self.mmap_mode),
+                )
+            self._chunk_id = chunk
+        return self._chunk
+
+    def frame(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the points and segment ids of the ``i``-th saved frame as chunk slices."""
+        _, chunk, start, stop = self.index[i]
+        points, segments = self.chunk(int(chunk))
+        return points[start:stop], segments[start:stop]
+
+    def iter_chunks(self):
+        """Yield ``(rows, points, segments)`` per chunk; ``rows`` index the frames stored in it."""
+        for chunk in range(self.n_chunks):
+            points, segments = self.chunk(chunk)
+            yield np.flatnonzero(self.index[:, 1] == chunk), points, segments
+
+    def history_meta(self) -> dict:
+        """The scalar and per-OM entries of a history ``.npz`` (everything but the frames)."""
+        history = dict(self.arrays)
+        for name in ("track_r0", "track_u"):
+            if name in self.meta:
+                history[name] = np.asarray(self.meta[name], dtype=float)
+        for name in ("theta_c_rad", "cylinder_radius", "z_min", "z_max"):
+            if name in self.meta:
+                history[name] = float(self.meta[name])
+        if "detector" in self.meta:
+            history["detector"] = self.meta["detector"]
+        return history
+
+
+def load_history_store(store_path: str | Path, mmap_mode: str | None = "r") -> dict:
+    """Read a history store into the flat arrays of a history ``.npz``.
+
+    A single-chunk store is returned as memory maps; several chunks are copied into
+    one array. Use ``HistoryStoreReader`` to walk a large store without the copy.
+    """
+    store = HistoryStoreReader(store_path, mmap_mode)
+    if store.n_chunks == 1:
+        points, segments = store.chunk(0)
+    else:
+        points = np.empty((store.n_points, 3), dtype=store.dtype)
+        segments = np.empty(store.n_points, dtype=np.int32)
+        offset = 0
+        for _, chunk_points, chunk_segments in store.iter_chunks():
+            points[offset : offset + len(chunk_points)] = chunk_points
+            segments[offset : offset + len(chunk_segments)] = chunk_segments
+            offset += len(chunk_points)
+
+    history = {
+        "apex_points": store.apex_points,
+        "apex_frames": store.frames,
+        "apex_times": store.apex_times,
+        "intersection_points": points,
+        "intersection_frames": np.repeat(store.frames, store.index[:, 3] - store.index[:, 2]),
+        "intersection_segments": segments,
+    }
+    history.update(store.history_meta())
+    return history
+
+
+def _write_npz_member(archive: zipfile.ZipFile, name: str, dtype: np.dtype, shape: tuple, blocks) -> None:
+    """Write ``name.npy`` into an open ``.npz`` archive from consecutive row blocks."""
+    dtype = np.dtype(dtype)
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as f:
+        np.lib.format.write_array_header_1_0(
+            f, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape}
+        )
+        for block in blocks:
+            f.write(np.ascontiguousarray(block, dtype=dtype).tobytes())
+
+
+def export_history_npz(store_path: str | Path, npz_path: str | Path) -> None:
+    """Export a history store to a single ``.npz`` bundle, one chunk in memory at a time.
+
+    The result has the same entries as ``save_history_npz`` writes.
+    """
+    store = HistoryStoreReader(store_path)
+    path = Path(npz_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = store.history_meta()
+    small = {
+        "apex_points": store.apex_points,
+        "apex_frames": store.frames,
+        "track_r0": meta["track_r0"],
+        "track_u": meta["track_u"],
+        "theta_c_rad": meta["theta_c_rad"],
+        "cylinder_radius": meta["cylinder_radius"],
+        "z_min": meta["z_min"],
+        "z_max": meta["z_max"],
+        "apex_times": store.apex_times,
+    }
+    for name in ("om_points", "om_arrival_times", "om_npe"):
+        if name in meta:
+            small[name] = np.asarray(meta[name], dtype=float)
+    if "detector" in meta:
+        small["detector_json"] = json.dumps(meta["detector"])
+
+    counts = store.index[:, 3] - store.index[:, 2]
+    n_points = store.n_points
+    with zipfile.ZipFile(path, "w", allowZip64=True) as archive:
+        for name, value in small.items():
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.asanyarray(value), allow_pickle=False)
+        _write_npz_member(
+            archive, "intersection_points", np.float64, (n_points, 3), (c[1] for c in store.iter_chunks())
+        )
+        _write_npz_member(
+            archive,
+            "intersection_frames",
+            store.frames.dtype,
+            (n_points,),
+            (np.repeat(store.frames[rows], counts[rows]) for rows, _, _ in store.iter_chunks()),
+        )
+        _write_npz_member(
+            archive, "intersection_segments", np.int32, (n_points,), (c[2] for c in store.iter_chunks())
+        )
+
+
+def export_history_vtm(store_path: str | Path, vtm_path: str | Path) -> None:
+    """Export a history store to a ``.vtm`` scene (one VTK dataset, so the store is read whole)."""
+    history = load_history_store(store_path)
+    save_history_vtm(
+        vtm_path=vtm_path,
+        apex_points=history["apex_points"],
+        apex_frames=history["apex_frames"],
+        intersection_points=np.asarray(history["intersection_points"], dtype=float),
+        intersection_frames=history["intersection_frames"],
+        intersection_segments=history["intersection_segments"],
+    )
+
+
+def export_history_pvd(store_path: str | Path, pvd_path: str | Path, flush_frames: int = 256) -> None:
+    """Export a history store to a ``.pvd`` time series, one chunk in memory at a time."""
+    store = HistoryStoreReader(store_path)
+    static = {}
+    if "om_points" in store.arrays:
+        static["oms"] = om_polydata(
+            store.arrays["om_points"], store.arrays.get("om_arrival_times"), store.arrays.get("om_npe")
+        )
+
+    with PvdSeriesWriter(pvd_path, flush_frames=flush_frames, static=static) as writer:
+        for rows, points, segments in store.iter_chunks():
+            for row in rows:
+                frame, _, start, stop = store.index[row]
+                writer.append_frame(
+                    frame, store.apex_points[row], store.apex_times[row], points[start:stop], segments[start:stop]
+                )
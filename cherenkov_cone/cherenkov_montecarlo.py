@@ -0,0 +1,268 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .cherenkov_config import load_cfg, resolve_max_proj
+    from .cherenkov_detectors import make_detector
+    from .cherenkov_geometry import load_om_positions
+    from .cherenkov_timing import SPEED_OF_LIGHT_M_PER_NS
+except ImportError:
+    from cherenkov_config import load_cfg, resolve_max_proj
+    from cherenkov_detectors import make_detector
+    from cherenkov_geometry import load_om_positions
+    from cherenkov_timing import SPEED_OF_LIGHT_M_PER_NS
+
+
+def sample_tracks(
+    n_tracks: int,
+    radius: float,
+    z_min: float,
+    z_max: float,
+    seed: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sample isotropic inward-going tracks entering through the cylinder side."""
+    rng = np.random.default_rng(seed)
+    phi = rng.uniform(0.0, 2.0 * np.pi, n_tracks)
+    z = rng.uniform(z_min, z_max, n_tracks)
+    r0 = np.column_stack([radius * np.cos(phi), radius * np.sin(phi), z])
+
+    u = rng.normal(size=(n_tracks, 3))
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    outward = u[:, 0] * np.cos(phi) + u[:, 1] * np.sin(phi) > 0.0
+    u[outward] *= -1.0
+    return r0, u
+
+
+def track_exit_lengths(r0: np.ndarray, u: np.ndarray, radius: float, z_min: float, z_max: float) -> np.ndarray:
+    """Return the path length from each entry point to where the track leaves the cylinder."""
+    a = u[:, 0] ** 2 + u[:, 1] ** 2
+    b = 2.0 * (r0[:, 0] * u[:, 0] + r0[:, 1] * u[:, 1])
+    c = r0[:, 0] ** 2 + r0[:, 1] ** 2 - radius**2
+    disc = np.sqrt(np.maximum(b * b - 4.0 * a * c, 0.0))
+    s_side = np.divide(-b + disc, 2.0 * a, out=np.full_like(a, np.inf), where=a > 1e-12)
+
+    s_cap = np.full(len(u), np.inf)
+    up = u[:, 2] > 1e-12
+    down = u[:, 2] < -1e-12
+    s_cap[up] = (z_max - r0[up, 2]) / u[up, 2]
+    s_cap[down] = (z_min - r0[down, 2]) / u[down, 2]
+    return np.maximum(np.minimum(s_side, s_cap), 0.0)
+
+
+def track_om_hits(
+    r0: np.ndarray,
+    u: np.ndarray,
+    s_max: np.ndarray,
+    om_points: np.ndarray,
+    theta_c_rad: float,
+    beta: float,
+    nappe: str = "trailing",
+    max_proj: float | None = None,
+    apex_inside: tuple[float, float, float] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(hit, first_hit_time)`` for every track/OM pair.
+
+    An OM at perpendicular distance ``rho`` from the track lies on the cone when the
+    apex is at ``s* = (P - r0) . u -/+ rho / tan(theta_c)`` (trailing/leading nappe).
+    The OM is hit when ``0 <= s* <= s_max`` and the axial distance ``rho / tan(theta_c)``
+    is within ``max_proj``. Times are apex times ``s* / (beta c)`` in ns for metres.
+    """
+    d = om_points[None, :, :] - r0[:, None, :]
+    proj = np.einsum("tnk,tk->tn", d, u)
+    rho = np.sqrt(np.maximum(np.einsum("tnk,tnk->tn", d, d) - proj**2, 0.0))
+    axial = rho / np.tan(theta_c_rad)
+
+    if nappe == "trailing":
+        candidates = [proj + axial]
+    elif nappe == "leading":
+        candidates = [proj - axial]
+    elif nappe == "both":
+        candidates = [proj - axial, proj + axial]
+    else:
+        raise ValueError("intersection.nappe must be 'trailing', 'leading', or 'both'")
+
+    s_hit = np.full(proj.shape, np.inf)
+    for s_star in candidates:
+        ok = (s_star >= 0.0) & (s_star <= s_max[:, None])
+        if max_proj is not None and max_proj > 0.0:
+            ok &= axial <= max_proj
+        if apex_inside is not None:
+            radius, z_min, z_max = apex_inside
+            apex = r0[:, None, :] + s_star[:, :, None] * u[:, None, :]
+            ok &= (apex[..., 0] ** 2 + apex[..., 1] ** 2 <= radius**2) & (apex[..., 2] >= z_min) & (apex[..., 2] <= z_max)
+        s_hit = np.where(ok & (s_star < s_hit), s_star, s_hit)
+
+    hit = np.isfinite(s_hit)
+    first_hit_time = np.where(hit, s_hit / (beta * SPEED_OF_LIGHT_M_PER_NS), np.nan)
+    return hit, first_hit_time
+
+
+def _mc_chunk(task: dict) -> tuple[int, int]:
+    """Evaluate one block of tracks and write it into the output memmaps."""
+    out_dir = Path(task["out_dir"])
+    i0, i1 = task["i0"], task["i1"]
+    r0 = np.load(out_dir / "track_r0.npy", mmap_mode="r")[i0:i1]
+    u = np.load(out_dir / "track_u.npy", mmap_mode="r")[i0:i1]
+    s_max = np.load(out_dir / "track_length.npy", mmap_mode="r")[i0:i1]
+    om_points = np.load(out_dir / "om_points.npy")
+
+    hit, first_hit_time = track_om_hits(
+        np.asarray(r0),
+        np.asarray(u),
+        np.asarray(s_max),
+        om_points,
+        theta_c_rad=task["theta_c_rad"],
+        beta=task["beta"],
+        nappe=task["nappe"],
+        max_proj=task["max_proj"],
+        apex_inside=task["apex_inside"],
+    )
+
+    hits_out = np.load(out_dir / "hits.npy", mmap_mode="r+")
+    hits_out[i0:i1] = np.packbits(hit, axis=1)
+    hits_out.flush()
+    times_out = np.load(out_dir / "first_hit_time.npy", mmap_mode="r+")
+    times_out[i0:i1] = first_hit_time.astype(np.float32)
+    times_out.flush()
+    n_hit_out = np.load(out_dir / "n_hit_oms.npy", mmap_mode="r+")
+    n_hit_out[i0:i1] = hit.sum(axis=1)
+    n_hit_out.flush()
+    return i0, i1
+
+
+def run_montecarlo(
+    cfg_path: str | Path | None = None,
+    n_tracks: int | None = None,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    seed: int | None = None,
+    show_progress: bool | None = None,
+) -> Path:
+    """Generate OM hit patterns for many random tracks without any rendering.
+
+    Tracks enter through the cylinder side, so only ``detector.kind = cylinder`` is
+    supported. Output is a directory of ``.npy`` files that open with ``mmap_mode``:
+    ``hits.npy`` (packed bits, ``(n_tracks, ceil(n_oms / 8))``), ``first_hit_time.npy``
+    (``float32`` ns, NaN for no hit), ``n_hit_oms.npy``, the sampled tracks, the OM
+    positions and ``meta.json``.
+    """
+    cfg = load_cfg(cfg_path)
+    run_cfg = cfg["run"]
+    detector_cfg = cfg["detector"]
+    optics_cfg = cfg["optics"]
+    intersection_cfg = cfg["intersection"]
+    mc_cfg = cfg["montecarlo"]
+
+    n_tracks = int(mc_cfg["n_tracks"] if n_tracks is None else n_tracks)
+    out_dir = Path(mc_cfg["output_dir"] if output_dir is None else output_dir)
+    workers = int(mc_cfg["workers"] if workers is None else workers)
+    seed = mc_cfg["seed"] if seed is None else seed
+    show_progress = run_cfg["show_progress"] if show_progress is None else show_progress
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    n_refr = optics_cfg["n_refr"]
+    beta = optics_cfg["beta"]
+    if beta * n_refr <= 1.0:
+        raise ValueError("Cherenkov angle is undefined: beta * n_refr must be > 1.")
+    theta_c = float(np.arccos(1.0 / (beta * n_refr)))
+
+    detector = make_detector(detector_cfg)
+    if detector.kind != "cylinder":
+        raise ValueError(f"track Monte Carlo needs detector.kind = cylinder, got {detector.kind!r}")
+    radius, z_min, z_max = detector.radius, detector.z_min, detector.z_max
+    if detector_cfg["om_positions_path"]:
+        om_points = load_om_positions(detector_cfg["om_positions_path"])
+    else:
+        om_points = detector.make_oms(detector_cfg["n_strings"], detector_cfg["oms_per_string"])
+    n_oms = len(om_points)
+
+    t0 = time.perf_counter()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    r0, u = sample_tracks(n_tracks, radius, z_min, z_max, seed=seed)
+    np.save(out_dir / "track_r0.npy", r0)
+    np.save(out_dir / "track_u.npy", u)
+    np.save(out_dir / "track_length.npy", track_exit_lengths(r0, u, radius, z_min, z_max))
+    np.save(out_dir / "om_points.npy", om_points)
+    np.lib.format.open_memmap(out_dir / "hits.npy", mode="w+", dtype=np.uint8, shape=(n_tracks, (n_oms + 7) // 8))
+    times = np.lib.format.open_memmap(out_dir / "first_hit_time.npy", mode="w+", dtype=np.float32, shape=(n_tracks, n_oms))
+    times[:] = np.nan
+    times.flush()
+    del times
+    np.lib.format.open_memmap(out_dir / "n_hit_oms.npy", mode="w+", dtype=np.int32, shape=(n_tracks,))
+
+    # Chunks bound the (tracks, OMs, 3) temporaries to a few tens of MB.
+    chunk_tracks = max(1, min(int(mc_cfg["chunk_tracks"]), (1 << 21) // max(1, n_oms)))
+    apex_inside = (radius, z_min, z_max) if intersection_cfg["apex_inside_only"] else None
+    tasks = [
+        {
+            "out_dir": str(out_dir),
+            "i0": i0,
+            "i1": min(n_tracks, i0 + chunk_tracks),
+            "theta_c_rad": theta_c,
+            "beta": beta,
+            "nappe": intersection_cfg["nappe"],
+            "max_proj": resolve_max_proj(intersection_cfg, cfg["visual"]["cone_height"]),
+            "apex_inside": apex_inside,
+        }
+        for i0 in range(0, n_tracks, chunk_tracks)
+    ]
+
+    progress_every = max(1, len(tasks) // 10)
+    if workers == 1:
+        results = map(_mc_chunk, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_mc_chunk, tasks)
+    try:
+        for done, (_, i1) in enumerate(results, start=1):
+            if show_progress and (done == 1 or done % progress_every == 0 or done == len(tasks)):
+                print(f"[mc] tracks {i1}/{n_tracks}", flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - t0
+    meta = {
+        "n_tracks": n_tracks,
+        "n_oms": n_oms,
+        "seed": seed,
+        "theta_c_rad": theta_c,
+        "beta": beta,
+        "n_refr": n_refr,
+        "cylinder_radius": radius,
+        "z_min": z_min,
+        "z_max": z_max,
+        "nappe": intersection_cfg["nappe"],
+        "elapsed_s": elapsed,
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    if show_progress:
+        print(f"[mc] wrote {out_dir} ({n_tracks} tracks, {n_oms} OMs, {elapsed:.2f}s, workers={workers})", flush=True)
+    return out_dir
+
+
+def load_montecarlo(output_dir: str | Path) -> dict:
+    """Open a Monte Carlo output directory with memory-mapped arrays."""
+    out_dir = Path(output_dir)
+    result = {
+        name: np.load(out_dir / f"{name}.npy", mmap_mode="r")
+        for name in ("hits", "first_hit_time", "n_hit_oms", "track_r0", "track_u", "track_length", "om_points")
+    }
+    result["meta"] = json.loads((out_dir / "meta.json").read_text())
+    return result
+
+
+def unpack_hits(packed_hits: np.ndarray, n_oms: int) -> np.ndarray:
+    """Expand packed activation bitmaps to a boolean ``(n_tracks, n_oms)`` array."""
+    return np.unpackbits(np.asarray(packed_hits), axis=1, count=n_oms).astype(bool)
+
+
+if __name__ == "__main__":
+    run_montecarlo()
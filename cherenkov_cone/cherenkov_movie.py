@@ -0,0 +1,141 @@
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def open_movie_writer(movie_path: str | Path, run_cfg: dict):
+    """Open an ``imageio`` movie writer from the ``[run]`` config."""
+    import imageio.v2 as iio
+
+    writer_kwargs = {
+        "fps": run_cfg["movie_fps"],
+        "codec": run_cfg["movie_codec"],
+        "is_batch": run_cfg["movie_is_batch"],
+    }
+    if run_cfg["movie_format"]:
+        writer_kwargs["format"] = run_cfg["movie_format"]
+    return iio.get_writer(str(movie_path), **writer_kwargs)
+
+
+class ThreadedMovieWriter:
+    """Encode frames on a background thread fed by a bounded queue.
+
+    ``append_data`` blocks once ``max_queue`` frames are pending, so a slow encoder
+    throttles rendering instead of buffering the whole movie in memory. With
+    ``max_queue = 0`` frames are encoded synchronously in the caller's thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, writer, max_queue: int = 8):
+        self.writer = writer
+        self.threaded = max_queue > 0
+        self.encode_time = 0.0
+        self.wait_time = 0.0
+        self.n_frames = 0
+        self._error: BaseException | None = None
+        if self.threaded:
+            self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+            self._thread = threading.Thread(target=self._run, name="movie-encoder", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Consume frames until the stop marker arrives."""
+        while True:
+            frame = self._queue.get()
+            if frame is self._STOP:
+                return
+            if self._error is not None:
+                continue
+            try:
+                t0 = time.perf_counter()
+                self.writer.append_data(frame)
+                self.encode_time += time.perf_counter() - t0
+            except BaseException as exc:  # surfaced again from append_data/close
+                self._error = exc
+
+    def append_data(self, frame: np.ndarray) -> None:
+        """Queue one RGB frame for encoding."""
+        if self._error is not None:
+            raise RuntimeError("movie encoder failed") from self._error
+        self.n_frames += 1
+        if not self.threaded:
+            t0 = time.perf_counter()
+            self.writer.append_data(frame)
+            self.encode_time += time.perf_counter() - t0
+            return
+        t0 = time.perf_counter()
+        self._queue.put(np.asarray(frame))
+        self.wait_time += time.perf_counter() - t0
+
+    def close(self) -> None:
+        """Flush pending frames, stop the thread and close the writer."""
+        try:
+            if self.threaded:
+                t0 = time.perf_counter()
+                self._queue.put(self._STOP)
+                self._thread.join()
+                self.wait_time += time.perf_counter() - t0
+        finally:
+            self.writer.close()
+        if self._error is not None:
+            raise RuntimeError("movie encoder failed") from self._error
+
+
+def concat_movie_segments(segment_paths: list[str | Path], movie_path: str | Path, run_cfg: dict) -> None:
+    """Join movie segments in order into one file.
+
+    Packets are remuxed with PyAV without re-encoding; timestamps of each segment
+    are shifted to follow the previous one. Without PyAV the frames are decoded
+    and re-encoded through ``imageio``.
+    """
+    segment_paths = [Path(p) for p in segment_paths]
+    movie_path = Path(movie_path)
+    movie_path.parent.mkdir(parents=True, exist_ok=True)
+    if len(segment_paths) == 1:
+        shutil.copyfile(segment_paths[0], movie_path)
+        return
+
+    try:
+        import av
+    except ImportError:
+        av = None
+
+    if av is None:
+        import imageio.v2 as iio
+
+        writer = open_movie_writer(movie_path, run_cfg)
+        try:
+            for segment_path in segment_paths:
+                reader = iio.get_reader(str(segment_path))
+                try:
+                    for frame in reader:
+                        writer.append_data(frame)
+                finally:
+                    reader.close()
+        finally:
+            writer.close()
+        return
+
+    with av.open(str(movie_path), "w") as out:
+        out_stream = None
+        offset = 0
+        for segment_path in segment_paths:
+            with av.open(str(segment_path)) as inp:
+                in_stream = inp.streams.video[0]
+                if out_stream is None:
+                    out_stream = out.add_stream_from_template(in_stream)
+                segment_end = offset
+                for packet in inp.demux(in_stream):
+                    if packet.dts is None:
+                        continue
+                    packet.pts += offset
+                    packet.dts += offset
+                    packet.stream = out_stream
+                    segment_end = max(segment_end, packet.pts + packet.duration)
+                    out.mux(packet)
+                offset = segment_end
@@ -0,0 +1,536 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .cherenkov_config import load_cfg
+    from .cherenkov_detectors import make_detector
+    from .cherenkov_geometry import load_om_positions, normalize, perpendicular_basis
+    from .cherenkov_response import frank_tamm_yield
+    from .cherenkov_timing import SPEED_OF_LIGHT_M_PER_NS
+except ImportError:
+    from cherenkov_config import load_cfg
+    from cherenkov_detectors import make_detector
+    from cherenkov_geometry import load_om_positions, normalize, perpendicular_basis
+    from cherenkov_response import frank_tamm_yield
+    from cherenkov_timing import SPEED_OF_LIGHT_M_PER_NS
+
+
+def emit_photons(
+    rng: np.random.Generator,
+    n: int,
+    r0: np.ndarray,
+    u: np.ndarray,
+    s_range: tuple[float, float],
+    theta_c_rad: float,
+    beta: float = 1.0,
+    t0: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Emit ``n`` photons uniformly along the track at the Cherenkov angle.
+
+    Returns ``(positions, directions, times)``; the time is when the muon passes the
+    emission point.
+    """
+    u = normalize(np.asarray(u, dtype=float))
+    e1, e2 = perpendicular_basis(u)
+    s = rng.uniform(s_range[0], s_range[1], n)
+    phi = rng.uniform(0.0, 2.0 * np.pi, n)
+    pos = np.asarray(r0, dtype=float)[None, :] + s[:, None] * u[None, :]
+    dirs = (
+        np.cos(theta_c_rad) * u[None, :]
+        + np.sin(theta_c_rad) * (np.cos(phi)[:, None] * e1[None, :] + np.sin(phi)[:, None] * e2[None, :])
+    )
+    times = t0 + s / (beta * SPEED_OF_LIGHT_M_PER_NS)
+    return pos, dirs, times
+
+
+def henyey_greenstein_cos(rng: np.random.Generator, g: float, n: int) -> np.ndarray:
+    """Sample ``n`` scattering-angle cosines from the Henyey–Greenstein phase function."""
+    xi = rng.random(n)
+    if abs(g) < 1e-6:
+        return 2.0 * xi - 1.0
+    frac = (1.0 - g * g) / (1.0 - g + 2.0 * g * xi)
+    return np.clip((1.0 + g * g - frac * frac) / (2.0 * g), -1.0, 1.0)
+
+
+def scatter_directions(rng: np.random.Generator, dirs: np.ndarray, g: float) -> np.ndarray:
+    """Rotate unit directions by Henyey–Greenstein polar angles and uniform azimuths."""
+    n = len(dirs)
+    cos_t = henyey_greenstein_cos(rng, g, n)
+    sin_t = np.sqrt(np.maximum(1.0 - cos_t * cos_t, 0.0))
+    phi = rng.uniform(0.0, 2.0 * np.pi, n)
+
+    ref = np.zeros_like(dirs)
+    near_z = np.abs(dirs[:, 2]) >= 0.9
+    ref[~near_z, 2] = 1.0
+    ref[near_z, 0] = 1.0
+    a = np.cross(ref, dirs)
+    a /= np.linalg.norm(a, axis=1)[:, None]
+    b = np.cross(dirs, a)
+    out = cos_t[:, None] * dirs + sin_t[:, None] * (np.cos(phi)[:, None] * a + np.sin(phi)[:, None] * b)
+    return out / np.linalg.norm(out, axis=1)[:, None]
+
+
+def first_sphere_hits(
+    pos: np.ndarray,
+    dirs: np.ndarray,
+    step: np.ndarray,
+    centers: np.ndarray,
+    radius: float,
+    max_pairs: int = 1 << 21,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(om_index, distance)`` of the first OM sphere hit within each step, or ``(-1, inf)``.
+
+    Only OMs closer than ``step + radius`` can be hit, so the squared distances are
+    computed in tiles of at most ``max_pairs`` photon-OM pairs (per component, no
+    ``(photons, OMs, 3)`` temporary) and the ray-sphere test runs on those pairs only.
+    Tiles split the OM axis too, so memory stays bounded for any number of OMs.
+    """
+    n = len(pos)
+    hit_idx = np.full(n, -1, dtype=np.int64)
+    hit_dist = np.full(n, np.inf)
+    if n == 0 or len(centers) == 0:
+        return hit_idx, hit_dist
+
+    r2 = radius * radius
+    max_pairs = max(1, int(max_pairs))
+    om_block = min(len(centers), max_pairs)
+    block = max(1, max_pairs // om_block)
+    w2 = np.empty((min(block, n), om_block))
+    tmp = np.empty_like(w2)
+    for i0 in range(0, n, block):
+        p = pos[i0 : i0 + block]
+        m = len(p)
+        reach = step[i0 : i0 + block] + radius
+        for j0 in range(0, len(centers), om_block):
+            c = centers[j0 : j0 + om_block]
+            k_oms = len(c)
+            d2 = w2[:m, :k_oms]
+            t2 = tmp[:m, :k_oms]
+            np.subtract(c[None, :, 0], p[:, 0:1], out=d2)
+            np.multiply(d2, d2, out=d2)
+            for k in (1, 2):
+                np.subtract(c[None, :, k], p[:, k : k + 1], out=t2)
+                np.multiply(t2, t2, out=t2)
+                d2 += t2
+            pi, oi = np.nonzero(d2 <= (reach * reach)[:, None])
+            if len(pi) == 0:
+                continue
+
+            w = c[oi] - p[pi]
+            tca = np.einsum("ij,ij->i", w, dirs[i0 + pi])
+            disc = r2 - (d2[pi, oi] - tca * tca)
+            t_hit = tca - np.sqrt(np.maximum(disc, 0.0))
+            ok = (disc >= 0.0) & (t_hit >= 0.0) & (t_hit <= step[i0 + pi])
+            pi, oi, t_hit = pi[ok], oi[ok], t_hit[ok]
+            order = np.lexsort((t_hit, pi))
+            first = order[np.unique(pi[order], return_index=True)[1]]
+            # Earlier tiles win ties, as with a single pass over all OMs.
+            gi = i0 + pi[first]
+            closer = t_hit[first] < hit_dist[gi]
+            hit_idx[gi[closer]] = j0 + oi[first][closer]
+            hit_dist[gi[closer]] = t_hit[first][closer]
+    return hit_idx, hit_dist
+
+
+def first_cylinder_crossings(
+    pos: np.ndarray,
+    dirs: np.ndarray,
+    step: np.ndarray,
+    radius: float,
+    z_min: float,
+    z_max: float,
+) -> np.ndarray:
+    """Return the distance to the first crossing of the cylinder side within each step, or inf."""
+    a = dirs[:, 0] ** 2 + dirs[:, 1] ** 2
+    b = 2.0 * (pos[:, 0] * dirs[:, 0] + pos[:, 1] * dirs[:, 1])
+    c = pos[:, 0] ** 2 + pos[:, 1] ** 2 - radius**2
+    disc = b * b - 4.0 * a * c
+    sq = np.sqrt(np.maximum(disc, 0.0))
+    safe_a = np.where(a > 1e-12, a, 1.0)
+    out = np.full(len(pos), np.inf)
+    for t in ((-b - sq) / (2.0 * safe_a), (-b + sq) / (2.0 * safe_a)):
+        z = pos[:, 2] + t * dirs[:, 2]
+        ok = (a > 1e-12) & (disc >= 0.0) & (t > 1e-9) & (t <= step) & (z >= z_min) & (z <= z_max)
+        out = np.where(ok & (t < out), t, out)
+    return out
+
+
+def propagate_photons(
+    rng: np.random.Generator,
+    pos: np.ndarray,
+    dirs: np.ndarray,
+    times: np.ndarray,
+    om_points: np.ndarray,
+    om_radius: float,
+    absorption_length: float,
+    scattering_length: float,
+    g: float,
+    n_group: float,
+    cylinder: tuple[float, float, float],
+    max_scatters: int = 20,
+    max_distance: float = 300.0,
+) -> dict:
+    """Propagate photons step by step until they hit an OM, are absorbed or escape.
+
+    Each photon draws its absorption path from ``Exp(absorption_length)`` and its step
+    lengths from ``Exp(scattering_length)``; after each step it scatters with a
+    Henyey–Greenstein angle of mean cosine ``g``. All live photons advance together.
+    Photons farther than ``max_distance`` from the cylinder centre are dropped.
+
+    Returns OM hits (``om``, ``time``, ``scatters``) and the first crossing of the
+    cylinder side (``cross_points``, ``cross_time``, ``cross_scatters``). Times add
+    the photon path at the group velocity ``c / n_group``.
+    """
+    radius, z_min, z_max = cylinder
+    center = np.array([0.0, 0.0, 0.5 * (z_min + z_max)])
+    ns_per_m = n_group / SPEED_OF_LIGHT_M_PER_NS
+
+    pos = np.array(pos, dtype=float)
+    dirs = np.array(dirs, dtype=float)
+    times = np.array(times, dtype=float)
+    budget = rng.exponential(absorption_length, len(pos))
+    scatters = np.zeros(len(pos), dtype=np.int16)
+    crossed = np.zeros(len(pos), dtype=bool)
+
+    hit_om, hit_time, hit_scatters = [], [], []
+    cross_points, cross_time, cross_scatters = [], [], []
+
+    for n_scat in range(max_scatters + 1):
+        if len(pos) == 0:
+            break
+        step = np.minimum(rng.exponential(scattering_length, len(pos)), budget)
+        om_idx, om_dist = first_sphere_hits(pos, dirs, step, om_points, om_radius)
+        on_om = om_idx >= 0
+        step = np.where(on_om, om_dist, step)
+
+        cross_dist = first_cylinder_crossings(pos, dirs, step, radius, z_min, z_max)
+        new_cross = ~crossed & np.isfinite(cross_dist)
+        if np.any(new_cross):
+            cd = cross_dist[new_cross]
+            cross_points.append(pos[new_cross] + cd[:, None] * dirs[new_cross])
+            cross_time.append(times[new_cross] + cd * ns_per_m)
+            cross_scatters.append(scatters[new_cross])
+            crossed |= new_cross
+
+        if np.any(on_om):
+            hit_om.append(om_idx[on_om])
+            hit_time.append(times[on_om] + om_dist[on_om] * ns_per_m)
+            hit_scatters.append(scatters[on_om])
+
+        pos = pos + step[:, None] * dirs
+        times = times + step * ns_per_m
+        budget = budget - step
+        alive = ~on_om & (budget > 1e-9) & (np.linalg.norm(pos - center[None, :], axis=1) <= max_distance)
+        if n_scat == max_scatters:
+            break
+
+        pos, dirs, times, budget, scatters, crossed = (
+            pos[alive], dirs[alive], times[alive], budget[alive], scatters[alive] + 1, crossed[alive]
+        )
+        if len(dirs):
+            dirs = scatter_directions(rng, dirs, g)
+
+    def cat(chunks: list, dtype, shape=(0,)) -> np.ndarray:
+        return np.concatenate(chunks).astype(dtype) if chunks else np.empty(shape, dtype=dtype)
+
+    return {
+        "om": cat(hit_om, np.int32),
+        "time": cat(hit_time, np.float64),
+        "scatters": cat(hit_scatters, np.int16),
+        "cross_points": cat(cross_points, np.float64, (0, 3)),
+        "cross_time": cat(cross_time, np.float64),
+        "cross_scatters": cat(cross_scatters, np.int16),
+    }
+
+
+def _chunk_file(chunk_dir: Path, index: int, name: str) -> Path:
+    return chunk_dir / f"chunk_{index:05d}_{name}.npy"
+
+
+def _photon_chunk(task: dict) -> dict:
+    """Emit and propagate one block of photons and write its result to ``chunk_dir``.
+
+    Hits are stored sorted by OM and time with per-OM counts, so the parent can
+    place them into the final arrays without holding more than one chunk.
+    Returns the chunk's per-OM hit counts and crossing count.
+    """
+    rng = np.random.default_rng(task["seed"])
+    pos, dirs, times = emit_photons(
+        rng,
+        task["n"],
+        task["r0"],
+        task["u"],
+        task["s_range"],
+        task["theta_c_rad"],
+        beta=task["beta"],
+        t0=task["t0"],
+    )
+    result = propagate_photons(
+        rng,
+        pos,
+        dirs,
+        times,
+        task["om_points"],
+        task["om_radius"],
+        task["absorption_length"],
+        task["scattering_length"],
+        task["g"],
+        task["n_group"],
+        task["cylinder"],
+        max_scatters=task["max_scatters"],
+        max_distance=task["max_distance"],
+    )
+
+    chunk_dir = Path(task["chunk_dir"])
+    order = np.lexsort((result["time"], result["om"]))
+    om_counts = np.bincount(result["om"], minlength=len(task["om_points"])).astype(np.int64)
+    arrays = {
+        "om_counts": om_counts,
+        "hit_time": result["time"][order],
+        "hit_scatters": result["scatters"][order],
+        "cross_points": result["cross_points"].astype(np.float32),
+        "cross_time": result["cross_time"].astype(np.float32),
+        "cross_scatters": result["cross_scatters"],
+    }
+    for name, value in arrays.items():
+        np.save(_chunk_file(chunk_dir, task["index"], name), value)
+    return {"om_counts": om_counts, "n_cross": len(result["cross_time"])}
+
+
+def _merge_photon_chunks(
+    chunk_dir: Path,
+    out_dir: Path,
+    n_chunks: int,
+    om_offsets: np.ndarray,
+    n_cross: int,
+    block_hits: int,
+) -> None:
+    """Write the final OM-sorted hit arrays and crossings from the chunk files.
+
+    Hits are first scattered chunk by chunk into their OM's range (chunk order),
+    then each range is sorted by time, ``block_hits`` hits at a time.
+    """
+    n_hits = int(om_offsets[-1])
+    time64 = np.lib.format.open_memmap(chunk_dir / "hit_time_f64.npy", mode="w+", dtype=np.float64, shape=(n_hits,))
+    scat = np.lib.format.open_memmap(out_dir / "hit_scatters.npy", mode="w+", dtype=np.int16, shape=(n_hits,))
+    cross_points = np.lib.format.open_memmap(
+        out_dir / "cross_points.npy", mode="w+", dtype=np.float32, shape=(n_cross, 3)
+    )
+    cross_time = np.lib.format.open_memmap(out_dir / "cross_time.npy", mode="w+", dtype=np.float32, shape=(n_cross,))
+    cross_scat = np.lib.format.open_memmap(out_dir / "cross_scatters.npy", mode="w+", dtype=np.int16, shape=(n_cross,))
+
+    fill = om_offsets[:-1].copy()
+    c0 = 0
+    for index in range(n_chunks):
+        counts = np.load(_chunk_file(chunk_dir, index, "om_counts"))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        dest = np.repeat(fill - starts, counts) + np.arange(int(counts.sum()))
+        time64[dest] = np.load(_chunk_file(chunk_dir, index, "hit_time"))
+        scat[dest] = np.load(_chunk_file(chunk_dir, index, "hit_scatters"))
+        fill += counts
+
+        c_time = np.load(_chunk_file(chunk_dir, index, "cross_time"))
+        c1 = c0 + len(c_time)
+        cross_time[c0:c1] = c_time
+        cross_points[c0:c1] = np.load(_chunk_file(chunk_dir, index, "cross_points"))
+        cross_scat[c0:c1] = np.load(_chunk_file(chunk_dir, index, "cross_scatters"))
+        c0 = c1
+        for name in ("om_counts", "hit_time", "hit_scatters", "cross_points", "cross_time", "cross_scatters"):
+            _chunk_file(chunk_dir, index, name).unlink()
+
+    hit_time = np.lib.format.open_memmap(out_dir / "hit_time.npy", mode="w+", dtype=np.float32, shape=(n_hits,))
+    n_oms = len(om_offsets) - 1
+    a = 0
+    while a < n_oms:
+        # OMs [a, b) whose hits fit in one block (at least one OM).
+        b = max(a + 1, int(np.searchsorted(om_offsets, om_offsets[a] + block_hits, side="right")) - 1)
+        b = min(b, n_oms)
+        h0, h1 = int(om_offsets[a]), int(om_offsets[b])
+        if h1 > h0:
+            t = np.asarray(time64[h0:h1])
+            om_ids = np.repeat(np.arange(b - a), np.diff(om_offsets[a : b + 1]))
+            order = np.lexsort((t, om_ids))
+            hit_time[h0:h1] = t[order]
+            scat[h0:h1] = np.asarray(scat[h0:h1])[order]
+        a = b
+
+    for mm in (hit_time, scat, cross_points, cross_time, cross_scat):
+        mm.flush()
+    del time64
+
+
+def run_photon_montecarlo(
+    cfg_path: str | Path | None = None,
+    n_photons: int | None = None,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    seed: int | None = None,
+    show_progress: bool | None = None,
+) -> Path:
+    """Propagate Cherenkov photons from the configured track and record OM hits.
+
+    Only ``detector.kind = cylinder`` is supported: crossings are recorded on the
+    cylinder side. Photons are split into blocks of ``chunk_photons`` with independent seeds and run
+    in a process pool. Every block writes its hits to ``chunks/`` in the output
+    directory and the parent merges them on disk, so memory does not grow with
+    ``n_photons``. Each simulated photon stands for ``weight`` real photons
+    (Frank–Tamm yield times track length over ``n_photons``).
+
+    Output directory: ``om_offsets.npy`` plus ``hit_time.npy``/``hit_scatters.npy``
+    sorted by OM and time (hits of OM ``i`` are ``[om_offsets[i], om_offsets[i + 1])``),
+    ``cross_points.npy``/``cross_time.npy``/``cross_scatters.npy`` for the first
+    crossing of the cylinder side, ``om_points.npy`` and ``meta.json``.
+    """
+    cfg = load_cfg(cfg_path)
+    run_cfg = cfg["run"]
+    detector_cfg = cfg["detector"]
+    optics_cfg = cfg["optics"]
+    track_cfg = cfg["track"]
+    response_cfg = cfg["response"]
+    photon_cfg = cfg["photons"]
+
+    n_photons = int(photon_cfg["n_photons"] if n_photons is None else n_photons)
+    out_dir = Path(photon_cfg["output_dir"] if output_dir is None else output_dir)
+    workers = int(photon_cfg["workers"] if workers is None else workers)
+    seed = photon_cfg["seed"] if seed is None else seed
+    show_progress = run_cfg["show_progress"] if show_progress is None else show_progress
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    n_refr = optics_cfg["n_refr"]
+    beta = optics_cfg["beta"]
+    if beta * n_refr <= 1.0:
+        raise ValueError("Cherenkov angle is undefined: beta * n_refr must be > 1.")
+    theta_c = float(np.arccos(1.0 / (beta * n_refr)))
+
+    detector = make_detector(detector_cfg)
+    if detector.kind != "cylinder":
+        raise ValueError(f"photon Monte Carlo needs detector.kind = cylinder, got {detector.kind!r}")
+    radius, z_min, z_max = detector.radius, detector.z_min, detector.z_max
+    if detector_cfg["om_positions_path"]:
+        om_points = load_om_positions(detector_cfg["om_positions_path"])
+    else:
+        om_points = detector.make_oms(detector_cfg["n_strings"], detector_cfg["oms_per_string"])
+
+    s_range = (track_cfg["s_start"], track_cfg["s_end"])
+    photons_per_m = frank_tamm_yield(
+        n_refr,
+        beta,
+        wavelength_min_nm=response_cfg["wavelength_min_nm"],
+        wavelength_max_nm=response_cfg["wavelength_max_nm"],
+    )
+    weight = photons_per_m * (s_range[1] - s_range[0]) / max(1, n_photons)
+
+    chunk = max(1, int(photon_cfg["chunk_photons"]))
+    seeds = np.random.SeedSequence(seed).spawn((n_photons + chunk - 1) // chunk)
+    common = {
+        "r0": np.asarray(track_cfg["r0"], dtype=float),
+        "u": normalize(np.asarray(track_cfg["u"], dtype=float)),
+        "s_range": s_range,
+        "theta_c_rad": theta_c,
+        "beta": beta,
+        "t0": track_cfg["t0"],
+        "om_points": om_points,
+        "om_radius": photon_cfg["om_radius"],
+        "absorption_length": response_cfg["absorption_length"],
+        "scattering_length": photon_cfg["scattering_length"],
+        "g": photon_cfg["hg_g"],
+        "n_group": optics_cfg["n_group"],
+        "cylinder": (radius, z_min, z_max),
+        "max_scatters": photon_cfg["max_scatters"],
+        "max_distance": photon_cfg["max_distance"],
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    chunk_dir = out_dir / "chunks"
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    chunk_dir.mkdir()
+    tasks = [
+        dict(common, n=min(chunk, n_photons - i * chunk), seed=seeds[i], index=i, chunk_dir=str(chunk_dir))
+        for i in range(len(seeds))
+    ]
+
+    t_start = time.perf_counter()
+    progress_every = max(1, len(tasks) // 10)
+    if workers == 1:
+        results = map(_photon_chunk, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_photon_chunk, tasks)
+    om_counts = np.zeros(len(om_points), dtype=np.int64)
+    n_cross = 0
+    try:
+        for done, part in enumerate(results, start=1):
+            om_counts += part["om_counts"]
+            n_cross += part["n_cross"]
+            if show_progress and (done == 1 or done % progress_every == 0 or done == len(tasks)):
+                print(f"[photons] chunks {done}/{len(tasks)}", flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    om_offsets = np.concatenate([[0], np.cumsum(om_counts)]).astype(np.int64)
+    np.save(out_dir / "om_points.npy", om_points)
+    np.save(out_dir / "om_offsets.npy", om_offsets)
+    _merge_photon_chunks(chunk_dir, out_dir, len(tasks), om_offsets, n_cross, block_hits=max(chunk, 1 << 20))
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    n_hits = int(om_offsets[-1])
+
+    elapsed = time.perf_counter() - t_start
+    meta = {
+        "n_photons": n_photons,
+        "n_oms": len(om_points),
+        "n_hits": n_hits,
+        "seed": seed,
+        "photons_per_m": photons_per_m,
+        "weight": weight,
+        "quantum_efficiency": response_cfg["quantum_efficiency"],
+        "theta_c_rad": theta_c,
+        "cylinder_radius": radius,
+        "z_min": z_min,
+        "z_max": z_max,
+        "elapsed_s": elapsed,
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    if show_progress:
+        print(
+            f"[photons] wrote {out_dir} ({n_photons} photons, {n_hits} OM hits, "
+            f"{elapsed:.2f}s, workers={workers})",
+            flush=True,
+        )
+    return out_dir
+
+
+def load_photons(output_dir: str | Path) -> dict:
+    """Open a photon Monte Carlo output directory."""
+    out_dir = Path(output_dir)
+    result = {
+        name: np.load(out_dir / f"{name}.npy", mmap_mode="r")
+        for name in (
+            "om_points",
+            "om_offsets",
+            "hit_time",
+            "hit_scatters",
+            "cross_points",
+            "cross_time",
+            "cross_scatters",
+        )
+    }
+    result["meta"] = json.loads((out_dir / "meta.json").read_text())
+    return result
+
+
+def om_hit_times(photons: dict, om: int) -> np.ndarray:
+    """Return the sorted photon hit times of one OM."""
+    offsets = photons["om_offsets"]
+    return np.asarray(photons["hit_time"][offsets[om] : offsets[om + 1]])
+
+
+if __name__ == "__main__":
+    run_photon_montecarlo()
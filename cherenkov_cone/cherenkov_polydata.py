@@ -0,0 +1,133 @@
+import numpy as np
+import pyvista as pv
+
+try:
+    from .cherenkov_geometry import (
+        _ordered_segment_point_chunks,
+        analytic_intersection_segments,
+        multiline_arrays,
+        unwrap_cylinder_points,
+        unwrapped_guide_arrays,
+        unwrapped_rectangle_points,
+    )
+except ImportError:
+    from cherenkov_geometry import (
+        _ordered_segment_point_chunks,
+        analytic_intersection_segments,
+        multiline_arrays,
+        unwrap_cylinder_points,
+        unwrapped_guide_arrays,
+        unwrapped_rectangle_points,
+    )
+
+
+def lines_polydata(points: np.ndarray, lines: np.ndarray) -> pv.PolyData:
+    """Wrap points and VTK lines connectivity in a dataset."""
+    poly = pv.PolyData(np.asarray(points, dtype=float).reshape(-1, 3))
+    if len(lines) > 0:
+        poly.lines = lines
+    return poly
+
+
+def analytic_intersection_curve_on_cylinder(
+    radius: float,
+    z_min: float,
+    z_max: float,
+    apex: np.ndarray,
+    axis: np.ndarray,
+    theta_c_rad: float,
+    n_phi: int = 720,
+    nappe: str = "trailing",
+    min_points: int = 5,
+    eps: float = 1e-12,
+    max_proj: float | None = None,
+) -> list[pv.PolyData]:
+    """``analytic_intersection_segments`` as one polyline per branch."""
+    points, offsets = analytic_intersection_segments(
+        radius, z_min, z_max, apex, axis, theta_c_rad, n_phi, nappe, min_points, eps, max_proj
+    )
+    return [pv.lines_from_points(points[i0:i1], close=False) for i0, i1 in zip(offsets[:-1], offsets[1:])]
+
+
+def segmented_points_to_polylines(
+    points: np.ndarray,
+    segment_ids: np.ndarray,
+    min_points: int = 2,
+) -> list[pv.PolyData]:
+    """Convert segmented point arrays back to individual polylines."""
+    polylines: list[pv.PolyData] = []
+    for seg_pts in _ordered_segment_point_chunks(points, segment_ids, min_points=min_points):
+        polylines.append(pv.lines_from_points(seg_pts, close=False))
+    return polylines
+
+
+def polylines_to_segmented_points(polylines: list[pv.PolyData]) -> tuple[np.ndarray, np.ndarray]:
+    """Flatten polyline branches into points plus segment ids."""
+    point_chunks: list[np.ndarray] = []
+    segment_chunks: list[np.ndarray] = []
+
+    for segment_id, poly in enumerate(polylines):
+        pts = np.asarray(poly.points, dtype=float)
+        if len(pts) == 0:
+            continue
+        point_chunks.append(pts)
+        segment_chunks.append(np.full(len(pts), segment_id, dtype=np.int32))
+
+    if not point_chunks:
+        return np.empty((0, 3), dtype=float), np.empty((0,), dtype=np.int32)
+
+    return np.vstack(point_chunks), np.concatenate(segment_chunks)
+
+
+def unwrapped_multiline_polydata(
+    unwrap_points: np.ndarray,
+    segment_ids: np.ndarray,
+    period: float | None = None,
+    min_points: int = 2,
+) -> pv.PolyData:
+    """Build a multiline dataset from unwrapped points.
+
+    With a periodic unwrap (``period`` along the first coordinate) segments are
+    split where they jump across the seam.
+    """
+    pts, lines = multiline_arrays(unwrap_points, segment_ids, period=period, min_points=min_points)
+    if len(lines) == 0:
+        return pv.PolyData(np.empty((0, 3), dtype=float))
+    return lines_polydata(pts, lines)
+
+
+def build_unwrapped_multiline_polydata(
+    points: np.ndarray,
+    segment_ids: np.ndarray,
+    radius: float,
+    min_points: int = 2,
+) -> pv.PolyData:
+    """Build an unwrapped multiline dataset and split across the seam."""
+    return unwrapped_multiline_polydata(
+        unwrap_cylinder_points(points, radius),
+        segment_ids,
+        period=2.0 * np.pi * radius,
+        min_points=min_points,
+    )
+
+
+def make_unwrapped_rectangle(bounds: tuple[float, float, float, float]) -> pv.PolyData:
+    """Create a rectangular outline ``(s_min, s_max, t_min, t_max)`` for an unwrap view."""
+    return pv.lines_from_points(unwrapped_rectangle_points(bounds), close=False)
+
+
+def make_unwrapped_outline(radius: float, z_min: float, z_max: float) -> pv.PolyData:
+    """Create a rectangular outline for the cylinder unwrap view."""
+    return make_unwrapped_rectangle((0.0, 2.0 * np.pi * radius, z_min, z_max))
+
+
+def make_unwrapped_guides(unwrap_om_points: np.ndarray, t_min: float, t_max: float) -> pv.PolyData:
+    """Create vertical guide lines through the unwrapped OM columns."""
+    if len(unwrap_om_points) == 0:
+        return pv.PolyData(np.empty((0, 3), dtype=float))
+    return lines_polydata(*unwrapped_guide_arrays(unwrap_om_points, t_min, t_max))
+
+
+def make_unwrapped_string_guides(om_points: np.ndarray, radius: float, z_min: float, z_max: float) -> pv.PolyData:
+    """Create vertical guide lines for OM strings in the unwrap view."""
+    return make_unwrapped_guides(unwrap_cylinder_points(om_points, radius), z_min, z_max)
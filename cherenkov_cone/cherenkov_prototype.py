@@ -1,56 +1,152 @@
+import argparse
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import pyvista as pv
 
 try:
-    from .cherenkov_config import load_cfg
-    from .cherenkov_geometry import (
-        analytic_intersection_curve_on_cylinder,
-        build_unwrapped_multiline_polydata,
-        make_oms_on_cylinder,
-        make_track_points,
-        make_unwrapped_outline,
-        make_unwrapped_string_guides,
-        nearest_distance_to_polylines,
-        normalize,
-        polylines_to_segmented_points,
-        unwrap_cylinder_points,
-        verify_intersection,
+    from .cherenkov_activation import om_activation
+    from .cherenkov_batch import batch_history_arrays, frame_segments
+    from .cherenkov_config import load_cfg, resolve_max_proj
+    from .cherenkov_detectors import make_detector
+    from .cherenkov_frame_cache import HistoryFrameGeometry, build_frame_cache, viewer_cache_path
+    from .cherenkov_geometry import load_om_positions, make_track_points, normalize, verify_intersection
+    from .cherenkov_history import (
+        HistoryWriter,
+        PvdSeriesWriter,
+        build_multiline_polydata,
+        export_history_npz,
+        load_history_store,
+        om_polydata,
+        save_history_npz,
+        save_history_vtm,
     )
-    from .cherenkov_history import save_history_npz, save_history_vtm
-    from .cherenkov_viewer import apply_camera, apply_unwrapped_camera, show_history_viewer
+    from .cherenkov_movie import ThreadedMovieWriter, concat_movie_segments, open_movie_writer
+    from .cherenkov_photons import load_photons, run_photon_montecarlo
+    from .cherenkov_polydata import segmented_points_to_polylines
+    from .cherenkov_response import expected_photoelectrons, frame_photoelectrons, frank_tamm_yield
+    from .cherenkov_timing import apex_times, direct_arrival_times, time_residuals
+    from .cherenkov_viewer import apply_camera, apply_unwrapped_camera, npe_color_limits, show_history_viewer
 except ImportError:
-    from cherenkov_config import load_cfg
-    from cherenkov_geometry import (
-        analytic_intersection_curve_on_cylinder,
-        build_unwrapped_multiline_polydata,
-        make_oms_on_cylinder,
-        make_track_points,
-        make_unwrapped_outline,
-        make_unwrapped_string_guides,
-        nearest_distance_to_polylines,
-        normalize,
-        polylines_to_segmented_points,
-        unwrap_cylinder_points,
-        verify_intersection,
+    from cherenkov_activation import om_activation
+    from cherenkov_batch import batch_history_arrays, frame_segments
+    from cherenkov_config import load_cfg, resolve_max_proj
+    from cherenkov_detectors import make_detector
+    from cherenkov_frame_cache import HistoryFrameGeometry, build_frame_cache, viewer_cache_path
+    from cherenkov_geometry import load_om_positions, make_track_points, normalize, verify_intersection
+    from cherenkov_history import (
+        HistoryWriter,
+        PvdSeriesWriter,
+        build_multiline_polydata,
+        export_history_npz,
+        load_history_store,
+        om_polydata,
+        save_history_npz,
+        save_history_vtm,
     )
-    from cherenkov_history import save_history_npz, save_history_vtm
-    from cherenkov_viewer import apply_camera, apply_unwrapped_camera, show_history_viewer
+    from cherenkov_movie import ThreadedMovieWriter, concat_movie_segments, open_movie_writer
+    from cherenkov_photons import load_photons, run_photon_montecarlo
+    from cherenkov_polydata import segmented_points_to_polylines
+    from cherenkov_response import expected_photoelectrons, frame_photoelectrons, frank_tamm_yield
+    from cherenkov_timing import apex_times, direct_arrival_times, time_residuals
+    from cherenkov_viewer import apply_camera, apply_unwrapped_camera, npe_color_limits, show_history_viewer
 
 
 # ============================================================
 # Main prototype
 # ============================================================
 
+# Stages timed by ``run_prototype(stage_times=...)``: once per run and once per frame.
+SETUP_STAGES = ("setup_intersections", "setup_oms", "setup_scene", "finish")
+FRAME_STAGES = ("geometry", "actors", "activation", "unwrap", "verify", "render", "encode", "history")
+
+
+def _render_segment(task: dict) -> str:
+    """Render one frame range of the movie in a worker process."""
+    run_prototype(
+        save_movie=True,
+        movie_path=task["movie_path"],
+        n_frames=task["n_frames"],
+        show_progress=False,
+        cfg_path=task["cfg_path"],
+        frame_range=task["frame_range"],
+        workers=1,
+    )
+    return task["movie_path"]
+
+
+def render_movie_parallel(
+    cfg_path: str | Path | None,
+    n_frames: int,
+    movie_path: str | Path,
+    workers: int,
+    run_cfg: dict,
+    show_progress: bool = True,
+) -> None:
+    """Render contiguous frame ranges in separate processes and stitch the movie.
+
+    Every worker builds its own off-screen plotter from the same config, so the
+    scene and movie camera are identical; segments are joined in frame order.
+    """
+    movie_path = Path(movie_path)
+    movie_path.parent.mkdir(parents=True, exist_ok=True)
+    ranges = [chunk for chunk in np.array_split(np.arange(n_frames), workers) if len(chunk) > 0]
+
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix=".cherenkov_segments_", dir=movie_path.parent) as tmp_dir:
+        tasks = [
+            {
+                "movie_path": str(Path(tmp_dir) / f"segment_{k:04d}{movie_path.suffix}"),
+                "n_frames": n_frames,
+                "cfg_path": None if cfg_path is None else str(cfg_path),
+                "frame_range": (int(chunk[0]), int(chunk[-1]) + 1),
+            }
+            for k, chunk in enumerate(ranges)
+        ]
+        # Fresh interpreters keep VTK/OpenGL state out of the workers.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(tasks), mp_context=context) as pool:
+            segment_paths = []
+            for done, segment_path in enumerate(pool.map(_render_segment, tasks), start=1):
+                segment_paths.append(segment_path)
+                if show_progress:
+                    print(f"[cherenkov] segment {done}/{len(tasks)} done", flush=True)
+        render_elapsed = time.perf_counter() - t0
+        concat_movie_segments(segment_paths, movie_path, run_cfg)
+
+    if show_progress:
+        print(
+            f"[movie] workers={len(tasks)} frames={n_frames} render={render_elapsed:.2f}s "
+            f"stitch={time.perf_counter() - t0 - render_elapsed:.2f}s -> {movie_path}",
+            flush=True,
+        )
+
+
 def run_prototype(
     save_movie: bool | None = None,
     movie_path: str | None = None,
     n_frames: int | None = None,
     show_progress: bool | None = None,
     cfg_path: str | Path | None = None,
+    frame_range: tuple[int, int] | None = None,
+    workers: int | None = None,
+    off_screen: bool = False,
+    stage_times: dict[str, list[float]] | None = None,
 ):
-    """Run the Cherenkov cone prototype from config and overrides."""
+    """Run the Cherenkov cone prototype from config and overrides.
+
+    ``workers > 1`` renders the movie with ``render_movie_parallel``. ``frame_range``
+    renders only frames ``[start, stop)`` and skips history output and the viewer;
+    the parallel workers use it. ``off_screen`` renders without a window even when
+    no movie is saved and never opens the history viewer. ``stage_times`` collects
+    seconds per stage: one entry per frame for the render-loop stages
+    (``FRAME_STAGES`` and ``frame``) and one entry for each ``SETUP_STAGES`` stage and
+    for ``movie_encode`` (encoder thread time).
+    """
     cfg = load_cfg(cfg_path)
     run_cfg = cfg["run"]
     detector_cfg = cfg["detector"]
@@ -75,16 +171,35 @@ def run_prototype(
     history_stride = max(1, int(run_cfg["history_stride"]))
     save_history_npz_enabled = run_cfg["save_history_npz"]
     history_npz_path = run_cfg["history_npz_path"]
+    save_viewer_cache_enabled = save_history_npz_enabled and run_cfg["save_viewer_cache"]
     save_history_vtm_enabled = run_cfg["save_history_vtm"]
     history_vtm_path = run_cfg["history_vtm_path"]
+    save_history_store_enabled = run_cfg["save_history_store"]
+    history_store_path = run_cfg["history_store_path"]
+    save_history_pvd_enabled = run_cfg["save_history_pvd"]
+    history_pvd_path = run_cfg["history_pvd_path"]
     show_history_viewer_enabled = run_cfg["show_history_viewer"]
+    persistent_actors = run_cfg["persistent_actors"]
+    render_workers = max(1, int(run_cfg["render_workers"] if workers is None else workers))
+    report_frame_times = run_cfg["report_frame_times"]
     verify_every = max(1, int(intersection_cfg["verify_every"]))
     verify_atol = float(intersection_cfg["verify_atol"])
+    if off_screen:
+        show_history_viewer_enabled = False
 
+    stage_log: dict[str, list[float]] = {} if stage_times is None else stage_times
+
+    def lap(stage: str, t_start: float) -> float:
+        """Record the time since ``t_start`` under ``stage`` and return the current time."""
+        now = time.perf_counter()
+        stage_log.setdefault(stage, []).append(now - t_start)
+        return now
+
+    stage_t0 = time.perf_counter()
+    detector = make_detector(detector_cfg)
     cluster_radius = detector_cfg["cluster_radius"]
     z_min = detector_cfg["z_min"]
     z_max = detector_cfg["z_max"]
-    cylinder_height = z_max - z_min
 
     n_refr = optics_cfg["n_refr"]
     beta = optics_cfg["beta"]
@@ -96,51 +211,76 @@ def run_prototype(
     u = normalize(np.asarray(track_cfg["u"], dtype=float))
     s_values = np.linspace(track_cfg["s_start"], track_cfg["s_end"], n_frames)
 
-    om_points = make_oms_on_cylinder(
-        radius=cluster_radius,
-        z_min=z_min,
-        z_max=z_max,
-        n_strings=detector_cfg["n_strings"],
-        oms_per_string=detector_cfg["oms_per_string"],
+    max_proj = resolve_max_proj(intersection_cfg, visual_cfg["cone_height"])
+
+    # All frames are solved up front; the render loop only slices the CSR batch.
+    apices = r0[None, :] + s_values[:, None] * u[None, :]
+    frame_enabled = None
+    if intersection_cfg["apex_inside_only"]:
+        frame_enabled = detector.contains(apices)
+    inter_points, inter_segment_offsets, inter_frame_offsets = detector.intersection_batch(
+        apices,
+        u,
+        theta_c,
+        n_samples=detector_cfg["cyl_sample_phi"],
+        nappe=intersection_cfg["nappe"],
+        min_points=intersection_cfg["min_points"],
+        eps=intersection_cfg["analytic_eps"],
+        max_proj=max_proj,
+        frame_mask=frame_enabled,
     )
+    stage_t0 = lap("setup_intersections", stage_t0)
 
-    pv.set_plot_theme(visual_cfg["plot_theme"])
-    show_unwrapped = visual_cfg["show_unwrapped_view"]
-    plotter_kwargs = {
-        "window_size": (visual_cfg["window_width"], visual_cfg["window_height"]),
-        "off_screen": save_movie,
-    }
-    if show_unwrapped:
-        plotter_kwargs["shape"] = (1, 2)
-        plotter_kwargs["border"] = False
-    pl = pv.Plotter(**plotter_kwargs)
-
-    def use_3d() -> None:
-        """Activate the 3D subplot when split view is enabled."""
-        if show_unwrapped:
-            pl.subplot(0, 0)
+    if detector_cfg["om_positions_path"]:
+        om_points = load_om_positions(detector_cfg["om_positions_path"])
+    else:
+        om_points = detector.make_oms(detector_cfg["n_strings"], detector_cfg["oms_per_string"])
 
-    def use_2d() -> None:
-        """Activate the unwrapped subplot when split view is enabled."""
-        if show_unwrapped:
-            pl.subplot(0, 1)
-
-    use_3d()
-    cylinder = pv.Cylinder(
-        center=(0.0, 0.0, 0.5 * (z_min + z_max)),
-        direction=(0.0, 0.0, 1.0),
-        radius=cluster_radius,
-        height=cylinder_height,
-        resolution=detector_cfg["cylinder_resolution"],
-        capping=False,
+    # Direct-light arrival time at every OM and residuals for all frames.
+    om_color_mode = visual_cfg["om_color_mode"]
+    om_arrival_times, _, _ = direct_arrival_times(
+        om_points,
+        r0,
+        u,
+        theta_c,
+        beta=beta,
+        n_group=optics_cfg["n_group"],
+        t0=track_cfg["t0"],
+        s_range=(track_cfg["s_start"], track_cfg["s_end"]),
+    )
+    frame_times = apex_times(s_values, beta=beta, t0=track_cfg["t0"])
+    om_residuals = time_residuals(om_arrival_times, frame_times) if om_color_mode == "time_residual" else None
+
+    # Expected direct-light photo-electrons per OM; frames show them once the light has arrived.
+    response_cfg = cfg["response"]
+    photons_per_m = frank_tamm_yield(
+        n_refr,
+        beta,
+        wavelength_min_nm=response_cfg["wavelength_min_nm"],
+        wavelength_max_nm=response_cfg["wavelength_max_nm"],
     )
-    pl.add_mesh(
-        cylinder,
-        style="wireframe",
-        line_width=visual_cfg["cylinder_line_width"],
-        opacity=visual_cfg["cylinder_opacity"],
-        color="white",
+    om_npe = expected_photoelectrons(
+        om_points,
+        r0,
+        u,
+        theta_c,
+        photons_per_m,
+        absorption_length=response_cfg["absorption_length"],
+        om_area=response_cfg["om_area"],
+        quantum_efficiency=response_cfg["quantum_efficiency"],
+        om_direction=response_cfg["om_direction"],
+        acceptance_power=response_cfg["acceptance_power"],
+        s_range=(track_cfg["s_start"], track_cfg["s_end"]),
     )
+    om_frame_npe = frame_photoelectrons(om_npe, om_arrival_times, frame_times) if om_color_mode == "npe" else None
+    if show_progress and frame_range is None:
+        print(
+            f"[response] photons/m={photons_per_m:.0f} total_npe={om_npe.sum():.1f} "
+            f"oms_with_npe>=1: {int(np.count_nonzero(om_npe >= 1.0))}/{len(om_npe)}",
+            flush=True,
+        )
+
+    stage_t0 = lap("setup_oms", stage_t0)
 
     track_pts = make_track_points(
         r0,
@@ -149,341 +289,603 @@ def run_prototype(
         s_max=track_cfg["draw_s_max"],
         n=track_cfg["draw_points"],
     )
-    track_poly = pv.lines_from_points(track_pts)
-    pl.add_mesh(track_poly, color="yellow", line_width=visual_cfg["track_line_width"])
-
-    oms_poly = pv.PolyData(om_points)
-    oms_poly["active"] = np.zeros(len(om_points), dtype=float)
-    om_actor = pl.add_mesh(
-        oms_poly,
-        render_points_as_spheres=True,
-        point_size=visual_cfg["om_point_size"],
-        scalars="active",
-        clim=[0.0, 1.0],
-        cmap="coolwarm",
-        show_scalar_bar=False,
-    )
 
-    apex_actor = pl.add_mesh(pv.Sphere(radius=visual_cfg["apex_radius"], center=r0), color="orange", smooth_shading=True)
-
-    cone_height = visual_cfg["cone_height"]
-    cone_radius = cone_height * np.tan(theta_c)
-    cone_mesh = pv.Cone(
-        center=r0 - 0.5 * cone_height * u,
-        direction=u,
-        height=cone_height,
-        radius=cone_radius,
-        resolution=visual_cfg["cone_resolution"],
-        capping=False,
-    )
-    cone_actor = pl.add_mesh(cone_mesh, color="deepskyblue", opacity=visual_cfg["cone_opacity"])
-
-    curve_actors = []
-    unwrap_line_actor = None
-    unwrap_points_actor = None
-    unwrap_active_oms_actor = None
+    frame_positions = np.arange(len(s_values))
+    history_positions = frame_positions[(frame_positions % history_stride == 0) | (frame_positions == len(s_values) - 1)]
+    is_history_frame = np.zeros(len(s_values), dtype=bool)
+    is_history_frame[history_positions] = True
+
+    # History frames go to the chunked store as they are rendered; npz/vtm and the
+    # viewer read it back at the end. Without the store they come from the batch.
+    history_writer = None
+    if save_history_store_enabled and frame_range is None:
+        history_writer = HistoryWriter(
+            history_store_path,
+            chunk_frames=run_cfg["history_chunk_frames"],
+            float32=run_cfg["history_float32"],
+            compress=run_cfg["history_compress"],
+            meta={
+                "track_r0": r0.tolist(),
+                "track_u": u.tolist(),
+                "theta_c_rad": float(theta_c),
+                "cylinder_radius": float(cluster_radius),
+                "z_min": float(z_min),
+                "z_max": float(z_max),
+                "detector": detector.to_dict(),
+            },
+            arrays={"om_points": om_points, "om_arrival_times": om_arrival_times, "om_npe": om_npe},
+        )
 
-    if show_unwrapped:
-        unwrap_om_points = unwrap_cylinder_points(om_points, cluster_radius)
-        use_2d()
-        pl.add_mesh(make_unwrapped_outline(cluster_radius, z_min, z_max), color="black", line_width=2.0)
-        pl.add_mesh(
-            make_unwrapped_string_guides(om_points, cluster_radius, z_min, z_max),
-            color="gray",
-            line_width=1.0,
-            opacity=0.18,
+    pvd_writer = None
+    if save_history_pvd_enabled and frame_range is None:
+        pvd_writer = PvdSeriesWriter(
+            history_pvd_path,
+            flush_frames=run_cfg["history_chunk_frames"],
+            static={"oms": om_polydata(om_points, om_arrival_times, om_npe)},
         )
-        pl.add_mesh(
-            pv.PolyData(unwrap_om_points),
-            color="midnightblue",
-            point_size=visual_cfg["unwrap_om_point_size"],
-            render_points_as_spheres=True,
-            opacity=0.45,
+    recording = history_writer is not None or pvd_writer is not None
+
+    def record_history_frame(pos: int) -> None:
+        """Append one rendered frame to the history store and the PVD series."""
+        pts, seg = frame_segments(inter_points, inter_segment_offsets, inter_frame_offsets, pos)
+        for writer in (history_writer, pvd_writer):
+            if writer is not None:
+                writer.append_frame(pos + 1, apices[pos], frame_times[pos], pts, seg)
+
+    def close_history_writers() -> None:
+        """Flush the last frames of the history store and the PVD series."""
+        if pvd_writer is not None:
+            pvd_writer.close()
+            if show_progress:
+                print(f"[history] wrote pvd: {history_pvd_path} ({pvd_writer.n_frames} frames)", flush=True)
+        if history_writer is not None:
+            history_writer.close()
+            if show_progress:
+                print(f"[history] wrote store: {history_store_path}", flush=True)
+
+    loaded_history: dict = {}
+
+    def load_history() -> dict:
+        """Return the flat history arrays for the exporters and the viewer, read once."""
+        if loaded_history:
+            return loaded_history
+        if history_writer is not None:
+            loaded_history.update(load_history_store(history_store_path))
+            return loaded_history
+        points, frames, segments = batch_history_arrays(
+            inter_points,
+            inter_segment_offsets,
+            inter_frame_offsets,
+            frame_positions=history_positions,
+            frame_numbers=(history_positions + 1).astype(np.int32),
         )
-        pl.add_text("Cylinder unwrap (s = R*phi, z)", font_size=12, name="unwrap_title")
-
-    use_3d()
-    pl.add_text(visual_cfg["title_text"], font_size=12)
-    pl.show_axes()
-    if save_movie:
-        camera_position = visual_cfg["movie_camera_position"]
-        camera_focal = visual_cfg["movie_camera_focal"]
-        camera_view_up = visual_cfg["movie_camera_view_up"]
-        parallel_projection = visual_cfg["movie_parallel_projection"]
-    else:
-        camera_position = visual_cfg["camera_position"]
-        camera_focal = visual_cfg["camera_focal"]
-        camera_view_up = visual_cfg["camera_view_up"]
-        parallel_projection = visual_cfg["parallel_projection"]
-
-    apply_camera(pl, camera_position, camera_focal, camera_view_up, parallel_projection)
-    if show_unwrapped:
-        use_2d()
-        apply_unwrapped_camera(pl, cluster_radius, z_min, z_max)
-        use_3d()
+        loaded_history.update(
+            apex_points=apices[history_positions],
+            apex_frames=(history_positions + 1).astype(np.int32),
+            apex_times=frame_times[history_positions],
+            intersection_points=points,
+            intersection_frames=frames,
+            intersection_segments=segments,
+        )
+        return loaded_history
+
+    def viewer_kwargs(history: dict) -> dict:
+        """Arguments for ``show_history_viewer``."""
+        kwargs = {
+            "apex_points": history["apex_points"],
+            "apex_frames": history["apex_frames"],
+            "intersection_points": history["intersection_points"],
+            "intersection_frames": history["intersection_frames"],
+            "intersection_segments": history["intersection_segments"],
+            "cluster_radius": cluster_radius,
+            "z_min": z_min,
+            "z_max": z_max,
+            "detector": detector,
+            "om_points": om_points,
+            "track_pts": track_pts,
+            "track_axis": u,
+            "theta_c_rad": theta_c,
+            "visual_cfg": visual_cfg,
+            "intersection_cfg": intersection_cfg,
+            "apex_times": history["apex_times"],
+            "om_arrival_times": om_arrival_times,
+            "om_npe": om_npe,
+        }
+        if save_viewer_cache_enabled:
+            kwargs["cache_path"] = viewer_cache_path(history_npz_path)
+        photon_cfg = cfg["photons"]
+        if photon_cfg["show_halo"]:
+            if detector.kind == "cylinder":
+                photons = load_photons(run_photon_montecarlo(cfg_path, show_progress=show_progress))
+                kwargs["halo_points"] = photons["cross_points"]
+                kwargs["halo_times"] = photons["cross_time"]
+                kwargs["halo_window"] = photon_cfg["halo_window"]
+            elif show_progress:
+                print("[photons] show_halo needs detector.kind = cylinder; skipped", flush=True)
+        return kwargs
+
+    def save_history_outputs() -> None:
+        """Write the enabled history exports; the flat arrays are only read when needed."""
+        if save_history_npz_enabled and history_writer is not None:
+            # Streamed from the store chunk by chunk.
+            export_history_npz(history_store_path, history_npz_path)
+            if show_progress:
+                print(f"[history] wrote npz: {history_npz_path}", flush=True)
+        elif save_history_npz_enabled:
+            history = load_history()
+            save_history_npz(
+                npz_path=history_npz_path,
+                apex_points=history["apex_points"],
+                apex_frames=history["apex_frames"],
+                intersection_points=np.asarray(history["intersection_points"], dtype=float),
+                intersection_frames=history["intersection_frames"],
+                intersection_segments=history["intersection_segments"],
+                r0=r0,
+                u=u,
+                theta_c_rad=theta_c,
+                radius=cluster_radius,
+                z_min=z_min,
+                z_max=z_max,
+                apex_times=history["apex_times"],
+                om_points=om_points,
+                om_arrival_times=om_arrival_times,
+                om_npe=om_npe,
+                detector=detector.to_dict(),
+            )
+            if show_progress:
+                print(f"[history] wrote npz: {history_npz_path}", flush=True)
+
+        if save_viewer_cache_enabled:
+            history = load_history()
+            frame_history = HistoryFrameGeometry(
+                history["apex_points"],
+                history["apex_frames"],
+                history["intersection_points"],
+                history["intersection_frames"],
+                history["intersection_segments"],
+                om_points,
+                u,
+                theta_c,
+                activation_distance=intersection_cfg["activation_distance"],
+                min_points=max(2, int(intersection_cfg["min_points"])),
+                detector=detector,
+            )
+            cache_path = build_frame_cache(frame_history, viewer_cache_path(history_npz_path))
+            if show_progress:
+                print(f"[history] wrote viewer cache: {cache_path}", flush=True)
+
+        if save_history_vtm_enabled:
+            history = load_history()
+            save_history_vtm(
+                vtm_path=history_vtm_path,
+                apex_points=history["apex_points"],
+                apex_frames=history["apex_frames"],
+                intersection_points=np.asarray(history["intersection_points"], dtype=float),
+                intersection_frames=history["intersection_frames"],
+                intersection_segments=history["intersection_segments"],
+            )
+            if show_progress:
+                print(f"[history] wrote vtm: {history_vtm_path}", flush=True)
+
+    if frame_range is None and save_movie and render_workers > 1:
+        render_movie_parallel(cfg_path, n_frames, movie_path, render_workers, run_cfg, show_progress=show_progress)
+        if recording:
+            for pos in history_positions:
+                record_history_frame(int(pos))
+        close_history_writers()
+        save_history_outputs()
+        if show_history_viewer_enabled:
+            show_history_viewer(**viewer_kwargs(load_history()))
+        return
 
+    pv.set_plot_theme(visual_cfg["plot_theme"])
+    # Restored (and history writers flushed) in the ``finally`` below, even if setup fails.
+    old_allow_empty = pv.global_theme.allow_empty_mesh
     movie_writer = None
-    if save_movie:
-        import imageio.v2 as iio
-
-        writer_kwargs = {
-            "fps": run_cfg["movie_fps"],
-            "codec": run_cfg["movie_codec"],
-            "is_batch": run_cfg["movie_is_batch"],
+    frame_durations: list[float] = []
+    try:
+        if persistent_actors:
+            pv.global_theme.allow_empty_mesh = True
+        show_unwrapped = visual_cfg["show_unwrapped_view"]
+        plotter_kwargs = {
+            "window_size": (visual_cfg["window_width"], visual_cfg["window_height"]),
+            "off_screen": save_movie or off_screen,
         }
-        if run_cfg["movie_format"]:
-            writer_kwargs["format"] = run_cfg["movie_format"]
-        movie_writer = iio.get_writer(movie_path, **writer_kwargs)
-        pl.show(auto_close=False)
-    else:
-        pl.show(auto_close=False, interactive_update=True)
-
-    activation_distance = intersection_cfg["activation_distance"]
-    max_proj: float | None = None
-    if intersection_cfg["clip_to_visual_cone"]:
-        max_proj = float(cone_height)
-    user_max_proj = float(intersection_cfg["max_forward_distance"])
-    if user_max_proj > 0.0:
-        max_proj = user_max_proj if max_proj is None else min(max_proj, user_max_proj)
-
-    apex_history: list[np.ndarray] = []
-    apex_history_frames: list[int] = []
-    intersection_history_pts: list[np.ndarray] = []
-    intersection_history_frames: list[np.ndarray] = []
-    intersection_history_segments: list[np.ndarray] = []
-    segment_counter = 0
-    progress_every = max(1, len(s_values) // 10)
+        if show_unwrapped:
+            plotter_kwargs["shape"] = (1, 2)
+            plotter_kwargs["border"] = False
+        pl = pv.Plotter(**plotter_kwargs)
 
-    try:
-        for frame_idx, s in enumerate(s_values, start=1):
-            apex = r0 + s * u
-            apex_actor.mapper.dataset.copy_from(pv.Sphere(radius=visual_cfg["apex_radius"], center=apex))
-            cone_actor.mapper.dataset.copy_from(
-                pv.Cone(
-                    center=apex - 0.5 * cone_height * u,
-                    direction=u,
-                    height=cone_height,
-                    radius=cone_radius,
-                    resolution=visual_cfg["cone_resolution"],
-                    capping=False,
-                )
-            )
+        def use_3d() -> None:
+            """Activate the 3D subplot when split view is enabled."""
+            if show_unwrapped:
+                pl.subplot(0, 0)
 
-            use_3d()
-            for actor in curve_actors:
-                pl.remove_actor(actor)
-            curve_actors = []
+        def use_2d() -> None:
+            """Activate the unwrapped subplot when split view is enabled."""
             if show_unwrapped:
-                use_2d()
-                if unwrap_line_actor is not None:
-                    pl.remove_actor(unwrap_line_actor)
-                    unwrap_line_actor = None
-                if unwrap_points_actor is not None:
-                    pl.remove_actor(unwrap_points_actor)
-                    unwrap_points_actor = None
-                if unwrap_active_oms_actor is not None:
-                    pl.remove_actor(unwrap_active_oms_actor)
-                    unwrap_active_oms_actor = None
-
-            apex_inside_detector = (
-                (apex[0] ** 2 + apex[1] ** 2) <= cluster_radius**2
-                and (z_min <= apex[2] <= z_max)
+                pl.subplot(0, 1)
+
+        use_3d()
+        pl.add_mesh(
+            detector.surface_mesh(detector_cfg["cylinder_resolution"]),
+            style="wireframe",
+            line_width=visual_cfg["cylinder_line_width"],
+            opacity=visual_cfg["cylinder_opacity"],
+            color="white",
+        )
+
+        track_poly = pv.lines_from_points(track_pts)
+        pl.add_mesh(track_poly, color="yellow", line_width=visual_cfg["track_line_width"])
+
+        oms_poly = pv.PolyData(om_points)
+        oms_poly["active"] = np.zeros(len(om_points), dtype=float)
+        if om_color_mode == "time_residual":
+            residual_window = float(visual_cfg["time_residual_window"])
+            oms_poly["time_residual"] = om_residuals[0]
+            om_actor = pl.add_mesh(
+                oms_poly,
+                render_points_as_spheres=True,
+                point_size=visual_cfg["om_point_size"],
+                scalars="time_residual",
+                clim=[-residual_window, residual_window],
+                cmap="coolwarm",
+                nan_color="lightgray",
+                scalar_bar_args={"title": "t - t_direct [ns]"},
+            )
+        elif om_color_mode == "npe":
+            npe_clim = npe_color_limits(om_npe, visual_cfg)
+            oms_poly["npe"] = om_frame_npe[0]
+            om_actor = pl.add_mesh(
+                oms_poly,
+                render_points_as_spheres=True,
+                point_size=visual_cfg["om_point_size"],
+                scalars="npe",
+                clim=npe_clim,
+                log_scale=True,
+                cmap="viridis",
+                nan_color="lightgray",
+                scalar_bar_args={"title": "expected p.e."},
             )
-            if intersection_cfg["apex_inside_only"] and not apex_inside_detector:
-                polylines = []
+        else:
+            om_actor = pl.add_mesh(
+                oms_poly,
+                render_points_as_spheres=True,
+                point_size=visual_cfg["om_point_size"],
+                scalars="active",
+                clim=[0.0, 1.0],
+                cmap="coolwarm",
+                show_scalar_bar=False,
+            )
+
+        # Apex and cone are built once around the origin and moved with ``actor.position``.
+        apex_actor = pl.add_mesh(
+            pv.Sphere(radius=visual_cfg["apex_radius"], center=(0.0, 0.0, 0.0)),
+            color="orange",
+            smooth_shading=True,
+        )
+        apex_actor.position = r0
+
+        cone_height = visual_cfg["cone_height"]
+        cone_radius = cone_height * np.tan(theta_c)
+        cone_mesh = pv.Cone(
+            center=-0.5 * cone_height * u,
+            direction=u,
+            height=cone_height,
+            radius=cone_radius,
+            resolution=visual_cfg["cone_resolution"],
+            capping=False,
+        )
+        cone_actor = pl.add_mesh(cone_mesh, color="deepskyblue", opacity=visual_cfg["cone_opacity"])
+        cone_actor.position = r0
+
+        curve_actors = []
+        curve_actor = None
+        unwrap_line_actor = None
+        unwrap_points_actor = None
+        unwrap_active_oms_actor = None
+        unwrap_oms_actor = None
+
+        if persistent_actors:
+            # Fixed actors whose datasets are swapped in place every frame.
+            curve_actor = pl.add_mesh(
+                pv.PolyData(np.empty((0, 3), dtype=float)),
+                color=intersection_cfg["curve_color"],
+                line_width=intersection_cfg["curve_line_width"],
+                render_lines_as_tubes=True,
+            )
+
+        if show_unwrapped:
+            unwrap_om_points = detector.unwrap(om_points)
+            use_2d()
+            pl.add_mesh(detector.unwrapped_outline(), color="black", line_width=2.0)
+            pl.add_mesh(
+                detector.unwrapped_guides(om_points),
+                color="gray",
+                line_width=1.0,
+                opacity=0.18,
+            )
+            if om_frame_npe is not None:
+                unwrap_oms_poly = pv.PolyData(unwrap_om_points)
+                unwrap_oms_poly["npe"] = om_frame_npe[0]
+                unwrap_oms_actor = pl.add_mesh(
+                    unwrap_oms_poly,
+                    scalars="npe",
+                    clim=npe_clim,
+                    log_scale=True,
+                    cmap="viridis",
+                    nan_color="lightgray",
+                    show_scalar_bar=False,
+                    point_size=visual_cfg["unwrap_om_point_size"],
+                    render_points_as_spheres=True,
+                )
             else:
-                polylines = analytic_intersection_curve_on_cylinder(
-                    radius=cluster_radius,
-                    z_min=z_min,
-                    z_max=z_max,
-                    apex=apex,
-                    axis=u,
-                    theta_c_rad=theta_c,
-                    n_phi=detector_cfg["cyl_sample_phi"],
-                    nappe=intersection_cfg["nappe"],
-                    min_points=intersection_cfg["min_points"],
-                    eps=intersection_cfg["analytic_eps"],
-                    max_proj=max_proj,
+                pl.add_mesh(
+                    pv.PolyData(unwrap_om_points),
+                    color="midnightblue",
+                    point_size=visual_cfg["unwrap_om_point_size"],
+                    render_points_as_spheres=True,
+                    opacity=0.45,
+                )
+            if persistent_actors:
+                unwrap_line_actor = pl.add_mesh(
+                    pv.PolyData(np.empty((0, 3), dtype=float)),
+                    color=intersection_cfg["curve_color"],
+                    line_width=visual_cfg["unwrap_curve_line_width"],
+                    opacity=0.95,
+                )
+                unwrap_points_actor = pl.add_mesh(
+                    pv.PolyData(np.empty((0, 3), dtype=float)),
+                    color=intersection_cfg["curve_color"],
+                    point_size=visual_cfg["unwrap_curve_point_size"],
+                    render_points_as_spheres=True,
+                    opacity=0.30,
+                )
+                unwrap_active_oms_actor = pl.add_mesh(
+                    pv.PolyData(np.empty((0, 3), dtype=float)),
+                    color="crimson",
+                    point_size=visual_cfg["unwrap_active_om_point_size"],
+                    render_points_as_spheres=True,
+                    opacity=0.95,
                 )
+            pl.add_text(detector.unwrap_title, font_size=12, name="unwrap_title")
 
+        use_3d()
+        pl.add_text(visual_cfg["title_text"], font_size=12)
+        pl.show_axes()
+        if save_movie:
+            camera_position = visual_cfg["movie_camera_position"]
+            camera_focal = visual_cfg["movie_camera_focal"]
+            camera_view_up = visual_cfg["movie_camera_view_up"]
+            parallel_projection = visual_cfg["movie_parallel_projection"]
+        else:
+            camera_position = visual_cfg["camera_position"]
+            camera_focal = visual_cfg["camera_focal"]
+            camera_view_up = visual_cfg["camera_view_up"]
+            parallel_projection = visual_cfg["parallel_projection"]
+
+        apply_camera(pl, camera_position, camera_focal, camera_view_up, parallel_projection)
+        if show_unwrapped:
+            use_2d()
+            apply_unwrapped_camera(pl, detector.unwrap_bounds())
             use_3d()
-            for poly in polylines:
-                curve_actors.append(
-                    pl.add_mesh(
-                        poly,
-                        color=intersection_cfg["curve_color"],
-                        line_width=intersection_cfg["curve_line_width"],
-                        render_lines_as_tubes=True,
-                    )
-                )
 
-            active = (nearest_distance_to_polylines(om_points, polylines) < activation_distance).astype(float)
+        render_time = 0.0
+        if save_movie:
+            movie_writer = ThreadedMovieWriter(
+                open_movie_writer(movie_path, run_cfg),
+                max_queue=max(0, int(run_cfg["movie_queue_size"])),
+            )
+            pl.show(auto_close=False)
+        elif off_screen:
+            pl.show(auto_close=False)
+        else:
+            pl.show(auto_close=False, interactive_update=True)
+        stage_t0 = lap("setup_scene", stage_t0)
+
+        activation_distance = intersection_cfg["activation_distance"]
+        progress_every = max(1, len(s_values) // 10)
+
+        frame_start, frame_stop = (0, len(s_values)) if frame_range is None else frame_range
+        for frame_idx in range(frame_start + 1, frame_stop + 1):
+            frame_t0 = stage_t0 = time.perf_counter()
+            apex = apices[frame_idx - 1]
+            apex_actor.position = apex
+            cone_actor.position = apex
+
+            if not persistent_actors:
+                use_3d()
+                for actor in curve_actors:
+                    pl.remove_actor(actor)
+                curve_actors = []
+                if show_unwrapped:
+                    use_2d()
+                    if unwrap_line_actor is not None:
+                        pl.remove_actor(unwrap_line_actor)
+                        unwrap_line_actor = None
+                    if unwrap_points_actor is not None:
+                        pl.remove_actor(unwrap_points_actor)
+                        unwrap_points_actor = None
+                    if unwrap_active_oms_actor is not None:
+                        pl.remove_actor(unwrap_active_oms_actor)
+                        unwrap_active_oms_actor = None
+
+            inter_pts_frame, inter_seg_frame = frame_segments(
+                inter_points, inter_segment_offsets, inter_frame_offsets, frame_idx - 1
+            )
+            # Per-branch PolyData is only needed for per-branch actors and verification.
+            polylines = None
+            stage_t0 = lap("geometry", stage_t0)
+
+            use_3d()
+            if persistent_actors:
+                curve_actor.mapper.dataset.copy_from(build_multiline_polydata(inter_pts_frame, inter_seg_frame))
+            else:
+                polylines = segmented_points_to_polylines(inter_pts_frame, inter_seg_frame, min_points=1)
+                for poly in polylines:
+                    curve_actors.append(
+                        pl.add_mesh(
+                            poly,
+                            color=intersection_cfg["curve_color"],
+                            line_width=intersection_cfg["curve_line_width"],
+                            render_lines_as_tubes=True,
+                        )
+                    )
+            stage_t0 = lap("actors", stage_t0)
+
+            active_mask, _ = om_activation(
+                om_points,
+                inter_pts_frame,
+                inter_seg_frame,
+                activation_distance,
+                apex=apex,
+                axis=u,
+                theta_c_rad=theta_c,
+            )
+            active = active_mask.astype(float)
             oms_poly["active"] = active
             om_actor.mapper.dataset["active"] = active
+            if om_residuals is not None:
+                om_actor.mapper.dataset["time_residual"] = om_residuals[frame_idx - 1]
+            if om_frame_npe is not None:
+                om_actor.mapper.dataset["npe"] = om_frame_npe[frame_idx - 1]
+                if unwrap_oms_actor is not None:
+                    unwrap_oms_actor.mapper.dataset["npe"] = om_frame_npe[frame_idx - 1]
+            stage_t0 = lap("activation", stage_t0)
 
             if show_unwrapped:
-                inter_pts_frame, inter_seg_frame = polylines_to_segmented_points(polylines)
                 use_2d()
-                unwrap_line_poly = build_unwrapped_multiline_polydata(
+                unwrap_line_poly = detector.unwrapped_polydata(
                     inter_pts_frame,
                     inter_seg_frame,
-                    radius=cluster_radius,
                     min_points=max(2, int(intersection_cfg["min_points"])),
                 )
-                if unwrap_line_poly.n_points > 0:
-                    unwrap_line_actor = pl.add_mesh(
-                        unwrap_line_poly,
-                        color=intersection_cfg["curve_color"],
-                        line_width=visual_cfg["unwrap_curve_line_width"],
-                        opacity=0.95,
-                    )
-                unwrap_pts_frame = unwrap_cylinder_points(inter_pts_frame, cluster_radius)
-                if len(unwrap_pts_frame) > 0:
-                    unwrap_points_actor = pl.add_mesh(
-                        pv.PolyData(unwrap_pts_frame),
-                        color=intersection_cfg["curve_color"],
-                        point_size=visual_cfg["unwrap_curve_point_size"],
-                        render_points_as_spheres=True,
-                        opacity=0.30,
-                    )
-                active_mask = active > 0.0
-                if np.any(active_mask):
-                    unwrap_active_oms_actor = pl.add_mesh(
-                        pv.PolyData(unwrap_om_points[active_mask]),
-                        color="crimson",
-                        point_size=visual_cfg["unwrap_active_om_point_size"],
-                        render_points_as_spheres=True,
-                        opacity=0.95,
-                    )
-
-            if ((frame_idx - 1) % history_stride == 0) or frame_idx == len(s_values):
-                apex_history.append(apex.copy())
-                apex_history_frames.append(frame_idx)
-                for poly in polylines:
-                    pts = np.asarray(poly.points)
-                    if len(pts) == 0:
-                        continue
-                    intersection_history_pts.append(pts.copy())
-                    intersection_history_frames.append(np.full(len(pts), frame_idx, dtype=np.int32))
-                    intersection_history_segments.append(np.full(len(pts), segment_counter, dtype=np.int32))
-                    segment_counter += 1
+                unwrap_pts_frame = detector.unwrap(inter_pts_frame)
+                if persistent_actors:
+                    unwrap_line_actor.mapper.dataset.copy_from(unwrap_line_poly)
+                    unwrap_points_actor.mapper.dataset.copy_from(pv.PolyData(unwrap_pts_frame))
+                    unwrap_active_oms_actor.mapper.dataset.copy_from(pv.PolyData(unwrap_om_points[active_mask]))
+                else:
+                    if unwrap_line_poly.n_points > 0:
+                        unwrap_line_actor = pl.add_mesh(
+                            unwrap_line_poly,
+                            color=intersection_cfg["curve_color"],
+                            line_width=visual_cfg["unwrap_curve_line_width"],
+                            opacity=0.95,
+                        )
+                    if len(unwrap_pts_frame) > 0:
+                        unwrap_points_actor = pl.add_mesh(
+                            pv.PolyData(unwrap_pts_frame),
+                            color=intersection_cfg["curve_color"],
+                            point_size=visual_cfg["unwrap_curve_point_size"],
+                            render_points_as_spheres=True,
+                            opacity=0.30,
+                        )
+                    if np.any(active_mask):
+                        unwrap_active_oms_actor = pl.add_mesh(
+                            pv.PolyData(unwrap_om_points[active_mask]),
+                            color="crimson",
+                            point_size=visual_cfg["unwrap_active_om_point_size"],
+                            render_points_as_spheres=True,
+                            opacity=0.95,
+                        )
+            stage_t0 = lap("unwrap", stage_t0)
 
             if (
                 intersection_cfg["verify_geometry"]
                 and (frame_idx == 1 or frame_idx % verify_every == 0 or frame_idx == len(s_values))
             ):
-                cyl_err, cone_err, n_verify_pts = verify_intersection(
+                if polylines is None:
+                    polylines = segmented_points_to_polylines(inter_pts_frame, inter_seg_frame, min_points=1)
+                surface_err, cone_err, n_verify_pts = verify_intersection(
                     polylines=polylines,
                     apex=apex,
                     axis=u,
                     theta_c_rad=theta_c,
-                    radius=cluster_radius,
+                    surface_residual=detector.surface_residual,
                 )
                 if n_verify_pts > 0:
-                    status = "OK" if max(cyl_err, cone_err) <= verify_atol else "WARN"
+                    status = "OK" if max(surface_err, cone_err) <= verify_atol else "WARN"
                     print(
-                        f"[check:{status}] pts={n_verify_pts} cyl_err={cyl_err:.3e} cone_err={cone_err:.3e} atol={verify_atol:.1e}",
+                        f"[check:{status}] pts={n_verify_pts} surface_err={surface_err:.3e} cone_err={cone_err:.3e} atol={verify_atol:.1e}",
                         flush=True,
                     )
+            stage_t0 = lap("verify", stage_t0)
 
             use_3d()
             if save_movie:
+                render_t0 = time.perf_counter()
                 pl.render()
-                movie_writer.append_data(pl.image)
+                frame_image = pl.image
+                render_time += time.perf_counter() - render_t0
+                stage_t0 = lap("render", stage_t0)
+                movie_writer.append_data(frame_image)
             else:
                 pl.render()
-                pl.update()
+                if not off_screen:
+                    pl.update()
+                stage_t0 = lap("render", stage_t0)
+            stage_t0 = lap("encode", stage_t0)
+            if recording and is_history_frame[frame_idx - 1]:
+                record_history_frame(frame_idx - 1)
+            lap("history", stage_t0)
+            frame_durations.append(time.perf_counter() - frame_t0)
 
             if show_progress and (frame_idx == 1 or frame_idx % progress_every == 0 or frame_idx == len(s_values)):
                 print(f"[cherenkov] frame {frame_idx}/{len(s_values)}", flush=True)
     finally:
+        stage_t0 = time.perf_counter()
+        for writer in (history_writer, pvd_writer):
+            if writer is not None:
+                writer.flush()
         if save_movie and movie_writer is not None:
             movie_writer.close()
-
-    apex_points = np.asarray(apex_history, dtype=float) if apex_history else np.empty((0, 3), dtype=float)
-    apex_frames = np.asarray(apex_history_frames, dtype=np.int32) if apex_history_frames else np.empty((0,), dtype=np.int32)
-    if intersection_history_pts:
-        intersection_points = np.vstack(intersection_history_pts)
-        intersection_frames = np.concatenate(intersection_history_frames).astype(np.int32, copy=False)
-        intersection_segments = np.concatenate(intersection_history_segments).astype(np.int32, copy=False)
-    else:
-        intersection_points = np.empty((0, 3), dtype=float)
-        intersection_frames = np.empty((0,), dtype=np.int32)
-        intersection_segments = np.empty((0,), dtype=np.int32)
-
-    if save_history_npz_enabled:
-        save_history_npz(
-            npz_path=history_npz_path,
-            apex_points=apex_points,
-            apex_frames=apex_frames,
-            intersection_points=intersection_points,
-            intersection_frames=intersection_frames,
-            intersection_segments=intersection_segments,
-            r0=r0,
-            u=u,
-            theta_c_rad=theta_c,
-            radius=cluster_radius,
-            z_min=z_min,
-            z_max=z_max,
+            stage_log["movie_encode"] = [movie_writer.encode_time]
+        pv.global_theme.allow_empty_mesh = old_allow_empty
+        stage_log["frame"] = frame_durations
+
+    if save_movie and movie_writer is not None and (show_progress or report_frame_times):
+        print(
+            f"[movie] frames={movie_writer.n_frames} render={render_time:.2f}s encode={movie_writer.encode_time:.2f}s "
+            f"backpressure={movie_writer.wait_time:.2f}s threaded={int(movie_writer.threaded)}",
+            flush=True,
         )
-        if show_progress:
-            print(f"[history] wrote npz: {history_npz_path}", flush=True)
-
-    if save_history_vtm_enabled:
-        save_history_vtm(
-            vtm_path=history_vtm_path,
-            apex_points=apex_points,
-            apex_frames=apex_frames,
-            intersection_points=intersection_points,
-            intersection_frames=intersection_frames,
-            intersection_segments=intersection_segments,
+
+    if report_frame_times and frame_durations:
+        times_ms = 1e3 * np.asarray(frame_durations, dtype=float)
+        mode = "persistent" if persistent_actors else "rebuild"
+        print(
+            f"[timing] actors={mode} frames={len(times_ms)} mean={times_ms.mean():.2f}ms "
+            f"median={np.median(times_ms):.2f}ms max={times_ms.max():.2f}ms total={1e-3 * times_ms.sum():.2f}s",
+            flush=True,
         )
-        if show_progress:
-            print(f"[history] wrote vtm: {history_vtm_path}", flush=True)
 
-    if save_movie:
+    if frame_range is not None:
+        pl.close()
+        return
+
+    close_history_writers()
+    save_history_outputs()
+    lap("finish", stage_t0)
+
+    if save_movie or off_screen:
         pl.close()
         if show_history_viewer_enabled:
-            show_history_viewer(
-                apex_points=apex_points,
-                apex_frames=apex_frames,
-                intersection_points=intersection_points,
-                intersection_frames=intersection_frames,
-                intersection_segments=intersection_segments,
-                cluster_radius=cluster_radius,
-                z_min=z_min,
-                z_max=z_max,
-                om_points=om_points,
-                track_pts=track_pts,
-                track_axis=u,
-                theta_c_rad=theta_c,
-                visual_cfg=visual_cfg,
-                intersection_cfg=intersection_cfg,
-            )
+            show_history_viewer(**viewer_kwargs(load_history()))
         return
 
     if show_history_viewer_enabled:
         pl.close()
-        show_history_viewer(
-            apex_points=apex_points,
-            apex_frames=apex_frames,
-            intersection_points=intersection_points,
-            intersection_frames=intersection_frames,
-            intersection_segments=intersection_segments,
-            cluster_radius=cluster_radius,
-            z_min=z_min,
-            z_max=z_max,
-            om_points=om_points,
-            track_pts=track_pts,
-            track_axis=u,
-            theta_c_rad=theta_c,
-            visual_cfg=visual_cfg,
-            intersection_cfg=intersection_cfg,
-        )
+        show_history_viewer(**viewer_kwargs(load_history()))
         return
 
     pl.show()
 
 
 if __name__ == "__main__":
-    run_prototype()
+    parser = argparse.ArgumentParser(description="Run the Cherenkov cone prototype.")
+    parser.add_argument("--cfg", default=None, help="path to run.cfg (default: next to this script)")
+    parser.add_argument("--workers", type=int, default=None, help="render the movie with N processes")
+    parser.add_argument("--n-frames", type=int, default=None, help="override run.n_frames")
+    args = parser.parse_args()
+    run_prototype(n_frames=args.n_frames, cfg_path=args.cfg, workers=args.workers)
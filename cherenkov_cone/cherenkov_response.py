@@ -0,0 +1,86 @@
+import numpy as np
+
+try:
+    from .cherenkov_geometry import normalize
+except ImportError:
+    from cherenkov_geometry import normalize
+
+
+FINE_STRUCTURE = 1.0 / 137.035999
+
+
+def frank_tamm_yield(
+    n_refr: float,
+    beta: float = 1.0,
+    wavelength_min_nm: float = 300.0,
+    wavelength_max_nm: float = 600.0,
+) -> float:
+    """Return Cherenkov photons per metre of track in a wavelength band.
+
+    Frank–Tamm with a constant refractive index:
+    ``dN/dx = 2 pi alpha sin^2(theta_c) (1 / lambda_min - 1 / lambda_max)``.
+    """
+    sin2 = 1.0 - 1.0 / (beta * beta * n_refr * n_refr)
+    if sin2 <= 0.0:
+        return 0.0
+    inv_band = 1.0 / (wavelength_min_nm * 1e-9) - 1.0 / (wavelength_max_nm * 1e-9)
+    return float(2.0 * np.pi * FINE_STRUCTURE * sin2 * inv_band)
+
+
+def expected_photoelectrons(
+    om_points: np.ndarray,
+    r0: np.ndarray,
+    u: np.ndarray,
+    theta_c_rad: float,
+    photons_per_m: float,
+    absorption_length: float = 25.0,
+    om_area: float = 0.05,
+    quantum_efficiency: float = 0.25,
+    om_direction: np.ndarray | None = (0.0, 0.0, -1.0),
+    acceptance_power: float = 1.0,
+    s_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """Return the expected direct-light photo-electrons at every OM.
+
+    Photons from a unit of track spread over a cylinder of radius ``d`` around it and
+    cross it at ``theta_c``, so the flux through an area facing the photons is
+    ``dN/dx / (2 pi d sin(theta_c))``. Along the path ``d / sin(theta_c)`` it is
+    attenuated by ``exp(-path / absorption_length)``. The OM collects
+    ``om_area * quantum_efficiency * ((1 + cos eta) / 2) ** acceptance_power``, with
+    ``eta`` the angle between ``om_direction`` and the direction the photon comes
+    from; ``om_direction = None`` or ``acceptance_power = 0`` is isotropic. ``d`` is
+    clamped to the OM radius ``sqrt(om_area / pi)``. OMs whose emission point lies
+    outside ``s_range`` get zero.
+    """
+    u = normalize(np.asarray(u, dtype=float))
+    sin_c = np.sin(theta_c_rad)
+    d_vec = np.asarray(om_points, dtype=float) - np.asarray(r0, dtype=float)[None, :]
+    l = d_vec @ u
+    radial = d_vec - l[:, None] * u[None, :]
+    d = np.sqrt(np.sum(radial * radial, axis=1))
+    d_eff = np.maximum(d, np.sqrt(om_area / np.pi))
+
+    path = d_eff / sin_c
+    npe = photons_per_m / (2.0 * np.pi * d_eff * sin_c) * om_area * quantum_efficiency * np.exp(-path / absorption_length)
+
+    if om_direction is not None and acceptance_power != 0.0:
+        # Photon direction at the OM: along the cone, pointing away from the track.
+        rho = radial / np.maximum(d, 1e-12)[:, None]
+        k = np.cos(theta_c_rad) * u[None, :] + sin_c * rho
+        cos_eta = -(k @ normalize(np.asarray(om_direction, dtype=float)))
+        npe *= (0.5 * (1.0 + cos_eta)) ** acceptance_power
+
+    if s_range is not None:
+        s_emit = l - d / np.tan(theta_c_rad)
+        npe = np.where((s_emit >= s_range[0]) & (s_emit <= s_range[1]), npe, 0.0)
+    return npe
+
+
+def frame_photoelectrons(npe: np.ndarray, arrival_times: np.ndarray, frame_times: np.ndarray) -> np.ndarray:
+    """Return the photo-electrons collected by each frame, shape ``(n_frames, n_oms)``.
+
+    An OM shows its ``npe`` once the direct light has arrived and NaN before that
+    (or when it gets no direct light).
+    """
+    arrived = np.asarray(frame_times, dtype=float)[:, None] >= np.asarray(arrival_times, dtype=float)[None, :]
+    return np.where(arrived & (np.asarray(npe)[None, :] > 0.0), np.asarray(npe, dtype=float)[None, :], np.nan)
@@ -0,0 +1,373 @@
+import argparse
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .cherenkov_activation import om_activation
+    from .cherenkov_batch import batch_curve_lengths, batch_history_arrays, frame_segments
+    from .cherenkov_config import _parse_bool, load_cfg, resolve_max_proj
+    from .cherenkov_detectors import make_detector
+    from .cherenkov_geometry import load_om_positions, normalize
+    from .cherenkov_history import save_history_npz
+    from .cherenkov_response import expected_photoelectrons, frank_tamm_yield
+    from .cherenkov_timing import apex_times, direct_arrival_times
+except ImportError:
+    from cherenkov_activation import om_activation
+    from cherenkov_batch import batch_curve_lengths, batch_history_arrays, frame_segments
+    from cherenkov_config import _parse_bool, load_cfg, resolve_max_proj
+    from cherenkov_detectors import make_detector
+    from cherenkov_geometry import load_om_positions, normalize
+    from cherenkov_history import save_history_npz
+    from cherenkov_response import expected_photoelectrons, frank_tamm_yield
+    from cherenkov_timing import apex_times, direct_arrival_times
+
+
+# Config sections that change the computed geometry; bump CACHE_VERSION when the job output changes.
+JOB_SECTIONS = ("detector", "optics", "track", "intersection", "response")
+CACHE_VERSION = 1
+METRICS = (
+    "theta_c_deg",
+    "n_points",
+    "ring_length_mean",
+    "ring_length_max",
+    "n_hit_oms",
+    "n_direct_oms",
+    "total_npe",
+    "compute_s",
+)
+
+
+def _cast_like(raw: str, current):
+    """Parse ``raw`` with the type of the current config value."""
+    if isinstance(current, np.ndarray):
+        parts = [token for token in raw.replace(",", " ").split() if token]
+        if len(parts) != len(current):
+            raise ValueError(f"expected {len(current)} components, got {raw!r}")
+        return np.asarray([float(p) for p in parts], dtype=float)
+    if isinstance(current, bool):
+        return _parse_bool(raw)
+    if isinstance(current, int):
+        return int(raw)
+    if isinstance(current, float):
+        return float(raw)
+    return raw.strip()
+
+
+def parse_grid(spec: str, cfg: dict) -> tuple[str, list]:
+    """Parse ``section.key=values`` into the key and its list of values.
+
+    Values are ``;``-separated (``track.u=1,0,0;0,1,0``), a ``start:stop:num`` range
+    for numbers, or ``,``-separated for scalars (``optics.n_refr=1.33,1.35``).
+    """
+    key, _, raw = spec.partition("=")
+    key = key.strip()
+    section, _, name = key.partition(".")
+    if section not in cfg or name not in cfg[section]:
+        raise ValueError(f"unknown config key {key!r} in grid {spec!r}")
+    current = cfg[section][name]
+
+    raw = raw.strip()
+    if ";" in raw:
+        tokens = [t for t in raw.split(";") if t.strip()]
+    elif raw.count(":") == 2 and not isinstance(current, (np.ndarray, str)):
+        start, stop, num = raw.split(":")
+        return key, [_cast_like(repr(float(v)), current) for v in np.linspace(float(start), float(stop), int(num))]
+    elif isinstance(current, np.ndarray):
+        tokens = [raw]
+    else:
+        tokens = [t for t in raw.split(",") if t.strip()]
+    if not tokens:
+        raise ValueError(f"no values in grid {spec!r}")
+    return key, [_cast_like(t, current) for t in tokens]
+
+
+def expand_jobs(grids: list[tuple[str, list]]) -> list[dict]:
+    """Return the Cartesian product of the grids as override dicts."""
+    keys = [key for key, _ in grids]
+    return [dict(zip(keys, values)) for values in itertools.product(*(values for _, values in grids))]
+
+
+def apply_overrides(cfg: dict, overrides: dict) -> dict:
+    """Return a copy of ``cfg`` with ``section.key`` overrides applied."""
+    out = copy.deepcopy(cfg)
+    for key, value in overrides.items():
+        section, _, name = key.partition(".")
+        out[section][name] = value
+    return out
+
+
+def _json_value(value):
+    """JSON form of config values (arrays become lists)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"not JSON serialisable: {type(value)}")
+
+
+def job_config(cfg: dict) -> dict:
+    """The part of a config that determines a job's output."""
+    return {
+        "version": CACHE_VERSION,
+        **{section: cfg[section] for section in JOB_SECTIONS},
+        "n_frames": cfg["run"]["n_frames"],
+        "history_stride": cfg["run"]["history_stride"],
+        "cone_height": cfg["visual"]["cone_height"],
+    }
+
+
+def job_hash(cfg: dict) -> str:
+    """Stable hash of the effective job config."""
+    text = json.dumps(job_config(cfg), sort_keys=True, default=_json_value)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def run_job(cfg: dict, job_dir: str | Path | None = None) -> dict:
+    """Compute intersections, OM activation and history for one config without rendering.
+
+    With ``job_dir`` the history is saved to ``history.npz`` there. Returns the
+    metrics listed in ``METRICS``.
+    """
+    t_start = time.perf_counter()
+    detector_cfg = cfg["detector"]
+    optics_cfg = cfg["optics"]
+    track_cfg = cfg["track"]
+    intersection_cfg = cfg["intersection"]
+    response_cfg = cfg["response"]
+    n_frames = max(1, int(cfg["run"]["n_frames"]))
+    history_stride = max(1, int(cfg["run"]["history_stride"]))
+
+    n_refr = optics_cfg["n_refr"]
+    beta = optics_cfg["beta"]
+    if beta * n_refr <= 1.0:
+        raise ValueError("Cherenkov angle is undefined: beta * n_refr must be > 1.")
+    theta_c = float(np.arccos(1.0 / (beta * n_refr)))
+
+    detector = make_detector(detector_cfg)
+    r0 = np.asarray(track_cfg["r0"], dtype=float)
+    u = normalize(np.asarray(track_cfg["u"], dtype=float))
+    s_values = np.linspace(track_cfg["s_start"], track_cfg["s_end"], n_frames)
+    apices = r0[None, :] + s_values[:, None] * u[None, :]
+    frame_enabled = detector.contains(apices) if intersection_cfg["apex_inside_only"] else None
+    points, segment_offsets, frame_offsets = detector.intersection_batch(
+        apices,
+        u,
+        theta_c,
+        n_samples=detector_cfg["cyl_sample_phi"],
+        nappe=intersection_cfg["nappe"],
+        min_points=intersection_cfg["min_points"],
+        eps=intersection_cfg["analytic_eps"],
+        max_proj=resolve_max_proj(intersection_cfg, cfg["visual"]["cone_height"]),
+        frame_mask=frame_enabled,
+    )
+
+    if detector_cfg["om_positions_path"]:
+        om_points = load_om_positions(detector_cfg["om_positions_path"])
+    else:
+        om_points = detector.make_oms(detector_cfg["n_strings"], detector_cfg["oms_per_string"])
+    s_range = (track_cfg["s_start"], track_cfg["s_end"])
+    om_arrival_times, _, _ = direct_arrival_times(
+        om_points, r0, u, theta_c, beta=beta, n_group=optics_cfg["n_group"], t0=track_cfg["t0"], s_range=s_range
+    )
+    om_npe = expected_photoelectrons(
+        om_points,
+        r0,
+        u,
+        theta_c,
+        frank_tamm_yield(n_refr, beta, response_cfg["wavelength_min_nm"], response_cfg["wavelength_max_nm"]),
+        absorption_length=response_cfg["absorption_length"],
+        om_area=response_cfg["om_area"],
+        quantum_efficiency=response_cfg["quantum_efficiency"],
+        om_direction=response_cfg["om_direction"],
+        acceptance_power=response_cfg["acceptance_power"],
+        s_range=s_range,
+    )
+
+    hit = np.zeros(len(om_points), dtype=bool)
+    for pos in range(n_frames):
+        pts, seg = frame_segments(points, segment_offsets, frame_offsets, pos)
+        active, _ = om_activation(
+            om_points,
+            pts,
+            seg,
+            intersection_cfg["activation_distance"],
+            apex=apices[pos],
+            axis=u,
+            theta_c_rad=theta_c,
+        )
+        hit |= active
+
+    if job_dir is not None:
+        positions = np.arange(n_frames)
+        positions = positions[(positions % history_stride == 0) | (positions == n_frames - 1)]
+        frame_numbers = (positions + 1).astype(np.int32)
+        h_points, h_frames, h_segments = batch_history_arrays(
+            points, segment_offsets, frame_offsets, frame_positions=positions, frame_numbers=frame_numbers
+        )
+        save_history_npz(
+            npz_path=Path(job_dir) / "history.npz",
+            apex_points=apices[positions],
+            apex_frames=frame_numbers,
+            intersection_points=h_points,
+            intersection_frames=h_frames,
+            intersection_segments=h_segments,
+            r0=r0,
+            u=u,
+            theta_c_rad=theta_c,
+            radius=detector_cfg["cluster_radius"],
+            z_min=detector_cfg["z_min"],
+            z_max=detector_cfg["z_max"],
+            apex_times=apex_times(s_values[positions], beta=beta, t0=track_cfg["t0"]),
+            om_points=om_points,
+            om_arrival_times=om_arrival_times,
+            detector=detector.to_dict(),
+            om_npe=om_npe,
+        )
+
+    ring_lengths = batch_curve_lengths(points, segment_offsets, frame_offsets)
+    return {
+        "theta_c_deg": float(np.degrees(theta_c)),
+        "n_points": int(len(points)),
+        "ring_length_mean": float(ring_lengths.mean()),
+        "ring_length_max": float(ring_lengths.max()),
+        "n_hit_oms": int(hit.sum()),
+        "n_direct_oms": int(np.isfinite(om_arrival_times).sum()),
+        "total_npe": float(om_npe.sum()),
+        "compute_s": time.perf_counter() - t_start,
+    }
+
+
+def _sweep_job(task: dict) -> dict:
+    """Run one sweep job, or return its cached metrics."""
+    job_dir = Path(task["job_dir"])
+    metrics_path = job_dir / "metrics.json"
+    if metrics_path.exists() and not task["force"]:
+        return dict(json.loads(metrics_path.read_text()), cached=True)
+
+    job_dir.mkdir(parents=True, exist_ok=True)
+    (job_dir / "config.json").write_text(json.dumps(job_config(task["cfg"]), indent=2, default=_json_value))
+    try:
+        metrics = run_job(task["cfg"], job_dir if task["save_history"] else None)
+    except ValueError as exc:
+        return {"error": str(exc), "cached": False}
+    # metrics.json marks a finished job, so it is written last and atomically.
+    tmp = job_dir / "metrics.json.tmp"
+    tmp.write_text(json.dumps(metrics, indent=2))
+    os.replace(tmp, metrics_path)
+    return dict(metrics, cached=False)
+
+
+def _format_value(value) -> str:
+    """Summary-table form of a parameter value."""
+    if isinstance(value, np.ndarray):
+        return " ".join(f"{v:g}" for v in value)
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def run_sweep(
+    grids: list[str],
+    cfg_path: str | Path | None = None,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    n_frames: int | None = None,
+    force: bool = False,
+    show_progress: bool | None = None,
+) -> Path:
+    """Run every combination of the ``section.key=values`` grids and write ``summary.csv``.
+
+    Each job lives in ``<output_dir>/<hash>/`` (``config.json``, ``history.npz``,
+    ``metrics.json``) keyed by a hash of its effective config, so repeated sweeps
+    only compute new points unless ``force``.
+    """
+    cfg = load_cfg(cfg_path)
+    sweep_cfg = cfg["sweep"]
+    if n_frames is not None:
+        cfg["run"]["n_frames"] = n_frames
+    elif sweep_cfg["n_frames"] > 0:
+        cfg["run"]["n_frames"] = sweep_cfg["n_frames"]
+    out_dir = Path(sweep_cfg["output_dir"] if output_dir is None else output_dir)
+    workers = int(sweep_cfg["workers"] if workers is None else workers)
+    show_progress = cfg["run"]["show_progress"] if show_progress is None else show_progress
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    parsed = [parse_grid(spec, cfg) for spec in grids]
+    jobs = expand_jobs(parsed)
+    tasks = []
+    for overrides in jobs:
+        job_cfg = apply_overrides(cfg, overrides)
+        tasks.append(
+            {
+                "cfg": job_cfg,
+                "job_dir": str(out_dir / job_hash(job_cfg)),
+                "save_history": sweep_cfg["save_history"],
+                "force": force,
+            }
+        )
+
+    t_start = time.perf_counter()
+    if workers == 1:
+        results = map(_sweep_job, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_sweep_job, tasks)
+    rows = []
+    try:
+        for done, (overrides, task, metrics) in enumerate(zip(jobs, tasks, results), start=1):
+            row = {"job": Path(task["job_dir"]).name}
+            row.update({key: _format_value(value) for key, value in overrides.items()})
+            row.update({name: _format_value(metrics.get(name, "")) for name in METRICS})
+            row["cached"] = int(metrics["cached"])
+            row["error"] = metrics.get("error", "")
+            rows.append(row)
+            if show_progress:
+                state = "cached" if metrics["cached"] else ("error" if row["error"] else "done")
+                print(f"[sweep] job {done}/{len(tasks)} {row['job']} {state}", flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = out_dir / "summary.csv"
+    fields = ["job", *(key for key, _ in parsed), *METRICS, "cached", "error"]
+    with summary_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    if show_progress:
+        n_cached = sum(row["cached"] for row in rows)
+        print(
+            f"[sweep] wrote {summary_path} ({len(rows)} jobs, {n_cached} cached, "
+            f"{time.perf_counter() - t_start:.2f}s, workers={workers})",
+            flush=True,
+        )
+    return summary_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a headless parameter sweep of the Cherenkov prototype.")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        help="section.key=values; values are 'a;b;c', 'start:stop:num' or 'a,b,c' for scalars (repeatable)",
+    )
+    parser.add_argument("--cfg", default=None, help="path to run.cfg (default: next to this script)")
+    parser.add_argument("--out", default=None, help="output directory (default: sweep.output_dir)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (0 -> one per CPU core)")
+    parser.add_argument("--n-frames", type=int, default=None, help="override run.n_frames for every job")
+    parser.add_argument("--force", action="store_true", help="recompute cached jobs")
+    args = parser.parse_args()
+    run_sweep(args.grid, cfg_path=args.cfg, output_dir=args.out, workers=args.workers, n_frames=args.n_frames, force=args.force)
@@ -0,0 +1,60 @@
+import numpy as np
+
+try:
+    from .cherenkov_geometry import normalize
+except ImportError:
+    from cherenkov_geometry import normalize
+
+
+SPEED_OF_LIGHT_M_PER_NS = 0.299792458
+
+
+def direct_arrival_times(
+    om_points: np.ndarray,
+    r0: np.ndarray,
+    u: np.ndarray,
+    theta_c_rad: float,
+    beta: float = 1.0,
+    n_group: float | None = None,
+    t0: float = 0.0,
+    s_range: tuple[float, float] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return direct Cherenkov photon arrival times at every OM.
+
+    With ``l`` the track parameter of the point of closest approach and ``d`` the
+    perpendicular distance, light is emitted at ``s_e = l - d / tan(theta_c)`` and
+    travels ``d / sin(theta_c)`` at the group velocity ``c / n_group``:
+
+    ``t = t0 + s_e / (beta c) + n_group d / (c sin(theta_c))``
+
+    which reduces to ``t0 + (l + d tan(theta_c)) / c`` for ``beta = 1`` and
+    ``n_group = n``. Returns ``(times, s_e, d)``; times are NaN when ``s_e`` falls
+    outside ``s_range``. Units are ns for lengths in metres.
+    """
+    u = normalize(np.asarray(u, dtype=float))
+    if n_group is None:
+        n_group = 1.0 / (beta * np.cos(theta_c_rad))
+
+    d_vec = np.asarray(om_points, dtype=float) - np.asarray(r0, dtype=float)[None, :]
+    l = d_vec @ u
+    d = np.sqrt(np.maximum(np.sum(d_vec * d_vec, axis=1) - l * l, 0.0))
+    s_emit = l - d / np.tan(theta_c_rad)
+
+    times = t0 + s_emit / (beta * SPEED_OF_LIGHT_M_PER_NS) + n_group * d / (SPEED_OF_LIGHT_M_PER_NS * np.sin(theta_c_rad))
+    if s_range is not None:
+        times = np.where((s_emit >= s_range[0]) & (s_emit <= s_range[1]), times, np.nan)
+    return times, s_emit, d
+
+
+def apex_times(s_values: np.ndarray, beta: float = 1.0, t0: float = 0.0) -> np.ndarray:
+    """Return the time at which the muon reaches each track parameter ``s``."""
+    return t0 + np.asarray(s_values, dtype=float) / (beta * SPEED_OF_LIGHT_M_PER_NS)
+
+
+def time_residuals(arrival_times: np.ndarray, frame_times: np.ndarray) -> np.ndarray:
+    """Return ``frame_time - arrival_time`` for all frames and OMs, shape ``(n_frames, n_oms)``.
+
+    Negative values mean the light has not arrived yet, zero means it arrives in
+    this frame, NaN marks OMs without direct light.
+    """
+    return np.asarray(frame_times, dtype=float)[:, None] - np.asarray(arrival_times, dtype=float)[None, :]
@@ -1,28 +1,24 @@
+import argparse
+import json
+from pathlib import Path
+
 import numpy as np
 import pyvista as pv
 
 try:
-    from .cherenkov_geometry import (
-        build_unwrapped_multiline_polydata,
-        make_unwrapped_outline,
-        make_unwrapped_string_guides,
-        nearest_distance_to_polylines,
-        normalize,
-        segmented_points_to_polylines,
-        unwrap_cylinder_points,
-    )
-    from .cherenkov_history import build_multiline_polydata
+    from .cherenkov_config import load_cfg
+    from .cherenkov_detectors import CylinderDetector, DetectorGeometry, make_detector
+    from .cherenkov_frame_cache import FrameCache, HistoryFrameGeometry, viewer_cache_path
+    from .cherenkov_geometry import make_track_points, normalize
+    from .cherenkov_polydata import lines_polydata
+    from .cherenkov_response import frame_photoelectrons
 except ImportError:
-    from cherenkov_geometry import (
-        build_unwrapped_multiline_polydata,
-        make_unwrapped_outline,
-        make_unwrapped_string_guides,
-        nearest_distance_to_polylines,
-        normalize,
-        segmented_points_to_polylines,
-        unwrap_cylinder_points,
-    )
-    from cherenkov_history import build_multiline_polydata
+    from cherenkov_config import load_cfg
+    from cherenkov_detectors import CylinderDetector, DetectorGeometry, make_detector
+    from cherenkov_frame_cache import FrameCache, HistoryFrameGeometry, viewer_cache_path
+    from cherenkov_geometry import make_track_points, normalize
+    from cherenkov_polydata import lines_polydata
+    from cherenkov_response import frame_photoelectrons
 
 
 def apply_camera(
@@ -43,12 +39,21 @@ def apply_camera(
 
 
 
-def apply_unwrapped_camera(pl: pv.Plotter, radius: float, z_min: float, z_max: float) -> None:
-    """Set a camera that looks straight onto the unwrap plane."""
-    s_max = 2.0 * np.pi * radius
-    center_s = 0.5 * s_max
+def npe_color_limits(om_npe: np.ndarray, visual_cfg: dict) -> list[float]:
+    """Return the log colour range for ``om_color_mode = npe``."""
+    npe_min = max(float(visual_cfg["npe_min"]), 1e-6)
+    npe_max = float(visual_cfg["npe_max"])
+    if npe_max <= 0.0:
+        npe_max = float(np.max(om_npe)) if len(om_npe) else 1.0
+    return [npe_min, max(npe_max, 10.0 * npe_min)]
+
+
+def apply_unwrapped_camera(pl: pv.Plotter, bounds: tuple[float, float, float, float]) -> None:
+    """Set a camera that looks straight onto the unwrap plane ``(s_min, s_max, t_min, t_max)``."""
+    s_min, s_max, z_min, z_max = bounds
+    center_s = 0.5 * (s_min + s_max)
     center_z = 0.5 * (z_min + z_max)
-    distance = max(s_max, z_max - z_min, 1.0)
+    distance = max(s_max - s_min, z_max - z_min, 1.0)
     pl.camera_position = [
         (center_s, center_z, 2.5 * distance),
         (center_s, center_z, 0.0),
@@ -73,8 +78,38 @@ def show_history_viewer(
     theta_c_rad: float,
     visual_cfg: dict,
     intersection_cfg: dict,
+    apex_times: np.ndarray | None = None,
+    om_arrival_times: np.ndarray | None = None,
+    detector: DetectorGeometry | dict | None = None,
+    om_npe: np.ndarray | None = None,
+    halo_points: np.ndarray | None = None,
+    halo_times: np.ndarray | None = None,
+    halo_window: float = 10.0,
+    cache_path: str | Path | None = None,
 ) -> None:
-    """Open an interactive history viewer with frame controls."""
+    """Open an interactive history viewer with frame controls.
+
+    ``detector`` (a ``DetectorGeometry`` or its ``to_dict()``) selects the surface and
+    unwrap; without it the cylinder ``cluster_radius``, ``z_min``, ``z_max`` is used.
+
+    With ``apex_times`` and ``om_arrival_times`` and ``om_color_mode = time_residual``
+    the OMs are coloured by frame time minus direct-light arrival time; with
+    ``om_npe`` and ``om_color_mode = npe`` they show the expected photo-electrons
+    once the direct light has arrived, in both views. ``halo_points``/``halo_times``
+    (photon Monte Carlo crossings of the detector surface) overlay the photons that
+    crossed in the last ``halo_window`` ns before each frame next to the analytic
+    ring. The history
+    is indexed by frame once, and the geometry of the last ``viewer_cache_frames``
+    visited frames is kept so scrubbing back and forth does not rebuild it; a
+    background thread builds the ``viewer_prefetch_frames`` neighbours of the
+    current frame ahead of time. With a matching sidecar file at ``cache_path``
+    (``build_frame_cache``) every frame is read from it instead.
+    """
+    if detector is None:
+        detector = CylinderDetector(cluster_radius, z_min, z_max)
+    elif isinstance(detector, dict):
+        detector = make_detector(detector)
+
     old_allow_empty = pv.global_theme.allow_empty_mesh
     pv.global_theme.allow_empty_mesh = True
     show_unwrapped = visual_cfg["show_unwrapped_view"]
@@ -95,16 +130,8 @@ def show_history_viewer(
             pl.subplot(0, 1)
 
     use_3d()
-    cylinder = pv.Cylinder(
-        center=(0.0, 0.0, 0.5 * (z_min + z_max)),
-        direction=(0.0, 0.0, 1.0),
-        radius=cluster_radius,
-        height=(z_max - z_min),
-        resolution=140,
-        capping=False,
-    )
     pl.add_mesh(
-        cylinder,
+        detector.surface_mesh(140),
         style="wireframe",
         line_width=visual_cfg["cylinder_line_width"],
         opacity=visual_cfg["cylinder_opacity"],
@@ -122,22 +149,22 @@ def show_history_viewer(
         pl.show_axes()
         if show_unwrapped:
             use_2d()
-            pl.add_mesh(make_unwrapped_outline(cluster_radius, z_min, z_max), color="black", line_width=2.0)
+            pl.add_mesh(detector.unwrapped_outline(), color="black", line_width=2.0)
             pl.add_mesh(
-                make_unwrapped_string_guides(om_points, cluster_radius, z_min, z_max),
+                detector.unwrapped_guides(om_points),
                 color="gray",
                 line_width=1.0,
                 opacity=0.18,
             )
             pl.add_mesh(
-                pv.PolyData(unwrap_cylinder_points(om_points, cluster_radius)),
+                pv.PolyData(detector.unwrap(om_points)),
                 color="midnightblue",
                 point_size=visual_cfg["unwrap_om_point_size"],
                 render_points_as_spheres=True,
                 opacity=0.45,
             )
-            pl.add_text("Cylinder unwrap (s = R*phi, z)", font_size=12, name="unwrap_title")
-            apply_unwrapped_camera(pl, cluster_radius, z_min, z_max)
+            pl.add_text(detector.unwrap_title, font_size=12, name="unwrap_title")
+            apply_unwrapped_camera(pl, detector.unwrap_bounds())
         try:
             pl.show()
         finally:
@@ -147,33 +174,75 @@ def show_history_viewer(
     if len(apex_points) >= 2:
         pl.add_mesh(pv.lines_from_points(apex_points, close=False), color="orange", line_width=2, opacity=0.25)
 
-    unique_frames = np.unique(np.asarray(apex_frames, dtype=np.int32))
-    if len(unique_frames) == 0:
-        unique_frames = np.array([0], dtype=np.int32)
-
-    inter_frames = np.asarray(intersection_frames, dtype=np.int32)
-    inter_segments = np.asarray(intersection_segments, dtype=np.int32)
-    inter_points = np.asarray(intersection_points, dtype=float)
-    apex_frames_arr = np.asarray(apex_frames, dtype=np.int32)
-    track_axis = normalize(np.asarray(track_axis, dtype=float))
-    om_points = np.asarray(om_points, dtype=float)
-    unwrap_om_points = unwrap_cylinder_points(om_points, cluster_radius)
+    frame_history = HistoryFrameGeometry(
+        apex_points,
+        apex_frames,
+        intersection_points,
+        intersection_frames,
+        intersection_segments,
+        om_points,
+        track_axis,
+        theta_c_rad,
+        activation_distance=intersection_cfg["activation_distance"],
+        min_points=max(2, int(intersection_cfg["min_points"])),
+        detector=detector,
+    )
+    frame_cache = FrameCache(
+        frame_history,
+        max_frames=visual_cfg["viewer_cache_frames"],
+        prefetch=visual_cfg["viewer_prefetch_frames"],
+        cache_path=cache_path,
+    )
+    unique_frames = frame_history.frames
+    apex_idx_by_pos = frame_history.apex_index
+    track_axis = frame_history.track_axis
+    om_points = frame_history.om_points
+    unwrap_om_points = detector.unwrap(om_points)
     cone_height = visual_cfg["cone_height"]
     cone_radius = cone_height * np.tan(theta_c_rad)
-    activation_distance = float(intersection_cfg["activation_distance"])
+
+    show_halo = halo_points is not None and halo_times is not None and apex_times is not None
+    if show_halo:
+        halo_order = np.argsort(np.asarray(halo_times, dtype=float), kind="stable")
+        halo_times = np.asarray(halo_times, dtype=float)[halo_order]
+        halo_points = np.asarray(halo_points, dtype=float).reshape(-1, 3)[halo_order]
+
+    def frame_geometry(pos: int) -> dict:
+        """Wrap the cached arrays of one slider position in datasets."""
+        arrays = frame_cache.get(pos)
+        inter_pts, _ = frame_history.frame_points(pos)
+        active_mask = np.zeros(len(om_points), dtype=bool)
+        active_mask[arrays["active_oms"]] = True
+        geometry = {
+            "lines": lines_polydata(arrays["line_points"], arrays["line_cells"]),
+            "points": pv.PolyData(inter_pts),
+            "active": active_mask,
+        }
+        if show_unwrapped:
+            geometry["unwrap_lines"] = lines_polydata(arrays["unwrap_line_points"], arrays["unwrap_line_cells"])
+            geometry["unwrap_points"] = pv.PolyData(detector.unwrap(inter_pts))
+            geometry["unwrap_active_oms"] = pv.PolyData(unwrap_om_points[arrays["active_oms"]])
+        if show_halo:
+            t_frame = float(apex_times[apex_idx_by_pos[pos]])
+            h0, h1 = np.searchsorted(halo_times, [t_frame - halo_window, t_frame], side="right")
+            geometry["halo"] = pv.PolyData(halo_points[h0:h1])
+            if show_unwrapped:
+                geometry["unwrap_halo"] = pv.PolyData(detector.unwrap(halo_points[h0:h1]))
+        return geometry
 
     first_frame = int(unique_frames[0])
-    first_apex_idx = int(np.argmin(np.abs(apex_frames_arr - first_frame)))
+    first_apex_idx = int(apex_idx_by_pos[0])
+    # Apex and cone are built once around the origin and moved with ``actor.position``.
     apex_actor = pl.add_mesh(
-        pv.PolyData(apex_points[[first_apex_idx]]),
+        pv.PolyData(np.zeros((1, 3))),
         color="orange",
         point_size=14,
         render_points_as_spheres=True,
     )
+    apex_actor.position = apex_points[first_apex_idx]
 
-    first_apex = apex_points[first_apex_idx]
     first_cone = pv.Cone(
-        center=first_apex - 0.5 * cone_height * track_axis,
+        center=-0.5 * cone_height * track_axis,
         direction=track_axis,
         height=cone_height,
         radius=cone_radius,
@@ -181,77 +250,159 @@ def show_history_viewer(
         capping=False,
     )
     cone_actor = pl.add_mesh(first_cone, color="deepskyblue", opacity=visual_cfg["cone_opacity"])
+    cone_actor.position = apex_points[first_apex_idx]
 
-    frame_mask = inter_frames == first_frame
-    first_inter_pts = inter_points[frame_mask]
-    first_inter_seg = inter_segments[frame_mask]
-    first_frame_polylines = segmented_points_to_polylines(
-        first_inter_pts,
-        first_inter_seg,
-        min_points=max(2, int(intersection_cfg["min_points"])),
-    )
+    first_geometry = frame_geometry(0)
     inter_line_actor = pl.add_mesh(
-        build_multiline_polydata(first_inter_pts, first_inter_seg),
+        first_geometry["lines"].copy(),
         color=intersection_cfg["curve_color"],
         line_width=intersection_cfg["curve_line_width"],
         render_lines_as_tubes=True,
         opacity=0.95,
     )
     inter_points_actor = pl.add_mesh(
-        pv.PolyData(first_inter_pts),
+        first_geometry["points"].copy(),
         color=intersection_cfg["curve_color"],
         point_size=max(2.0, intersection_cfg["curve_line_width"] * 2.0),
         render_points_as_spheres=True,
         opacity=0.45,
     )
+    halo_actor = None
+    if show_halo:
+        halo_actor = pl.add_mesh(
+            first_geometry["halo"].copy(),
+            color="magenta",
+            point_size=3.0,
+            render_points_as_spheres=True,
+            opacity=0.35,
+        )
+
+    first_active = first_geometry["active"]
+    show_residuals = (
+        visual_cfg["om_color_mode"] == "time_residual" and apex_times is not None and om_arrival_times is not None
+    )
+    show_npe = (
+        visual_cfg["om_color_mode"] == "npe"
+        and apex_times is not None
+        and om_arrival_times is not None
+        and om_npe is not None
+    )
+
+    def npe_at(apex_idx: int) -> np.ndarray:
+        """Photo-electrons of OMs whose direct light arrived by the apex time."""
+        return frame_photoelectrons(om_npe, om_arrival_times, apex_times[apex_idx : apex_idx + 1])[0]
+
+    oms_poly = pv.PolyData(om_points)
+    if show_npe:
+        apex_times = np.asarray(apex_times, dtype=float)
+        om_arrival_times = np.asarray(om_arrival_times, dtype=float)
+        om_npe = np.asarray(om_npe, dtype=float)
+        npe_clim = npe_color_limits(om_npe, visual_cfg)
+        oms_poly["npe"] = npe_at(first_apex_idx)
+        om_actor = pl.add_mesh(
+            oms_poly,
+            render_points_as_spheres=True,
+            point_size=visual_cfg["om_point_size"],
+            scalars="npe",
+            clim=npe_clim,
+            log_scale=True,
+            cmap="viridis",
+            nan_color="lightgray",
+            scalar_bar_args={"title": "expected p.e."},
+        )
+    elif show_residuals:
+        apex_times = np.asarray(apex_times, dtype=float)
+        om_arrival_times = np.asarray(om_arrival_times, dtype=float)
+        residual_window = float(visual_cfg["time_residual_window"])
+        oms_poly["time_residual"] = apex_times[first_apex_idx] - om_arrival_times
+        om_actor = pl.add_mesh(
+            oms_poly,
+            render_points_as_spheres=True,
+            point_size=visual_cfg["om_point_size"],
+            scalars="time_residual",
+            clim=[-residual_window, residual_window],
+            cmap="coolwarm",
+            nan_color="lightgray",
+            scalar_bar_args={"title": "t - t_direct [ns]"},
+        )
+    else:
+        oms_poly["active"] = first_active.astype(float)
+        om_actor = pl.add_mesh(
+            oms_poly,
+            render_points_as_spheres=True,
+            point_size=visual_cfg["om_point_size"],
+            scalars="active",
+            clim=[0.0, 1.0],
+            cmap="coolwarm",
+            show_scalar_bar=False,
+        )
 
     unwrap_line_actor = None
     unwrap_points_actor = None
     unwrap_active_oms_actor = None
+    unwrap_oms_actor = None
+    unwrap_halo_actor = None
     if show_unwrapped:
         use_2d()
-        pl.add_mesh(make_unwrapped_outline(cluster_radius, z_min, z_max), color="black", line_width=2.0)
+        pl.add_mesh(detector.unwrapped_outline(), color="black", line_width=2.0)
         pl.add_mesh(
-            make_unwrapped_string_guides(om_points, cluster_radius, z_min, z_max),
+            detector.unwrapped_guides(om_points),
             color="gray",
             line_width=1.0,
             opacity=0.18,
         )
-        pl.add_mesh(
-            pv.PolyData(unwrap_om_points),
-            color="midnightblue",
-            point_size=visual_cfg["unwrap_om_point_size"],
-            render_points_as_spheres=True,
-            opacity=0.45,
-        )
-        first_active = nearest_distance_to_polylines(om_points, first_frame_polylines) < activation_distance
+        if show_npe:
+            unwrap_oms_poly = pv.PolyData(unwrap_om_points)
+            unwrap_oms_poly["npe"] = oms_poly["npe"]
+            unwrap_oms_actor = pl.add_mesh(
+                unwrap_oms_poly,
+                scalars="npe",
+                clim=npe_clim,
+                log_scale=True,
+                cmap="viridis",
+                nan_color="lightgray",
+                show_scalar_bar=False,
+                point_size=visual_cfg["unwrap_om_point_size"],
+                render_points_as_spheres=True,
+            )
+        else:
+            pl.add_mesh(
+                pv.PolyData(unwrap_om_points),
+                color="midnightblue",
+                point_size=visual_cfg["unwrap_om_point_size"],
+                render_points_as_spheres=True,
+                opacity=0.45,
+            )
         unwrap_line_actor = pl.add_mesh(
-            build_unwrapped_multiline_polydata(
-                first_inter_pts,
-                first_inter_seg,
-                radius=cluster_radius,
-                min_points=max(2, int(intersection_cfg["min_points"])),
-            ),
+            first_geometry["unwrap_lines"].copy(),
             color=intersection_cfg["curve_color"],
             line_width=visual_cfg["unwrap_curve_line_width"],
             opacity=0.95,
         )
         unwrap_points_actor = pl.add_mesh(
-            pv.PolyData(unwrap_cylinder_points(first_inter_pts, cluster_radius)),
+            first_geometry["unwrap_points"].copy(),
             color=intersection_cfg["curve_color"],
             point_size=visual_cfg["unwrap_curve_point_size"],
             render_points_as_spheres=True,
             opacity=0.30,
         )
+        if show_halo:
+            unwrap_halo_actor = pl.add_mesh(
+                first_geometry["unwrap_halo"].copy(),
+                color="magenta",
+                point_size=visual_cfg["unwrap_curve_point_size"],
+                render_points_as_spheres=True,
+                opacity=0.35,
+            )
         unwrap_active_oms_actor = pl.add_mesh(
-            pv.PolyData(unwrap_om_points[first_active]),
+            first_geometry["unwrap_active_oms"].copy(),
             color="crimson",
             point_size=visual_cfg["unwrap_active_om_point_size"],
             render_points_as_spheres=True,
             opacity=0.95,
         )
-        pl.add_text("Cylinder unwrap (s = R*phi, z)", font_size=12, name="unwrap_title")
-        apply_unwrapped_camera(pl, cluster_radius, z_min, z_max)
+        pl.add_text(detector.unwrap_title, font_size=12, name="unwrap_title")
+        apply_unwrapped_camera(pl, detector.unwrap_bounds())
 
     state = {"frame_pos": 0}
 
@@ -261,46 +412,32 @@ def show_history_viewer(
         state["frame_pos"] = pos
         frame = int(unique_frames[pos])
 
-        apex_idx = int(np.argmin(np.abs(apex_frames_arr - frame)))
+        apex_idx = int(apex_idx_by_pos[pos])
         apex_current = apex_points[apex_idx]
-        apex_actor.mapper.dataset.copy_from(pv.PolyData(apex_points[[apex_idx]]))
-
-        cone_actor.mapper.dataset.copy_from(
-            pv.Cone(
-                center=apex_current - 0.5 * cone_height * track_axis,
-                direction=track_axis,
-                height=cone_height,
-                radius=cone_radius,
-                resolution=visual_cfg["cone_resolution"],
-                capping=False,
-            )
-        )
-
-        frame_mask = inter_frames == frame
-        inter_pts = inter_points[frame_mask]
-        inter_seg = inter_segments[frame_mask]
-        inter_line_actor.mapper.dataset.copy_from(build_multiline_polydata(inter_pts, inter_seg))
-        inter_points_actor.mapper.dataset.copy_from(pv.PolyData(inter_pts))
-        frame_polylines = segmented_points_to_polylines(
-            inter_pts,
-            inter_seg,
-            min_points=max(2, int(intersection_cfg["min_points"])),
-        )
+        apex_actor.position = apex_current
+        cone_actor.position = apex_current
+
+        geometry = frame_geometry(pos)
+        inter_line_actor.mapper.dataset.copy_from(geometry["lines"])
+        inter_points_actor.mapper.dataset.copy_from(geometry["points"])
+        if halo_actor is not None:
+            halo_actor.mapper.dataset.copy_from(geometry["halo"])
+        if show_npe:
+            frame_npe = npe_at(apex_idx)
+            om_actor.mapper.dataset["npe"] = frame_npe
+            if unwrap_oms_actor is not None:
+                unwrap_oms_actor.mapper.dataset["npe"] = frame_npe
+        elif show_residuals:
+            om_actor.mapper.dataset["time_residual"] = apex_times[apex_idx] - om_arrival_times
+        else:
+            om_actor.mapper.dataset["active"] = geometry["active"].astype(float)
 
         if show_unwrapped:
-            unwrap_line_actor.mapper.dataset.copy_from(
-                build_unwrapped_multiline_polydata(
-                    inter_pts,
-                    inter_seg,
-                    radius=cluster_radius,
-                    min_points=max(2, int(intersection_cfg["min_points"])),
-                )
-            )
-            unwrap_points_actor.mapper.dataset.copy_from(
-                pv.PolyData(unwrap_cylinder_points(inter_pts, cluster_radius))
-            )
-            active_mask = nearest_distance_to_polylines(om_points, frame_polylines) < activation_distance
-            unwrap_active_oms_actor.mapper.dataset.copy_from(pv.PolyData(unwrap_om_points[active_mask]))
+            unwrap_line_actor.mapper.dataset.copy_from(geometry["unwrap_lines"])
+            unwrap_points_actor.mapper.dataset.copy_from(geometry["unwrap_points"])
+            if unwrap_halo_actor is not None:
+                unwrap_halo_actor.mapper.dataset.copy_from(geometry["unwrap_halo"])
+            unwrap_active_oms_actor.mapper.dataset.copy_from(geometry["unwrap_active_oms"])
 
         use_3d()
         pl.add_text(
@@ -309,11 +446,14 @@ def show_history_viewer(
             name="history_label",
         )
         pl.render()
+        frame_cache.prefetch(pos)
 
     def _slider_cb(value: float) -> None:
         """Map slider values to the nearest stored frame index."""
         target = int(round(value))
-        pos = int(np.argmin(np.abs(unique_frames - target)))
+        pos = int(np.searchsorted(unique_frames, target))
+        if pos == len(unique_frames) or (pos > 0 and target - unique_frames[pos - 1] <= unique_frames[pos] - target):
+            pos -= 1
         _set_frame_by_pos(pos)
 
     def _prev_frame() -> None:
@@ -351,8 +491,61 @@ def show_history_viewer(
     )
     if show_unwrapped:
         use_2d()
-        apply_unwrapped_camera(pl, cluster_radius, z_min, z_max)
+        apply_unwrapped_camera(pl, detector.unwrap_bounds())
     try:
         pl.show()
     finally:
+        frame_cache.close()
         pv.global_theme.allow_empty_mesh = old_allow_empty
+
+
+def view_history_npz(npz_path: str | Path, cfg_path: str | Path | None = None) -> None:
+    """Reopen a history ``.npz`` in the history viewer with the visual settings of ``run.cfg``.
+
+    The sidecar ``viewer_cache_path(npz_path)`` is used when it matches the history.
+    """
+    cfg = load_cfg(cfg_path)
+    with np.load(npz_path) as data:
+        history = {name: data[name] for name in data.files}
+    if "detector_json" in history:
+        detector = make_detector(json.loads(str(history["detector_json"])))
+    else:
+        detector = CylinderDetector(history["cylinder_radius"], history["z_min"], history["z_max"])
+    if "om_points" in history:
+        om_points = history["om_points"]
+    else:
+        om_points = detector.make_oms(cfg["detector"]["n_strings"], cfg["detector"]["oms_per_string"])
+    track_cfg = cfg["track"]
+    u = normalize(np.asarray(history["track_u"], dtype=float))
+    show_history_viewer(
+        apex_points=history["apex_points"],
+        apex_frames=history["apex_frames"],
+        intersection_points=history["intersection_points"],
+        intersection_frames=history["intersection_frames"],
+        intersection_segments=history["intersection_segments"],
+        cluster_radius=float(history["cylinder_radius"]),
+        z_min=float(history["z_min"]),
+        z_max=float(history["z_max"]),
+        om_points=om_points,
+        track_pts=make_track_points(
+            history["track_r0"], u, track_cfg["draw_s_min"], track_cfg["draw_s_max"], track_cfg["draw_points"]
+        ),
+        track_axis=u,
+        theta_c_rad=float(history["theta_c_rad"]),
+        visual_cfg=cfg["visual"],
+        intersection_cfg=cfg["intersection"],
+        apex_times=history.get("apex_times"),
+        om_arrival_times=history.get("om_arrival_times"),
+        detector=detector,
+        om_npe=history.get("om_npe"),
+        cache_path=viewer_cache_path(npz_path),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open a saved Cherenkov history in the history viewer.")
+    parser.add_argument("npz", nargs="?", default=None, help="history .npz (default: run.history_npz_path)")
+    parser.add_argument("--cfg", default=None, help="path to run.cfg (default: next to this script)")
+    args = parser.parse_args()
+    npz = args.npz if args.npz is not None else load_cfg(args.cfg)["run"]["history_npz_path"]
+    view_history_npz(npz, cfg_path=args.cfg)
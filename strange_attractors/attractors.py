@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import configparser
+import hashlib
+import json
+import os
 from pathlib import Path
 
 import numpy as np
@@ -36,6 +39,10 @@ def load_cfg(path: str = "run.cfg") -> dict:
         "total_time": get("scene", "total_time", float, 45.0),
         "dt": get("scene", "dt", float, 0.006),
         "warmup_steps": get("scene", "warmup_steps", int, 2500),
+        "integrator": get("scene", "integrator", str, "rk4").lower(),
+        "rtol": get("scene", "rtol", float, 1e-6),
+        "atol": get("scene", "atol", float, 1e-9),
+        "arc_spacing": get("scene", "arc_spacing", float, 0.0),
         "points_per_sec": get("scene", "points_per_sec", int, 200),
         "tail_seconds": get("scene", "tail_seconds", float, 12.0),
         "target_radius": get("scene", "target_radius", float, 3.1),
@@ -62,6 +69,8 @@ def load_cfg(path: str = "run.cfg") -> dict:
         "equation_in_time": get("scene", "equation_in_time", float, 0.6),
         "equation_box_opacity": get("scene", "equation_box_opacity", float, 0.44),
         "equation_box_buff": get("scene", "equation_box_buff", float, 0.20),
+        "lod_tolerance_px": get("scene", "lod_tolerance_px", float, 0.5),
+        "lod_refresh_deg": get("scene", "lod_refresh_deg", float, 1.0),
         "curve_stroke_width": get("scene", "curve_stroke_width", float, 3.1),
         "curve_opacity": get("scene", "curve_opacity", float, 0.90),
         "head_radius": get("scene", "head_radius", float, 0.052),
@@ -70,6 +79,23 @@ def load_cfg(path: str = "run.cfg") -> dict:
         "end_wait": get("scene", "end_wait", float, 0.3),
     }
 
+    ensemble = {
+        "n_trajectories": get("ensemble", "n_trajectories", int, 400),
+        "spread": get("ensemble", "spread", float, 1e-3),
+        "seed": get("ensemble", "seed", int, 0),
+        "point_size": get("ensemble", "point_size", float, 4.0),
+        "point_opacity": get("ensemble", "point_opacity", float, 0.9),
+        "backdrop_stroke_width": get("ensemble", "backdrop_stroke_width", float, 1.0),
+        "backdrop_opacity": get("ensemble", "backdrop_opacity", float, 0.12),
+    }
+
+    cache = {
+        "enabled": get("cache", "enabled", int, 1) == 1,
+        "dir": get("cache", "dir", str, "trajectory_cache"),
+        "max_mb": get("cache", "max_mb", float, 512.0),
+        "dtype": get("cache", "dtype", str, "float64").lower(),
+    }
+
     colors = {
         "text_col": get("colors", "text_col", str, "#FFFFFF"),
         "subtitle_col": get("colors", "subtitle_col", str, "#C9D2DF"),
@@ -79,9 +105,11 @@ def load_cfg(path: str = "run.cfg") -> dict:
         "active_path_col": get("colors", "active_path_col", str, "#4D6BFF"),
         "head_col": get("colors", "head_col", str, "#FF4D4D"),
         "equation_col": get("colors", "equation_col", str, "#FFFFFF"),
+        "cloud_col": get("colors", "cloud_col", str, "#FFD166"),
+        "cloud_end_col": get("colors", "cloud_end_col", str, "#FF4D4D"),
     }
 
-    return {"manim": manim_params, "scene": scene, "colors": colors}
+    return {"manim": manim_params, "scene": scene, "ensemble": ensemble, "cache": cache, "colors": colors}
 
 
 def resolve_rate_func(name: str):
@@ -109,35 +137,37 @@ if CFG["manim"]["renderer"]:
 # ----------------------------
 # Attractor definitions
 # ----------------------------
+# Every right-hand side takes a state array of shape (3,) or (N, 3) and returns
+# the derivative with the same shape, so an ensemble advances in one NumPy call.
 def lorenz(state, sigma=10.0, rho=28.0, beta=8 / 3):
-    x, y, z = state
-    return np.array([sigma * (y - x), x * (rho - z) - y, x * y - beta * z], dtype=float)
+    x, y, z = state.T
+    return np.array([sigma * (y - x), x * (rho - z) - y, x * y - beta * z], dtype=float).T
 
 
 def rossler(state, a=0.2, b=0.2, c=5.7):
-    x, y, z = state
-    return np.array([-y - z, x + a * y, b + z * (x - c)], dtype=float)
+    x, y, z = state.T
+    return np.array([-y - z, x + a * y, b + z * (x - c)], dtype=float).T
 
 
 def aizawa(state, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
-    x, y, z = state
+    x, y, z = state.T
     dx = (z - b) * x - d * y
     dy = d * x + (z - b) * y
     dz = c + a * z - (z**3) / 3 - (x**2 + y**2) * (1 + e * z) + f * z * (x**3)
-    return np.array([dx, dy, dz], dtype=float)
+    return np.array([dx, dy, dz], dtype=float).T
 
 
 def thomas(state, b=0.208186):
-    x, y, z = state
-    return np.array([np.sin(y) - b * x, np.sin(z) - b * y, np.sin(x) - b * z], dtype=float)
+    x, y, z = state.T
+    return np.array([np.sin(y) - b * x, np.sin(z) - b * y, np.sin(x) - b * z], dtype=float).T
 
 
 def dadras(state, a=3.0, b=2.7, c=1.7, d=2.0, e=9.0):
-    x, y, z = state
+    x, y, z = state.T
     dx = y - a * x + b * y * z
     dy = c * y - x * z + z
     dz = d * x * y - e * z
-    return np.array([dx, dy, dz], dtype=float)
+    return np.array([dx, dy, dz], dtype=float).T
 
 
 ATTRACTORS = {
@@ -208,24 +238,404 @@ def rk4_step(f, x, dt, **params):
 
 
 def integrate(f, x0, dt, n_steps, warmup=2000, **params):
+    """Integrate one trajectory (``x0`` of shape (3,)) or an ensemble (``x0`` of shape (N, 3)).
+
+    Returns the samples after ``warmup`` steps with shape (n_steps, 3) or (n_steps, N, 3).
+    """
     x = np.array(x0, dtype=float)
     for _ in range(warmup):
         x = rk4_step(f, x, dt, **params)
-    pts = np.zeros((n_steps, 3), dtype=float)
+    pts = np.zeros((n_steps,) + x.shape, dtype=float)
     for i in range(n_steps):
         x = rk4_step(f, x, dt, **params)
         pts[i] = x
     return pts
 
 
+# ----------------------------
+# Adaptive integration (Dormand-Prince 5(4) with dense output)
+# ----------------------------
+DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+DP_E = np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+# Fourth-order continuous extension: y(t + th h) = y + h K^T (DP_P [th, th^2, th^3, th^4]).
+DP_P = np.array(
+    [
+        [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+        [0.0, 0.0, 0.0, 0.0],
+        [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+        [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+        [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+        [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+        [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+    ]
+)
+
+
+def dopri5_step(f, x, k1, h, **params):
+    """One Dormand-Prince step; returns the new state, the 7 stages and the error estimate."""
+    k = np.empty((7,) + x.shape, dtype=float)
+    k[0] = k1
+    for i in range(1, 6):
+        k[i] = f(x + h * np.tensordot(DP_A[i], k[:i], axes=1), **params)
+    x_new = x + h * np.tensordot(DP_B[:6], k[:6], axes=1)
+    k[6] = f(x_new, **params)
+    return x_new, k, h * np.tensordot(DP_E, k, axes=1)
+
+
+def dense_output(x, k, h, theta):
+    """States inside an accepted step at fractions ``theta`` (1-d array) of it."""
+    theta = np.asarray(theta, dtype=float)
+    powers = theta[None, :] ** np.arange(1, 5)[:, None]
+    return x + h * np.tensordot((DP_P @ powers).T, k, axes=1)
+
+
+def integrate_adaptive(
+    f,
+    x0,
+    n_samples,
+    sample_dt,
+    warmup_time=0.0,
+    arc_spacing=0.0,
+    rtol=1e-6,
+    atol=1e-9,
+    h0=None,
+    max_steps=10_000_000,
+    **params,
+):
+    """Adaptive Dormand-Prince 5(4) integration sampled through its dense output.
+
+    After ``warmup_time`` the trajectory is sampled every ``sample_dt`` of
+    attractor time, or with ``arc_spacing > 0`` every ``arc_spacing`` of arc
+    length (single trajectories only). The step size follows ``rtol``/``atol``
+    independently of the sampling. Returns ``(samples, stats)`` where ``stats``
+    counts accepted and rejected steps and right-hand side evaluations.
+    """
+    x = np.array(x0, dtype=float)
+    if arc_spacing > 0.0 and x.ndim != 1:
+        raise ValueError("arc-length sampling needs a single trajectory")
+    out = np.zeros((n_samples,) + x.shape, dtype=float)
+    stats = {"method": "dopri5", "accepted": 0, "rejected": 0, "rhs_evals": 1, "samples": n_samples}
+
+    t = 0.0
+    h = float(sample_dt if h0 is None else h0)
+    k1 = f(x, **params)
+    n = 0
+    next_t = warmup_time + sample_dt
+    arc = 0.0  # arc length since the last sample
+    just_rejected = False
+    while n < n_samples:
+        if stats["accepted"] + stats["rejected"] >= max_steps:
+            raise RuntimeError(f"dopri5: no convergence after {max_steps} steps")
+        x_new, k, err = dopri5_step(f, x, k1, h, **params)
+        stats["rhs_evals"] += 6
+        scale = atol + rtol * np.maximum(np.abs(x), np.abs(x_new))
+        # RMS over the components of each trajectory, worst trajectory of an ensemble.
+        err_norm = float(np.sqrt(np.mean((err / scale) ** 2, axis=-1)).max())
+        factor = 10.0 if err_norm == 0.0 else min(10.0, max(0.2, 0.9 * err_norm**-0.2))
+        if err_norm > 1.0:
+            stats["rejected"] += 1
+            just_rejected = True
+            h *= min(1.0, factor)
+            if t + h == t:
+                raise RuntimeError(f"dopri5: step size underflow at t={t:.6g}")
+            continue
+
+        stats["accepted"] += 1
+        if arc_spacing > 0.0 and t + h > warmup_time:
+            theta = np.linspace(max(0.0, (warmup_time - t) / h), 1.0, 17)
+            sub = dense_output(x, k, h, theta)
+            cum = arc + np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(sub, axis=0), axis=1))])
+            targets = arc_spacing * np.arange(1, int(cum[-1] // arc_spacing) + 1)[: n_samples - n]
+            if len(targets):
+                out[n : n + len(targets)] = dense_output(x, k, h, np.interp(targets, cum, theta))
+                n += len(targets)
+            arc = cum[-1] - arc_spacing * len(targets)
+        elif arc_spacing <= 0.0 and t + h >= next_t:
+            times = next_t + sample_dt * np.arange(min(int((t + h - next_t) // sample_dt) + 1, n_samples - n))
+            out[n : n + len(times)] = dense_output(x, k, h, (times - t) / h)
+            n += len(times)
+            next_t = warmup_time + (n + 1) * sample_dt
+        t += h
+        x, k1 = x_new, k[6]
+        h *= min(1.0, factor) if just_rejected else factor
+        just_rejected = False
+    return out, stats
+
+
+def integrate_for_scene(f, x0, scene, n_steps, warmup, arc_spacing=0.0, **params):
+    """Integrate with the ``[scene] integrator``; returns ``(samples, stats)``.
+
+    ``rk4`` takes fixed ``dt`` steps and keeps every one. ``dopri5`` samples the
+    same times (every ``dt`` after ``warmup * dt``) or, with ``arc_spacing > 0``,
+    equal arc-length steps, while choosing its own step size.
+    """
+    if scene["integrator"] == "dopri5":
+        return integrate_adaptive(
+            f,
+            x0,
+            n_steps,
+            scene["dt"],
+            warmup_time=warmup * scene["dt"],
+            arc_spacing=arc_spacing,
+            rtol=scene["rtol"],
+            atol=scene["atol"],
+            **params,
+        )
+    if scene["integrator"] != "rk4":
+        raise ValueError(f"Unknown integrator: {scene['integrator']}")
+    steps = warmup + n_steps
+    stats = {"method": "rk4", "accepted": steps, "rejected": 0, "rhs_evals": 4 * steps, "samples": n_steps}
+    return integrate(f, x0, dt=scene["dt"], n_steps=n_steps, warmup=warmup, **params), stats
+
+
+def log_integration(attractor_name, stats):
+    logger.info(
+        f"{attractor_name}: {stats['method']} {stats['accepted']} steps "
+        f"({stats['rejected']} rejected), {stats['rhs_evals']} RHS evaluations, {stats['samples']} samples"
+    )
+
+
+# ----------------------------
+# Trajectory cache
+# ----------------------------
+# Bump when integration results change so old cache files are not reused.
+TRAJECTORY_CACHE_VERSION = 1
+
+
+class TrajectoryCache:
+    """Content-addressed ``.npy`` store for integrated trajectories.
+
+    Files are named by the hash of everything the numerics depend on and are
+    opened memory-mapped. When the directory grows past ``max_mb`` the least
+    recently used files are removed (hits refresh a file's mtime).
+    """
+
+    def __init__(self, directory, max_mb=512.0, dtype="float64"):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 2**20)
+        self.dtype = np.dtype(dtype)
+
+    def key(self, attractor_name, params, x0, scene, n_steps, warmup, arc_spacing=0.0):
+        spec = {
+            "version": TRAJECTORY_CACHE_VERSION,
+            "attractor": attractor_name,
+            "params": {k: float(v) for k, v in sorted(params.items())},
+            "dt": scene["dt"],
+            "n_steps": int(n_steps),
+            "warmup": int(warmup),
+            "integrator": scene["integrator"],
+            "dtype": self.dtype.name,
+        }
+        if scene["integrator"] == "dopri5":
+            spec.update(rtol=scene["rtol"], atol=scene["atol"], arc_spacing=float(arc_spacing))
+        h = hashlib.sha1(json.dumps(spec, sort_keys=True).encode())
+        x0 = np.ascontiguousarray(x0, dtype=float)
+        h.update(str(x0.shape).encode())
+        h.update(x0.tobytes())
+        return h.hexdigest()
+
+    def path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            pts = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return pts
+
+    def save(self, key, pts):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as fh:
+            np.save(fh, np.asarray(pts, dtype=self.dtype))
+        os.replace(tmp, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        files = sorted(self.directory.glob("*.npy"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+def make_trajectory_cache(cache_cfg):
+    if not cache_cfg["enabled"]:
+        return None
+    directory = Path(cache_cfg["dir"])
+    if not directory.is_absolute():
+        directory = Path(__file__).with_name(cache_cfg["dir"])
+    return TrajectoryCache(directory, max_mb=cache_cfg["max_mb"], dtype=cache_cfg["dtype"])
+
+
+def cached_integrate(attractor_name, f, x0, scene, n_steps, warmup, arc_spacing=0.0, cache=None, **params):
+    """``integrate_for_scene`` behind ``cache``: a hit skips the numerics entirely."""
+    if cache is None:
+        pts, stats = integrate_for_scene(f, x0, scene, n_steps, warmup, arc_spacing=arc_spacing, **params)
+        log_integration(attractor_name, stats)
+        return pts
+    key = cache.key(attractor_name, params, x0, scene, n_steps, warmup, arc_spacing)
+    pts = cache.load(key)
+    if pts is not None:
+        logger.info(f"{attractor_name}: trajectory cache hit {cache.path(key).name}")
+        return pts
+    pts, stats = integrate_for_scene(f, x0, scene, n_steps, warmup, arc_spacing=arc_spacing, **params)
+    log_integration(attractor_name, stats)
+    pts = pts.astype(cache.dtype, copy=False)
+    cache.save(key, pts)
+    return pts
+
+
+def perturbed_cloud(x0, n, spread, seed=0):
+    """``n`` initial conditions drawn uniformly from a ball of radius ``spread`` around ``x0``."""
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(n, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    radii = spread * rng.random(n) ** (1.0 / 3.0)
+    return np.asarray(x0, dtype=float) + radii[:, None] * directions
+
+
 def normalize_points(pts, target_radius=3.2):
-    r = np.linalg.norm(pts, axis=1)
+    """Scale points so the 95th percentile of their radius is ``target_radius``; any leading shape works."""
+    pts = np.asarray(pts, dtype=float)
+    r = np.linalg.norm(pts, axis=-1)
     s = np.percentile(r, 95)
     if s <= 1e-9:
         s = 1.0
     return pts / s * target_radius
 
 
+# ----------------------------
+# Trail
+# ----------------------------
+def trail_beziers(pts):
+    """Cubic Bezier control points ``[a0, h1, h2, a1]`` per segment, flattened to (4 * (n - 1), 3).
+
+    Handles are Catmull-Rom (tangent at a sample from its two neighbours), so
+    they only depend on nearby samples and any run of segments is a smooth curve.
+    """
+    pts = np.asarray(pts, dtype=float)
+    prev_pts = np.vstack([pts[:1], pts[:-1]])
+    next_pts = np.vstack([pts[1:], pts[-1:]])
+    tangents = (next_pts - prev_pts) / 6.0
+    handles1 = pts[:-1] + tangents[:-1]
+    handles2 = pts[1:] - tangents[1:]
+    return np.stack([pts[:-1], handles1, handles2, pts[1:]], axis=1).reshape(-1, 3)
+
+
+def douglas_peucker(points, tolerance):
+    """Mask of the points kept by Douglas-Peucker simplification of a polyline.
+
+    Every dropped point lies within ``tolerance`` of the segment between the
+    kept points around it. Works in any dimension; the trail uses screen pixels.
+    """
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    if len(points) == 0:
+        return keep
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        i0, i1 = stack.pop()
+        if i1 - i0 < 2:
+            continue
+        a = points[i0]
+        ab = points[i1] - a
+        rel = points[i0 + 1 : i1] - a
+        length2 = float(ab @ ab)
+        t = np.clip(rel @ ab / length2, 0.0, 1.0) if length2 > 0.0 else np.zeros(len(rel))
+        dist = np.linalg.norm(rel - t[:, None] * ab, axis=1)
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            mid = i0 + 1 + k
+            keep[mid] = True
+            stack.append((i0, mid))
+            stack.append((mid, i1))
+    return keep
+
+
+class TrailMobject(VMobject):
+    """Tail of a precomputed trajectory, ending at the current sample.
+
+    Anchors and handles of the whole trajectory are computed once, and
+    ``set_head(i)`` passes the segments of the last ``tail_pts`` samples to
+    ``set_points`` as a slice of that array. ``set_points`` copies them, so a
+    frame costs one copy of the tail but no Bezier fitting; colours are set once
+    on the mobject.
+
+    ``set_lod(indices)`` restricts the tail to a subset of samples (plus its two
+    ends) and replaces the precomputed path with the segments between those
+    samples, computed once per call. A frame then refits only the two segments
+    at each end of the tail, where the ends meet the subset.
+    """
+
+    def __init__(self, pts, tail_pts, **kwargs):
+        super().__init__(**kwargs)
+        pts = np.asarray(pts, dtype=float)
+        self.tail_pts = int(tail_pts)
+        self.n_samples = len(pts)
+        self.beziers = trail_beziers(pts)
+        self.beziers.flags.writeable = False
+        # Shown before the first segment exists, like the old single-point case.
+        self.stub = trail_beziers(np.vstack([pts[:1], pts[:1] + np.array([1e-4, 0.0, 0.0])]))
+        self.stub.flags.writeable = False
+        self.pts = pts
+        self.lod_indices = None
+        self.lod_beziers = None
+        self.head_index = -1
+        self.set_head(0)
+
+    def set_lod(self, indices):
+        """Draw only the samples at sorted ``indices``; ``None`` draws every sample."""
+        if indices is None:
+            self.lod_indices = self.lod_beziers = None
+        else:
+            self.lod_indices = np.asarray(indices, dtype=np.int64)
+            self.lod_beziers = trail_beziers(self.pts[self.lod_indices]) if len(self.lod_indices) > 1 else None
+        self.head_index = -1
+        return self
+
+    def set_head(self, i):
+        i = min(max(int(i), 0), self.n_samples - 1)
+        if i == self.head_index:
+            return self
+        self.head_index = i
+        i0 = max(0, i - self.tail_pts)
+        if i == i0:
+            self.set_points(self.stub)
+        elif self.lod_indices is None:
+            self.set_points(self.beziers[4 * i0 : 4 * i])
+        else:
+            lod = self.lod_indices
+            j0, j1 = np.searchsorted(lod, [i0 + 1, i])
+            if j1 - j0 < 3:
+                self.set_points(trail_beziers(self.pts[np.concatenate([[i0], lod[j0:j1], [i]])]))
+            else:
+                # Inner segments only depend on LOD samples; the two at each end also
+                # see i0 or i through the Catmull-Rom tangents.
+                head = trail_beziers(self.pts[[i0, lod[j0], lod[j0 + 1], lod[j0 + 2]]])[:8]
+                tail = trail_beziers(self.pts[[lod[j1 - 3], lod[j1 - 2], lod[j1 - 1], i]])[-8:]
+                self.set_points(np.concatenate([head, self.lod_beziers[4 * (j0 + 1) : 4 * (j1 - 2)], tail]))
+        return self
+
+
 # ----------------------------
 # Scene engine
 # ----------------------------
@@ -239,33 +649,21 @@ class StrangeAttractor3D(ThreeDScene):
     name = None
     T_TOTAL = None
 
-    def construct(self):
-        scene = CFG["scene"]
-        colors = CFG["colors"]
-
-        self.camera.background_color = CFG["manim"]["background_color"]
-        Text.set_default(font=scene["text_font"], color=colors["text_col"])
-
+    def resolve_attractor(self, scene):
         attractor_name = (self.name or scene["default_attractor"]).lower()
         if attractor_name not in ATTRACTORS:
             raise ValueError(f"Unknown attractor: {attractor_name}")
-
         total_time = float(scene["total_time"] if self.T_TOTAL is None else self.T_TOTAL)
-        f, params, x0 = ATTRACTORS[attractor_name]
+        return attractor_name, total_time
 
-        n_steps = max(2, int(scene["points_per_sec"] * total_time))
-        pts = integrate(
-            f,
-            x0,
-            dt=scene["dt"],
-            n_steps=n_steps,
-            warmup=scene["warmup_steps"],
-            **params,
-        )
+    def to_scene_points(self, pts, scene):
         pts = normalize_points(pts, target_radius=scene["target_radius"])
         pts *= scene["scene_scale"]
         pts += np.array([0.0, scene["center_shift_y"], 0.0])
+        return pts
 
+    def add_stage(self, attractor_name, scene, colors):
+        """Axes, camera, title and equation panel shared by every variant."""
         axes = ThreeDAxes(
             x_range=[scene["axis_min"], scene["axis_max"], scene["axis_step"]],
             y_range=[scene["axis_min"], scene["axis_max"], scene["axis_step"]],
@@ -311,34 +709,132 @@ class StrangeAttractor3D(ThreeDScene):
                 self.add_fixed_in_frame_mobjects(equation_panel)
                 self.play(FadeIn(equation_panel, shift=0.15 * UP), run_time=scene["equation_in_time"])
 
+    def construct(self):
+        scene = CFG["scene"]
+        colors = CFG["colors"]
+
+        self.camera.background_color = CFG["manim"]["background_color"]
+        Text.set_default(font=scene["text_font"], color=colors["text_col"])
+
+        attractor_name, total_time = self.resolve_attractor(scene)
+        f, params, x0 = ATTRACTORS[attractor_name]
+
+        n_steps = max(2, int(scene["points_per_sec"] * total_time))
+        pts = cached_integrate(
+            attractor_name,
+            f,
+            x0,
+            scene,
+            n_steps=n_steps,
+            warmup=scene["warmup_steps"],
+            arc_spacing=scene["arc_spacing"],
+            cache=make_trajectory_cache(CFG["cache"]),
+            **params,
+        )
+        pts = self.to_scene_points(pts, scene)
+        self.add_stage(attractor_name, scene, colors)
+
         progress = ValueTracker(0.0)
         tail_pts = max(6, int(scene["points_per_sec"] * scene["tail_seconds"]))
 
-        def make_curve():
-            i = int(progress.get_value() * (len(pts) - 1))
-            i0 = max(0, i - tail_pts)
-            seg = pts[i0 : i + 1]
-            if len(seg) < 2:
-                seg = np.vstack([seg, seg + np.array([1e-4, 0.0, 0.0])])
-
-            curve = VMobject()
-            curve.set_points_smoothly(seg)
-            curve.set_stroke(
-                width=scene["curve_stroke_width"],
-                opacity=scene["curve_opacity"],
+        curve = TrailMobject(pts, tail_pts)
+        curve.set_stroke(
+            width=scene["curve_stroke_width"],
+            opacity=scene["curve_opacity"],
+        )
+        curve.set_color_by_gradient(colors["path_col"], colors["active_path_col"])
+
+        head = Dot3D(point=pts[0], radius=scene["head_radius"], color=colors["head_col"])
+        head.set_fill(color=colors["head_col"], opacity=scene["head_opacity"])
+
+        def current_index():
+            return int(progress.get_value() * (len(pts) - 1))
+
+        # Screen-space level of detail: re-simplify the trajectory in pixels
+        # whenever the camera has turned by more than lod_refresh_deg.
+        use_lod = scene["lod_tolerance_px"] > 0.0 and hasattr(self.camera, "project_points")
+        px_per_unit = config.pixel_width / config.frame_width
+        lod_angles = [None]
+
+        def refresh_lod():
+            angles = np.array([self.camera.get_phi(), self.camera.get_theta(), self.camera.get_gamma()])
+            if lod_angles[0] is not None and np.max(np.abs(angles - lod_angles[0])) < scene["lod_refresh_deg"] * DEGREES:
+                return
+            lod_angles[0] = angles
+            screen = self.camera.project_points(pts)[:, :2] * px_per_unit
+            curve.set_lod(np.flatnonzero(douglas_peucker(screen, scene["lod_tolerance_px"])))
+
+        def update_curve(mob):
+            if use_lod:
+                refresh_lod()
+            mob.set_head(current_index())
+
+        curve.add_updater(update_curve)
+        head.add_updater(lambda mob: mob.move_to(pts[current_index()]))
+        self.add(curve, head)
+
+        self.play(
+            progress.animate.set_value(1.0),
+            run_time=total_time,
+            rate_func=resolve_rate_func(scene["path_rate_func"]),
+        )
+        self.wait(scene["end_wait"])
+
+
+class StrangeAttractorCloud3D(StrangeAttractor3D):
+    """
+    Sensitive dependence on initial conditions: ``[ensemble] n_trajectories``
+    starts within ``spread`` of one point on the attractor, integrated together
+    as an (N, 3) ensemble and drawn as one point cloud that spreads over the
+    attractor. The reference trajectory is drawn faintly behind it.
+    """
+
+    def construct(self):
+        scene = CFG["scene"]
+        ensemble = CFG["ensemble"]
+        colors = CFG["colors"]
+
+        self.camera.background_color = CFG["manim"]["background_color"]
+        Text.set_default(font=scene["text_font"], color=colors["text_col"])
+
+        attractor_name, total_time = self.resolve_attractor(scene)
+        f, params, x0 = ATTRACTORS[attractor_name]
+
+        # Warm up a single trajectory onto the attractor, then seed the cloud there.
+        n_steps = max(2, int(scene["points_per_sec"] * total_time))
+        cache = make_trajectory_cache(CFG["cache"])
+        start = np.array(
+            cached_integrate(attractor_name, f, x0, scene, n_steps=1, warmup=scene["warmup_steps"], cache=cache, **params)[-1]
+        )
+        x0s = perturbed_cloud(start, ensemble["n_trajectories"], ensemble["spread"], seed=ensemble["seed"])
+        x0s[0] = start
+        pts = cached_integrate(attractor_name, f, x0s, scene, n_steps=n_steps, warmup=0, cache=cache, **params)
+        pts = self.to_scene_points(pts, scene)
+        self.add_stage(attractor_name, scene, colors)
+
+        if ensemble["backdrop_opacity"] > 0.0:
+            backdrop = VMobject()
+            backdrop.set_points_as_corners(pts[:, 0])
+            backdrop.set_stroke(
+                color=colors["path_col"],
+                width=ensemble["backdrop_stroke_width"],
+                opacity=ensemble["backdrop_opacity"],
             )
-            curve.set_color_by_gradient(colors["path_col"], colors["active_path_col"])
-            return curve
+            self.add(backdrop)
 
-        def make_head():
+        cloud_colors = color_gradient([colors["cloud_col"], colors["cloud_end_col"]], len(x0s))
+        rgbas = np.array([color_to_rgba(c, ensemble["point_opacity"]) for c in cloud_colors])
+        cloud = PMobject(stroke_width=ensemble["point_size"])
+        cloud.add_points(pts[0], rgbas=rgbas)
+
+        progress = ValueTracker(0.0)
+
+        def move_cloud(mob):
             i = int(progress.get_value() * (len(pts) - 1))
-            head = Dot3D(point=pts[i], radius=scene["head_radius"], color=colors["head_col"])
-            head.set_fill(color=colors["head_col"], opacity=scene["head_opacity"])
-            return head
+            mob.points[:] = pts[i]
 
-        curve = always_redraw(make_curve)
-        head = always_redraw(make_head)
-        self.add(curve, head)
+        cloud.add_updater(move_cloud)
+        self.add(cloud)
 
         self.play(
             progress.animate.set_value(1.0),
@@ -369,3 +865,23 @@ class ThomasScene(StrangeAttractor3D):
 
 class DadrasScene(StrangeAttractor3D):
     name = "dadras"
+
+
+class LorenzCloudScene(StrangeAttractorCloud3D):
+    name = "lorenz"
+
+
+class RosslerCloudScene(StrangeAttractorCloud3D):
+    name = "rossler"
+
+
+class AizawaCloudScene(StrangeAttractorCloud3D):
+    name = "aizawa"
+
+
+class ThomasCloudScene(StrangeAttractorCloud3D):
+    name = "thomas"
+
+
+class DadrasCloudScene(StrangeAttractorCloud3D):
+    name = "dadras"